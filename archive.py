@@ -0,0 +1,58 @@
+import os
+from datetime import date, timedelta
+import queries
+import statements
+
+# Events older than this many days move to EVENTS_ARCHIVE / HOST_ARCHIVE on the next archive run
+ARCHIVE_AFTER_DAYS = int(os.environ.get("ARCHIVE_AFTER_DAYS", "30"))
+# Events moved per transaction; each batch holds its row locks only until it commits
+ARCHIVE_BATCH_SIZE = int(os.environ.get("ARCHIVE_BATCH_SIZE", "1000"))
+
+
+def archive_cutoff(after_days=ARCHIVE_AFTER_DAYS):
+    # Never today or later: registration and cancellation still read today's events from EVENTS
+    return date.today() - timedelta(days=max(after_days, 1))
+
+
+def archive_batch(conn, cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    # Moves up to batch_size events dated before cutoff, oldest first, with their HOST rows.
+    # Returns (events, registrations) moved; (0, 0) once nothing is left to archive.
+    event_ids = [event_id for (event_id,) in statements.fetchall(conn, "ARCHIVABLE_EVENT_IDS", (cutoff, batch_size))]
+    if not event_ids:
+        return 0, 0
+
+    cursor = conn.cursor()
+    try:
+        placeholders = ", ".join(["%s"] * len(event_ids))
+        cursor.execute(queries.ARCHIVE_EVENTS.format(placeholders=placeholders), event_ids)
+        cursor.execute(queries.ARCHIVE_REGISTRATIONS.format(placeholders=placeholders), event_ids)
+        # The events are deleted next, so their registration counters need no per-row decrement.
+        # USERS.no_of_events and the analytics rollup keep counting archived events.
+        cursor.execute(queries.SKIP_HOST_TRIGGERS)
+        try:
+            cursor.execute(queries.DELETE_ARCHIVED_REGISTRATIONS.format(placeholders=placeholders), event_ids)
+            registrations = cursor.rowcount
+            cursor.execute(queries.DELETE_ARCHIVED_EVENTS.format(placeholders=placeholders), event_ids)
+        finally:
+            # On SQLite the switch is a table row, so it has to be cleared before the commit
+            cursor.execute(queries.RESTORE_HOST_TRIGGERS)
+        return len(event_ids), registrations
+    finally:
+        cursor.close()
+
+
+def archive_past_events(conn, cutoff=None, batch_size=ARCHIVE_BATCH_SIZE):
+    # Commits after every batch, so an interrupted run keeps what it moved and the next run resumes
+    cutoff = cutoff or archive_cutoff()
+    events = registrations = 0
+    while True:
+        try:
+            moved, moved_registrations = archive_batch(conn, cutoff, batch_size)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        if not moved:
+            return events, registrations
+        events += moved
+        registrations += moved_registrations
@@ -1,146 +1,219 @@
+import functools
 import gradio as gr
-import mysql.connector
 import pandas as pd
 from datetime import datetime
-CURRENT_USER_ID = "U001"
+from db import IntegrityError, get_db_connection
+import queries
+import statements
+from cache import cached, reference_cache, add_department_defaults, load_bootstrap
+from coalesce import coalesced, forget
+from formatting import UPCOMING_EVENT_COLUMNS, USER_EVENT_COLUMNS, format_event_frame, to_display
+from metrics import start_metrics_server
+from session import session_user, signed_in
+from concurrency import READ_EVENT, WRITE_EVENT, read_handler, write_handler, configure_queue
+from pagination import PAGE_SIZE, PAGE_SIZE_CHOICES, EVENT_KEY, EVENT_KEY_START, read_page, next_page, previous_page, poll_page, reload_page
+from changefeed import CHANGE_FEED_INTERVAL
 
-def get_db_connection():
-    try:
-        conn = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="123456",
-            database="EventManagementSystem"
-        )
-        return conn
-    except Exception as e:
-        print(f"Database connection error: {e}")
-        return None
-
-def get_user_info():
+@cached("user_info", cache_if=lambda user: "error" not in user)
+def get_user_info(user_id):
     conn = get_db_connection()
     if not conn:
         return {"error": "Database connection failed"}
     
-    cursor = conn.cursor(dictionary=True)
     try:
-        cursor.execute("""
-        SELECT u.user_id, u.dept, u.no_of_events, l.account_type
-        FROM USERS u
-        JOIN LOGIN l ON u.user_id = l.user_id
-        WHERE u.user_id = %s
-        """, (CURRENT_USER_ID,))
-        
-        user = cursor.fetchone()
+        user = statements.fetchone(conn, "USER_INFO", (user_id,), dictionary=True)
         if not user:
-            return {"error": f"User {CURRENT_USER_ID} not found"}
+            return {"error": f"User {user_id} not found"}
         return user
     except Exception as e:
         print(f"Error fetching user info: {e}")
         return {"error": str(e)}
     finally:
-        cursor.close()
         conn.close()
 
-def get_all_events():
+def error_page(message):
+    return pd.DataFrame({"Error": [message]}), None
+
+ALL_DEPARTMENTS = "All departments"
+
+def like_prefix(text):
+    # LIKE pattern matching IDs that start with text; '!' is the ESCAPE character in EVENT_FILTERS
+    return text.replace("!", "!!").replace("%", "!%").replace("_", "!_") + "%"
+
+def event_filters(dept, date_from, date_to, fee_min, fee_max, min_seats, event_text):
+    # Returns (error, filters) with only the filters that were filled in
+    filters = {}
+    if dept and dept != ALL_DEPARTMENTS:
+        filters["dept"] = dept
+    
+    for name, value in (("date_from", date_from), ("date_to", date_to)):
+        if value and value.strip():
+            try:
+                filters[name] = datetime.strptime(value.strip(), "%Y-%m-%d").date()
+            except ValueError:
+                return "Invalid date format. Use YYYY-MM-DD", None
+    if "date_from" in filters and "date_to" in filters and filters["date_from"] > filters["date_to"]:
+        return "The start date must not be after the end date", None
+    
+    for name, value in (("fee_min", fee_min), ("fee_max", fee_max)):
+        if value is not None:
+            filters[name] = value
+    if "fee_min" in filters and "fee_max" in filters and filters["fee_min"] > filters["fee_max"]:
+        return "The minimum fee must not be above the maximum fee", None
+    
+    if min_seats:
+        filters["min_seats"] = int(min_seats)
+    if event_text and event_text.strip():
+        filters["event_prefix"] = like_prefix(event_text.strip())
+    return None, filters
+
+def upcoming_statements(filters):
+    # Each combination of filters is registered as its own statement, named after the filters
+    if not filters:
+        return "UPCOMING_EVENTS_AFTER", "UPCOMING_EVENTS_BEFORE"
+    names = ",".join(name for name in queries.EVENT_FILTERS if name in filters)
+    return (
+        statements.register(f"UPCOMING_EVENTS_AFTER[{names}]", queries.upcoming_events_after(filters)),
+        statements.register(f"UPCOMING_EVENTS_BEFORE[{names}]", queries.upcoming_events_before(filters)),
+    )
+
+@signed_in(error_page)
+@coalesced("events")
+def get_all_events(user_id, page_size=PAGE_SIZE, after=None, before=None, filters=None):
     conn = get_db_connection()
     if not conn:
-        return pd.DataFrame({"Error": ["Database connection failed"]})
+        return pd.DataFrame({"Error": ["Database connection failed"]}), None
     
+    filters = filters or {}
     try:
-        query = """
-        SELECT 
-            e.event_id, 
-            e.date, 
-            e.time, 
-            e.dept,
-            d.default_fees AS fee,
-            d.default_max_capacity AS max_capacity,
-            (
-                SELECT COUNT(*) 
-                FROM HOST 
-                WHERE event_id = e.event_id
-            ) AS host_count
-        FROM EVENTS e
-        JOIN DEPARTMENT d ON e.dept = d.dept
-        WHERE e.date >= CURDATE()
-        ORDER BY e.date, e.time
-        """
-        
-        df = pd.read_sql(query, conn)
+        after_statement, before_statement = upcoming_statements(filters)
+        df, page = read_page(
+            conn, after_statement, before_statement,
+            {"user_id": user_id, **filters}, EVENT_KEY, EVENT_KEY_START,
+            page_size, after, before, track_changes=True
+        )
+        # Paging and change polls reuse the filters the page was read with
+        page["filters"] = filters
         
         if df.empty:
-            return pd.DataFrame({"Message": ["No upcoming events found"]})
-        
-        df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
-        df['time'] = df['time'].astype(str).str.slice(0, 5)
-        
-        for idx, row in df.iterrows():
-            event_id = row['event_id']
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM HOST 
-                WHERE event_id = %s AND user_id = %s
-            """, (event_id, CURRENT_USER_ID))
-            is_registered = cursor.fetchone()[0] > 0
-            df.at[idx, 'registered'] = "Yes" if is_registered else "No"
-            cursor.close()
+            return pd.DataFrame({"Message": ["No upcoming events found"]}), page
         
-        display_df = df[['event_id', 'date', 'time', 'dept', 'fee', 'host_count', 'max_capacity', 'registered']]
-        display_df.columns = ['Event ID', 'Date', 'Time', 'Department', 'Fee', 'Host Count', 'Max Capacity', 'Registered']
-        
-        return display_df
+        return display_events(df), page
     except Exception as e:
         print(f"Error fetching events: {e}")
-        return pd.DataFrame({"Error": [str(e)]})
+        return pd.DataFrame({"Error": [str(e)]}), None
     finally:
         conn.close()
 
-def get_user_events():
+@signed_in(error_page)
+def search_events(user_id, dept, date_from, date_to, fee_min, fee_max, min_seats, event_text, page_size=PAGE_SIZE):
+    error, filters = event_filters(dept, date_from, date_to, fee_min, fee_max, min_seats, event_text)
+    if error:
+        return pd.DataFrame({"Error": [error]}), None
+    return get_all_events(user_id, page_size, filters=filters)
+
+def display_events(df):
+    df = add_department_defaults(df)
+    df = format_event_frame(df)
+    return to_display(df, UPCOMING_EVENT_COLUMNS)
+
+def page_filters(page):
+    return (page or {}).get("filters") or {}
+
+@signed_in(lambda message: (gr.skip(), gr.skip()))
+def refresh_events(user_id, page_size, page):
+    # Timer tick: re-reads only the events logged as changed since the page was read, and sends
+    # the table to the browser only when a row on it changed
+    if not page:
+        return gr.skip(), gr.skip()
+    
+    conn = get_db_connection()
+    if not conn:
+        return gr.skip(), gr.skip()
+    
+    filters = page_filters(page)
+    try:
+        refreshed, changed = poll_page(
+            conn, page, queries.upcoming_event_changes(filters), {"user_id": user_id, **filters}, EVENT_KEY, page_size
+        )
+    except Exception as e:
+        print(f"Error polling event changes: {e}")
+        return gr.skip(), gr.skip()
+    finally:
+        conn.close()
+    
+    if refreshed is None:
+        return reload_page(functools.partial(get_all_events, filters=filters), page_size, page, user_id)
+    if not changed:
+        return gr.skip(), refreshed
+    if refreshed["rows"].empty:
+        return pd.DataFrame({"Message": ["No upcoming events found"]}), refreshed
+    return display_events(refreshed["rows"].copy()), refreshed
+
+def next_events_page(user_id, page_size, page):
+    return next_page(functools.partial(get_all_events, filters=page_filters(page)), page_size, page, user_id)
+
+def previous_events_page(user_id, page_size, page):
+    return previous_page(functools.partial(get_all_events, filters=page_filters(page)), page_size, page, user_id)
+
+@signed_in(lambda message: pd.DataFrame({"Error": [message]}))
+@coalesced("user_events")
+def get_user_events(user_id, include_archived=False):
     conn = get_db_connection()
     if not conn:
         return pd.DataFrame({"Error": ["Database connection failed"]})
     
     try:
-        query = """
-        SELECT 
-            h.event_id,
-            e.date, 
-            e.time, 
-            e.dept,
-            d.default_fees AS fee
-        FROM HOST h
-        JOIN EVENTS e ON h.event_id = e.event_id
-        JOIN DEPARTMENT d ON e.dept = d.dept
-        WHERE h.user_id = %s
-        ORDER BY e.date, e.time
-        """
-        
-        df = pd.read_sql(query, conn, params=(CURRENT_USER_ID,))
+        # Past events are moved to the archive tables by archive.py; only read them when asked
+        if include_archived:
+            df = statements.read_frame(conn, "USER_EVENT_HISTORY", (user_id, user_id))
+        else:
+            df = statements.read_frame(conn, "USER_EVENTS", (user_id,))
         
         if df.empty:
             return pd.DataFrame({"Message": ["You have no registered events"]})
         
-        df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
-        df['time'] = df['time'].astype(str).str.slice(0, 5)
-        
-        now = datetime.now().date()
-        df['is_upcoming'] = pd.to_datetime(df['date']) >= pd.to_datetime(now)
-        
-        display_df = df[['event_id', 'date', 'time', 'dept', 'fee', 'is_upcoming']]
-        display_df['Status'] = display_df['is_upcoming'].apply(lambda x: "Upcoming" if x else "Past")
-        display_df = display_df.drop(columns=['is_upcoming'])
-        display_df.columns = ['Event ID', 'Date', 'Time', 'Department', 'Fee', 'Status']
+        df = add_department_defaults(df)
+        df = format_event_frame(df, status=True)
         
-        return display_df
+        return to_display(df, USER_EVENT_COLUMNS)
     except Exception as e:
         print(f"Error fetching user events: {e}")
         return pd.DataFrame({"Error": [str(e)]})
     finally:
         conn.close()
 
-def register_for_event(event_id):
+REGISTERED = 0
+EVENT_NOT_FOUND = 1
+EVENT_PASSED = 2
+ALREADY_REGISTERED = 3
+EVENT_FULL = 4
+USER_NOT_FOUND = 5
+
+REGISTRATION_MESSAGES = {
+    REGISTERED: "Successfully registered for event {event_id}",
+    EVENT_NOT_FOUND: "Event ID {event_id} not found",
+    EVENT_PASSED: "Event {event_id} has already passed and cannot be registered for",
+    ALREADY_REGISTERED: "You are already registered for event {event_id}",
+    EVENT_FULL: "Event {event_id} is full, cannot register",
+    USER_NOT_FOUND: "User {user_id} not found",
+}
+
+def register_user(conn, event_id, user_id):
+    # registerForEvent locks the event row, runs every check and inserts in one call
+    # CALL stays a text query; the server already caches the procedure's parsed statements per session
+    cursor = conn.cursor()
+    try:
+        cursor.execute(queries.REGISTER_FOR_EVENT, (event_id, user_id))
+        status = cursor.fetchone()[0]
+        while cursor.nextset():
+            pass
+        return status
+    finally:
+        cursor.close()
+
+@signed_in(str)
+def register_for_event(user_id, event_id):
     if not event_id:
         return "Please provide an Event ID"
     
@@ -148,48 +221,14 @@ def register_for_event(event_id):
     if not conn:
         return "Database connection failed"
     
-    cursor = conn.cursor()
     try:
-        cursor.execute("SELECT event_id, date FROM EVENTS WHERE event_id = %s", (event_id,))
-        event = cursor.fetchone()
-        if not event:
-            return f"Event ID {event_id} not found"
-        
-        event_id, event_date = event
-        if event_date < datetime.now().date():
-            return f"Event {event_id} has already passed and cannot be registered for"
-        
-        cursor.execute("""
-            SELECT COUNT(*) FROM HOST 
-            WHERE user_id = %s AND event_id = %s
-        """, (CURRENT_USER_ID, event_id))
-        
-        if cursor.fetchone()[0] > 0:
-            return f"You are already registered for event {event_id}"
-        
-        cursor.execute("""
-            SELECT 
-                d.default_max_capacity,
-                (SELECT COUNT(*) FROM HOST WHERE event_id = %s) AS current_hosts
-            FROM EVENTS e
-            JOIN DEPARTMENT d ON e.dept = d.dept
-            WHERE e.event_id = %s
-        """, (event_id, event_id))
-        
-        result = cursor.fetchone()
-        if result:
-            max_capacity, current_hosts = result
-            if current_hosts >= max_capacity:
-                return f"Event {event_id} is full, cannot register"
-        
-        cursor.execute("""
-            INSERT INTO HOST (event_id, user_id)
-            VALUES (%s, %s)
-        """, (event_id, CURRENT_USER_ID))
-        
-        conn.commit()
-        return f"Successfully registered for event {event_id}"
-    except mysql.connector.errors.IntegrityError as e:
+        status = register_user(conn, event_id, user_id)
+        if status == REGISTERED:
+            # increment_event_count just bumped the attendee's no_of_events
+            reference_cache.invalidate("user_info", user_id)
+            forget()
+        return REGISTRATION_MESSAGES[status].format(event_id=event_id, user_id=user_id)
+    except IntegrityError as e:
         if "Duplicate entry" in str(e):
             return f"You are already registered for event {event_id}"
         else:
@@ -197,10 +236,10 @@ def register_for_event(event_id):
     except Exception as e:
         return f"Error registering for event: {e}"
     finally:
-        cursor.close()
         conn.close()
 
-def cancel_registration(event_id):
+@signed_in(str)
+def cancel_registration(user_id, event_id):
     if not event_id:
         return "Please provide an Event ID"
     
@@ -208,17 +247,8 @@ def cancel_registration(event_id):
     if not conn:
         return "Database connection failed"
     
-    cursor = conn.cursor()
     try:
-
-        cursor.execute("""
-            SELECT h.event_id, e.date
-            FROM HOST h
-            JOIN EVENTS e ON h.event_id = e.event_id
-            WHERE h.event_id = %s AND h.user_id = %s
-        """, (event_id, CURRENT_USER_ID))
-        
-        result = cursor.fetchone()
+        result = statements.fetchone(conn, "REGISTRATION_DATE", (event_id, user_id))
         if not result:
             return f"You are not registered for event {event_id}"
         
@@ -228,104 +258,203 @@ def cancel_registration(event_id):
         if event_date < current_date:
             return f"Cannot cancel registration for a past event"
         
-        cursor.execute("""
-            DELETE FROM HOST
-            WHERE event_id = %s AND user_id = %s
-        """, (event_id, CURRENT_USER_ID))
+        statements.execute(conn, "DELETE_REGISTRATION", (event_id, user_id))
         
         conn.commit()
+        forget()
         return f"Successfully cancelled registration for event {event_id}"
     except Exception as e:
         return f"Error cancelling registration: {e}"
     finally:
-        cursor.close()
         conn.close()
 
+def load_dashboard(request: gr.Request):
+    # Runs once per browser session and resolves the login cookie to the session's user
+    user_id = session_user(request)
+    if user_id is None:
+        return None, "Attendee Dashboard\n### Please log in to continue", gr.update(visible=False), gr.update()
+    
+    user_info, departments = load_bootstrap(user_id)
+    if "error" in user_info:
+        return None, f"Attendee Dashboard\n### {user_info['error']}", gr.update(visible=False), gr.update()
+    
+    welcome_message = f"Attendee Dashboard"
+    welcome_message += f"\n### Welcome, {user_info['user_id']} ({user_info['dept']})"
+    # The department filter's choices come from the same BOOTSTRAP query
+    return user_id, welcome_message, gr.update(visible=True), gr.update(choices=[ALL_DEPARTMENTS, *sorted(departments)])
+
 def create_app():
     with gr.Blocks(title="Attendee Dashboard") as app:
-        user_info = get_user_info()
-        
-        welcome_message = f"Attendee Dashboard"
-        if "error" not in user_info:
-            welcome_message += f"\n### Welcome, {user_info['user_id']} ({user_info['dept']})"
-        else:
-            welcome_message += f"\n### User ID: {CURRENT_USER_ID}"
-        
-        gr.Markdown(welcome_message)
+        current_user = gr.State()
+        welcome = gr.Markdown("Attendee Dashboard")
         
-        with gr.Tab("View All Events"):
-            with gr.Row():
-                refresh_events_button = gr.Button("Refresh Events List", variant="secondary")
+        with gr.Column(visible=False) as dashboard:
+            with gr.Tab("View All Events"):
+                with gr.Row():
+                    refresh_events_button = gr.Button("Refresh Events List", variant="secondary")
+                    events_page_size = gr.Dropdown(label="Rows per page", choices=PAGE_SIZE_CHOICES, value=PAGE_SIZE)
+                    previous_events_button = gr.Button("Previous Page", size="sm")
+                    next_events_button = gr.Button("Next Page", size="sm")
+                
+                with gr.Row():
+                    filter_dept = gr.Dropdown(
+                        label="Department", choices=[ALL_DEPARTMENTS], value=ALL_DEPARTMENTS
+                    )
+                    filter_date_from = gr.Textbox(label="From", placeholder="YYYY-MM-DD")
+                    filter_date_to = gr.Textbox(label="To", placeholder="YYYY-MM-DD")
+                    filter_fee_min = gr.Number(label="Min Fee", minimum=0)
+                    filter_fee_max = gr.Number(label="Max Fee", minimum=0)
+                    filter_min_seats = gr.Number(label="Seats Available", minimum=0, precision=0)
+                    filter_event_text = gr.Textbox(label="Event ID starts with")
+                    search_events_button = gr.Button("Search", variant="primary")
+                filter_inputs = [
+                    filter_dept, filter_date_from, filter_date_to, filter_fee_min, filter_fee_max,
+                    filter_min_seats, filter_event_text
+                ]
+            
+                events_table = gr.DataFrame(label="Available Events")
+                events_page = gr.State()
+                events_timer = gr.Timer(CHANGE_FEED_INTERVAL or 1, active=CHANGE_FEED_INTERVAL > 0)
+            
+                search_events_button.click(
+                    fn=read_handler(search_events),
+                    inputs=[current_user, *filter_inputs, events_page_size],
+                    outputs=[events_table, events_page],
+                    **READ_EVENT
+                )
+            
+                refresh_events_button.click(
+                    fn=read_handler(search_events),
+                    inputs=[current_user, *filter_inputs, events_page_size],
+                    outputs=[events_table, events_page],
+                    **READ_EVENT
+                )
             
-            events_table = gr.DataFrame(label="Available Events")
+                events_page_size.change(
+                    fn=read_handler(search_events),
+                    inputs=[current_user, *filter_inputs, events_page_size],
+                    outputs=[events_table, events_page],
+                    **READ_EVENT
+                )
             
-            refresh_events_button.click(
-                fn=get_all_events,
-                inputs=[],
-                outputs=events_table
-            )
+                previous_events_button.click(
+                    fn=read_handler(previous_events_page),
+                    inputs=[current_user, events_page_size, events_page],
+                    outputs=[events_table, events_page],
+                    **READ_EVENT
+                )
+            
+                next_events_button.click(
+                    fn=read_handler(next_events_page),
+                    inputs=[current_user, events_page_size, events_page],
+                    outputs=[events_table, events_page],
+                    **READ_EVENT
+                )
+            
+                events_timer.tick(
+                    fn=read_handler(refresh_events),
+                    inputs=[current_user, events_page_size, events_page],
+                    outputs=[events_table, events_page],
+                    show_progress="hidden",
+                    **READ_EVENT
+                )
         
-        with gr.Tab("Register for an Event"):
-            with gr.Row():
-                with gr.Column():
-                    register_event_id = gr.Textbox(label="Event ID", placeholder="Enter Event ID (e.g., E101)")
-                    register_button = gr.Button("Register for Event", variant="primary")
-                    registration_status = gr.Textbox(label="Registration Status", interactive=False)
+            with gr.Tab("Register for an Event"):
+                with gr.Row():
+                    with gr.Column():
+                        register_event_id = gr.Textbox(label="Event ID", placeholder="Enter Event ID (e.g., E101)")
+                        register_button = gr.Button("Register for Event", variant="primary")
+                        registration_status = gr.Textbox(label="Registration Status", interactive=False)
+            
+                with gr.Row():
+                    view_events_button = gr.Button("View Available Events")
+                    previous_registration_events_button = gr.Button("Previous Page", size="sm")
+                    next_registration_events_button = gr.Button("Next Page", size="sm")
             
-            with gr.Row():
-                view_events_button = gr.Button("View Available Events")
                 events_for_registration = gr.DataFrame(label="Available Events")
+                registration_events_page = gr.State()
+            
+                register_button.click(
+                    fn=write_handler(register_for_event),
+                    inputs=[current_user, register_event_id],
+                    outputs=registration_status,
+                    **WRITE_EVENT
+                )
+            
+                view_events_button.click(
+                    fn=read_handler(get_all_events),
+                    inputs=[current_user, events_page_size],
+                    outputs=[events_for_registration, registration_events_page],
+                    **READ_EVENT
+                )
             
-            register_button.click(
-                fn=register_for_event,
-                inputs=register_event_id,
-                outputs=registration_status
-            )
+                previous_registration_events_button.click(
+                    fn=read_handler(previous_events_page),
+                    inputs=[current_user, events_page_size, registration_events_page],
+                    outputs=[events_for_registration, registration_events_page],
+                    **READ_EVENT
+                )
             
-            view_events_button.click(
-                fn=get_all_events,
-                inputs=[],
-                outputs=events_for_registration
-            )
+                next_registration_events_button.click(
+                    fn=read_handler(next_events_page),
+                    inputs=[current_user, events_page_size, registration_events_page],
+                    outputs=[events_for_registration, registration_events_page],
+                    **READ_EVENT
+                )
         
-        with gr.Tab("My Registrations"):
-            with gr.Row():
-                view_registrations_button = gr.Button("View My Registrations", variant="secondary")
+            with gr.Tab("My Registrations"):
+                with gr.Row():
+                    view_registrations_button = gr.Button("View My Registrations", variant="secondary")
+                    include_archived = gr.Checkbox(label="Include archived events", value=False)
             
-            user_registrations = gr.DataFrame(label="Your Registered Events")
+                user_registrations = gr.DataFrame(label="Your Registered Events")
             
-            with gr.Row():
-                with gr.Column():
-                    cancel_event_id = gr.Textbox(label="Event ID", placeholder="Enter Event ID to cancel")
-                    cancel_button = gr.Button("Cancel Registration", variant="stop")
-                    cancellation_status = gr.Textbox(label="Cancellation Status", interactive=False)
+                with gr.Row():
+                    with gr.Column():
+                        cancel_event_id = gr.Textbox(label="Event ID", placeholder="Enter Event ID to cancel")
+                        cancel_button = gr.Button("Cancel Registration", variant="stop")
+                        cancellation_status = gr.Textbox(label="Cancellation Status", interactive=False)
             
-            view_registrations_button.click(
-                fn=get_user_events,
-                inputs=[],
-                outputs=user_registrations
-            )
+                view_registrations_button.click(
+                    fn=read_handler(get_user_events),
+                    inputs=[current_user, include_archived],
+                    outputs=user_registrations,
+                    **READ_EVENT
+                )
             
-            cancel_button.click(
-                fn=cancel_registration,
-                inputs=cancel_event_id,
-                outputs=cancellation_status
-            )
-    
-        app.load(
-            fn=get_all_events,
-            inputs=[],
-            outputs=events_table
-        )
+                include_archived.change(
+                    fn=read_handler(get_user_events),
+                    inputs=[current_user, include_archived],
+                    outputs=user_registrations,
+                    **READ_EVENT
+                )
+            
+                cancel_button.click(
+                    fn=write_handler(cancel_registration),
+                    inputs=[current_user, cancel_event_id],
+                    outputs=cancellation_status,
+                    **WRITE_EVENT
+                )
     
         app.load(
-            fn=get_user_events,
+            fn=read_handler(load_dashboard),
             inputs=[],
-            outputs=user_registrations
+            outputs=[current_user, welcome, dashboard, filter_dept],
+            **READ_EVENT
+        ).then(
+            fn=read_handler(get_all_events),
+            inputs=[current_user, events_page_size],
+            outputs=[events_table, events_page],
+            **READ_EVENT
+        ).then(
+            fn=read_handler(get_user_events),
+            inputs=current_user,
+            outputs=user_registrations,
+            **READ_EVENT
         )
 
-    return app
+    return configure_queue(app)
 
-demo = create_app()
 if __name__ == "__main__":
-    demo.launch(server_port=6003)
\ No newline at end of file
+    start_metrics_server(6006)
+    create_app().launch(server_port=6003)
\ No newline at end of file
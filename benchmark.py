@@ -0,0 +1,922 @@
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+from db import DB_BACKEND, BREAKER_THRESHOLD, CircuitBreaker, ConnectionPool, get_db_connection, get_pool_stats
+from maintenance import rebuild_event_rollups
+import formatting
+import queries
+import statements
+
+BENCH_EVENT_PREFIX = "BQ"
+BENCH_USER_PREFIX = "BQU"
+BENCH_DEPARTMENT = "BQRACE"
+RACE_EVENT_ID = "BQRACE"
+
+
+def drop_benchmark_events():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        pattern = BENCH_EVENT_PREFIX + "%"
+        cursor.execute("DELETE FROM HOST WHERE event_id LIKE %s", (pattern,))
+        cursor.execute("DELETE FROM EVENTS WHERE event_id LIKE %s", (pattern,))
+        cursor.execute("DELETE FROM HOST_ARCHIVE WHERE event_id LIKE %s", (pattern,))
+        cursor.execute("DELETE FROM EVENTS_ARCHIVE WHERE event_id LIKE %s", (pattern,))
+        cursor.execute("DELETE FROM USERS WHERE user_id LIKE %s", (BENCH_USER_PREFIX + "%",))
+        cursor.execute("DELETE FROM DEPARTMENT WHERE dept = %s", (BENCH_DEPARTMENT,))
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def seed_benchmark_events(count):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT dept FROM DEPARTMENT ORDER BY dept")
+        departments = [row[0] for row in cursor.fetchall()]
+        start = date.today() + timedelta(days=1)
+        rows = [
+            (f"{BENCH_EVENT_PREFIX}{i:05d}", start + timedelta(days=i % 365), "10:00:00", departments[i % len(departments)])
+            for i in range(count)
+        ]
+        cursor.executemany("INSERT INTO EVENTS (event_id, date, time, dept) VALUES (%s, %s, %s, %s)", rows)
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def seed_registration_race(attempts, capacity):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("INSERT INTO DEPARTMENT VALUES (%s, 0, %s)", (BENCH_DEPARTMENT, capacity))
+        users = [(f"{BENCH_USER_PREFIX}{i:05d}", BENCH_DEPARTMENT, 0) for i in range(attempts)]
+        cursor.executemany("INSERT INTO USERS VALUES (%s, %s, %s)", users)
+        cursor.execute(
+            "INSERT INTO EVENTS (event_id, date, time, dept) VALUES (%s, %s, '10:00:00', %s)",
+            (RACE_EVENT_ID, date.today() + timedelta(days=1), BENCH_DEPARTMENT),
+        )
+        conn.commit()
+        return [user[0] for user in users]
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def count_queries(fn, *args):
+    before = get_pool_stats()["queries"]
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    return get_pool_stats()["queries"] - before, elapsed
+
+
+def query_count_benchmark(sizes):
+    import attendee
+    results = []
+    try:
+        for size in sizes:
+            drop_benchmark_events()
+            seed_benchmark_events(size)
+            queries, elapsed = count_queries(attendee.get_all_events, "U001")
+            results.append({"handler": "get_all_events", "events": size, "queries": queries, "seconds": round(elapsed, 4)})
+    finally:
+        drop_benchmark_events()
+    return results
+
+
+def attempt_registration(user_id):
+    import attendee
+    conn = get_db_connection()
+    if not conn:
+        return "no_connection"
+    try:
+        return attendee.register_user(conn, RACE_EVENT_ID, user_id)
+    except Exception as e:
+        return type(e).__name__
+    finally:
+        conn.close()
+
+
+def registration_race(attempts, capacity):
+    drop_benchmark_events()
+    try:
+        users = seed_registration_race(attempts, capacity)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=attempts) as executor:
+            statuses = Counter(executor.map(attempt_registration, users))
+        elapsed = time.perf_counter() - start
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT COUNT(*) FROM HOST WHERE event_id = %s", (RACE_EVENT_ID,))
+            registrations = cursor.fetchone()[0]
+            cursor.execute("SELECT registration_count FROM EVENTS WHERE event_id = %s", (RACE_EVENT_ID,))
+            counter = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+            conn.close()
+
+        failures = []
+        if registrations > capacity:
+            failures.append(f"oversold: {registrations} registrations for {capacity} seats")
+        if counter != registrations:
+            failures.append(f"registration_count is {counter} but HOST has {registrations} rows")
+        return {
+            "attempts": attempts,
+            "capacity": capacity,
+            "statuses": {str(status): count for status, count in statuses.items()},
+            "registrations": registrations,
+            "registration_count": counter,
+            "oversold": registrations > capacity,
+            "seconds": round(elapsed, 4),
+            "failures": failures,
+        }
+    finally:
+        drop_benchmark_events()
+
+
+def latency_summary(timings):
+    return {
+        f"p{q}_ms": round(float(np.percentile(timings, q)) * 1000, 3)
+        for q in (50, 95, 99)
+    }
+
+
+PREPARED_BENCH_STATEMENTS = {
+    # Events listing, the attendee's own events, and the registration check
+    "UPCOMING_EVENTS_AFTER": {"user_id": "U001", "date": "1000-01-01", "time": "00:00:00", "event_id": "", "limit": 51},
+    "USER_EVENTS": ("U001",),
+    "IS_REGISTERED": ("E101", "U001"),
+}
+SERVER_COUNTERS = ("Com_stmt_prepare", "Com_stmt_execute", "Com_select")
+
+
+def session_counters(conn):
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SHOW SESSION STATUS WHERE Variable_name IN (%s, %s, %s)", SERVER_COUNTERS)
+        return {name: int(value) for name, value in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def prepared_benchmark(calls):
+    if DB_BACKEND != "mysql":
+        raise SystemExit("Prepared statements are a MySQL feature; sqlite3 always reuses compiled statements")
+    results = []
+    for name, params in PREPARED_BENCH_STATEMENTS.items():
+        for prepared in (False, True):
+            conn = get_db_connection()
+            try:
+                statements.fetchall(conn, name, params, prepared=prepared)
+                before = session_counters(conn)
+                timings = []
+                for _ in range(calls):
+                    start = time.perf_counter()
+                    statements.fetchall(conn, name, params, prepared=prepared)
+                    timings.append(time.perf_counter() - start)
+                after = session_counters(conn)
+            finally:
+                conn.close()
+            results.append({
+                "statement": name,
+                "mode": "prepared" if prepared else "text",
+                "calls": calls,
+                **latency_summary(timings),
+                "server": {counter: after[counter] - before[counter] for counter in SERVER_COUNTERS},
+            })
+    return results
+
+
+def pick_handler_targets():
+    # The busiest event, a host-account member of it, the most active attendee, and an upcoming
+    # event with free seats that attendee has not joined (run datagen.py first for realistic sizes)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT event_id FROM EVENTS ORDER BY registration_count DESC LIMIT 1")
+        busy_event = cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT h.user_id FROM HOST h JOIN LOGIN l ON h.user_id = l.user_id
+            WHERE h.event_id = %s ORDER BY l.account_type IN ('host', 'admin') DESC LIMIT 1
+        """, (busy_event,))
+        host_user = cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT user_id FROM HOST
+            GROUP BY user_id ORDER BY COUNT(*) DESC LIMIT 1
+        """)
+        attendee_user = cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT e.event_id FROM EVENTS e JOIN DEPARTMENT d ON e.dept = d.dept
+            WHERE e.date > CURDATE() AND e.registration_count < d.default_max_capacity
+              AND NOT EXISTS (SELECT 1 FROM HOST h WHERE h.event_id = e.event_id AND h.user_id = %s)
+            ORDER BY e.registration_count DESC LIMIT 1
+        """, (attendee_user,))
+        open_event = cursor.fetchone()
+        return busy_event, host_user, attendee_user, open_event[0] if open_event else None
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def time_handler(fn, calls):
+    timings = []
+    queries = []
+    for _ in range(calls):
+        count, elapsed = count_queries(fn)
+        timings.append(elapsed)
+        queries.append(count)
+    return {"calls": calls, **latency_summary(timings), "queries_per_call": max(queries)}
+
+
+def handler_benchmark(calls):
+    import attendee
+    import host
+    busy_event, host_user, attendee_user, open_event = pick_handler_targets()
+    # Handlers act for the session's user; point them at the busiest generated users
+    cases = {
+        "get_all_events": lambda: attendee.get_all_events(attendee_user),
+        "get_user_events": lambda: attendee.get_user_events(attendee_user),
+        "get_hosted_events": lambda: host.get_hosted_events(host_user),
+        "get_event_registrations": lambda: host.get_event_registrations(host_user, busy_event),
+        "get_event_details": lambda: host.get_event_details(host_user, busy_event),
+    }
+    results = {"backend": DB_BACKEND, "targets": {"busy_event": busy_event, "host": host_user, "attendee": attendee_user,
+                           "open_event": open_event}}
+    for name, fn in cases.items():
+        fn()
+        results[name] = time_handler(fn, calls)
+
+    if open_event:
+        # Each sign-up is undone straight away so every call sees the same state
+        register_timings, cancel_timings, queries = [], [], []
+        for _ in range(calls):
+            count, elapsed = count_queries(attendee.register_for_event, attendee_user, open_event)
+            register_timings.append(elapsed)
+            queries.append(count)
+            cancel_timings.append(count_queries(attendee.cancel_registration, attendee_user, open_event)[1])
+        results["register_for_event"] = {"calls": calls, **latency_summary(register_timings),
+                                         "queries_per_call": max(queries)}
+        results["cancel_registration"] = {"calls": calls, **latency_summary(cancel_timings)}
+    return results
+
+
+def hung_server():
+    # Accepts connections and never answers, like a MySQL server that has stopped responding
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(128)
+    held = []
+    threading.Thread(target=lambda: [held.append(listener.accept()) for _ in iter(int, 1)], daemon=True).start()
+    return listener.getsockname()[1]
+
+
+def closed_port():
+    # Nothing listens here, so connections are refused straight away
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return port
+
+
+# Checkouts the open breaker turns away must come back within this
+FAIL_FAST_MS = 50
+
+
+def checkout_calls(pool, calls):
+    # What each handler does first: check out a connection, or get None and report the failure.
+    # Calls made while the breaker was already open are timed separately as "rejected".
+    timings, rejected, states, failed = [], [], Counter(), 0
+    for _ in range(calls):
+        was_open = pool.breaker.state == CircuitBreaker.OPEN
+        start = time.perf_counter()
+        try:
+            pool.get_connection().close()
+        except Exception:
+            failed += 1
+        timings.append(time.perf_counter() - start)
+        if was_open:
+            rejected.append(timings[-1])
+        states[pool.breaker.state] += 1
+    return {"calls": calls, "failed": failed, **latency_summary(timings),
+            "max_ms": round(max(timings) * 1000, 3), "total_seconds": round(sum(timings), 3),
+            "attempted": calls - len(rejected), "rejected": len(rejected),
+            "rejected_max_ms": round(max(rejected) * 1000, 3) if rejected else None,
+            "states": dict(states), "retries": pool.stats()["connect_retries"]}
+
+
+def outage_failures(results, calls, cooldown):
+    # The bounds the breaker and query timeout promise; any broken one fails the command
+    failures = []
+    for name in ("hung_with_breaker", "refused_with_breaker"):
+        run = results[name]
+        if calls > BREAKER_THRESHOLD and run["attempted"] > BREAKER_THRESHOLD:
+            failures.append(f"{name}: {run['attempted']} checkouts reached the database, expected at most {BREAKER_THRESHOLD}")
+        if run["rejected_max_ms"] is not None and run["rejected_max_ms"] > FAIL_FAST_MS:
+            failures.append(f"{name}: open breaker took {run['rejected_max_ms']} ms to reject a checkout")
+    recovery = results["recovery"]
+    if recovery["before_cooldown"]["failed"] != 1 or recovery["before_cooldown"]["max_ms"] > FAIL_FAST_MS:
+        failures.append("recovery: the breaker did not fail fast before the cooldown")
+    if recovery["after_cooldown"]["failed"] or recovery["breaker"]["state"] != CircuitBreaker.CLOSED:
+        failures.append(f"recovery: the breaker is {recovery['breaker']['state']} {cooldown}s after the database came back")
+    timeout = results["query_timeout"]
+    if timeout["error"] != "interrupted" or timeout["seconds"] > timeout["timeout_seconds"] + 0.5:
+        failures.append(f"query_timeout: runaway query ended after {timeout['seconds']}s with {timeout['error']!r}")
+    if timeout["idle_after"]:
+        failures.append("query_timeout: the timed out connection went back to the pool")
+    return failures
+
+
+def outage_benchmark(calls, connect_timeout, cooldown):
+    # Local fault injection; needs no running MySQL server and leaves the configured database alone
+    results = {"connect_timeout": connect_timeout, "breaker_threshold": BREAKER_THRESHOLD, "cooldown": cooldown}
+    hung = {"host": "127.0.0.1", "port": hung_server(), "user": "bench", "password": "bench",
+            "connection_timeout": connect_timeout}
+    for name, threshold in (("hung_without_breaker", 0), ("hung_with_breaker", BREAKER_THRESHOLD)):
+        pool = ConnectionPool(backend="mysql", breaker=CircuitBreaker(threshold, cooldown), **hung)
+        results[name] = checkout_calls(pool, calls)
+    refused = {**hung, "port": closed_port()}
+    pool = ConnectionPool(backend="mysql", breaker=CircuitBreaker(BREAKER_THRESHOLD, cooldown), **refused)
+    results["refused_with_breaker"] = checkout_calls(pool, calls)
+
+    with tempfile.TemporaryDirectory() as root:
+        # The database directory disappears and comes back: the breaker opens, then one trial
+        # checkout after the cooldown finds it again and closes it
+        path = os.path.join(root, "data", "outage.db")
+        pool = ConnectionPool(backend="sqlite", breaker=CircuitBreaker(BREAKER_THRESHOLD, cooldown), path=path)
+        during = checkout_calls(pool, calls)
+        os.makedirs(os.path.dirname(path))
+        still_open = checkout_calls(pool, 1)
+        time.sleep(cooldown)
+        after = checkout_calls(pool, 1)
+        results["recovery"] = {"during_outage": during, "before_cooldown": still_open, "after_cooldown": after,
+                               "breaker": pool.breaker.stats()}
+
+        # A runaway query is interrupted at the query timeout, and the connection is not reused
+        pool = ConnectionPool(backend="sqlite", path=path, query_timeout=1)
+        conn = pool.get_connection()
+        cursor = conn.cursor()
+        start = time.perf_counter()
+        try:
+            cursor.execute("WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) SELECT COUNT(*) FROM n")
+            error = None
+        except Exception as e:
+            error = str(e)
+        finally:
+            cursor.close()
+            conn.close()
+        results["query_timeout"] = {"timeout_seconds": 1, "seconds": round(time.perf_counter() - start, 3),
+                                    "error": error, "connections_opened": pool.stats()["connections_opened"],
+                                    "idle_after": pool.stats()["idle"]}
+    results["failures"] = outage_failures(results, calls, cooldown)
+    return results
+
+
+def session_request(user_id):
+    # What a browser sends after logging in as user_id: the signed session cookie
+    from starlette.requests import Request
+    import gradio as gr
+    from session import SESSION_COOKIE, issue_token
+    cookie = f"{SESSION_COOKIE}={issue_token(user_id)}".encode()
+    return gr.Request(request=Request({"type": "http", "headers": [(b"cookie", cookie)]}))
+
+
+def session_view(user_id):
+    # One page load plus a "My Registrations" refresh, the way the attendee dashboard runs them
+    import attendee
+    session_user, welcome, _, _ = attendee.load_dashboard(session_request(user_id))
+    frame = attendee.get_user_events(session_user)
+    events = set(frame["Event ID"]) if "Event ID" in frame else set()
+    return user_id, session_user, welcome, events
+
+
+def session_isolation(sessions, rounds):
+    # Many users share one process; every concurrent page load must see its own user and only
+    # that user's registrations, never a neighbour's
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT user_id FROM HOST GROUP BY user_id ORDER BY COUNT(*) DESC, user_id LIMIT %s", (sessions,))
+        users = [user_id for (user_id,) in cursor.fetchall()]
+        expected = {
+            user_id: {row[0] for row in statements.fetchall(conn, "USER_EVENTS", (user_id,))}
+            for user_id in users
+        }
+    finally:
+        cursor.close()
+        conn.close()
+
+    visits = [user_id for _ in range(rounds) for user_id in users]
+    np.random.default_rng(0).shuffle(visits)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(users)) as executor:
+        results = list(executor.map(session_view, visits))
+    elapsed = time.perf_counter() - start
+
+    mismatches = [
+        {"user": user_id, "session_user": session_user, "extra_events": sorted(events - expected[user_id])[:5],
+         "missing_events": sorted(expected[user_id] - events)[:5]}
+        for user_id, session_user, welcome, events in results
+        if session_user != user_id or user_id not in welcome or events != expected[user_id]
+    ]
+    return {
+        "backend": DB_BACKEND,
+        "users": len(users),
+        "page_loads": len(visits),
+        "mismatches": len(mismatches),
+        "isolated": not mismatches,
+        "examples": mismatches[:5],
+        "seconds": round(elapsed, 4),
+        "failures": [f"{len(mismatches)} page loads saw another user or the wrong registrations"] if mismatches else [],
+    }
+
+
+def page_load_burst(handlers, users, loads):
+    # `loads` dashboards opening at once, spread over `users`, each firing what app.load does
+    visits = [users[i % len(users)] for i in range(loads)]
+    before = get_pool_stats()["queries"]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=loads) as executor:
+        list(executor.map(lambda user_id: [handler(user_id) for handler in handlers], visits))
+    return {"queries": get_pool_stats()["queries"] - before, "seconds": round(time.perf_counter() - start, 4)}
+
+
+def coalesce_benchmark(loads, users, rounds):
+    # Identical concurrent reads share one query with coalescing on; inspect.unwrap gives the
+    # handlers without it. Listings are per user, so only loads for the same user are shared.
+    import inspect
+    import attendee
+    from coalesce import get_coalesce_stats
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT user_id FROM HOST GROUP BY user_id ORDER BY COUNT(*) DESC, user_id LIMIT %s", (users,))
+        user_ids = [user_id for (user_id,) in cursor.fetchall()]
+    finally:
+        cursor.close()
+        conn.close()
+
+    coalesced = [attendee.get_all_events, attendee.get_user_events]
+    plain = [inspect.unwrap(handler) for handler in coalesced]
+    results = {"backend": DB_BACKEND, "loads": loads, "users": len(user_ids)}
+    for name, handlers in (("plain", plain), ("coalesced", coalesced)):
+        page_load_burst(handlers, user_ids, loads)
+        stats = get_coalesce_stats()
+        runs = [page_load_burst(handlers, user_ids, loads) for _ in range(rounds)]
+        results[name] = {
+            "queries_per_burst": max(run["queries"] for run in runs),
+            "seconds": min(run["seconds"] for run in runs),
+        }
+        if name == "coalesced":
+            after = get_coalesce_stats()
+            results[name].update({key: after[key] - stats[key] for key in ("calls", "executed", "coalesced", "cached")})
+    return results
+
+
+def change_feed_benchmark(calls, page_size):
+    # A full listing read vs the timer's delta poll, idle and after one registration count change
+    import attendee
+    _, _, attendee_user, _ = pick_handler_targets()
+    _, page = attendee.get_all_events(attendee_user, page_size)
+    if not page:
+        return {"error": "No upcoming events to list; run datagen.py first"}
+    event_id = page["rows"]["event_id"].iloc[0]
+
+    full, idle, changed, queries = [], [], [], {}
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        for _ in range(calls):
+            queries["full"], elapsed = count_queries(attendee.get_all_events, attendee_user, page_size)
+            full.append(elapsed)
+            # Two idle polls first, so the lagging cursor has caught up with every earlier change
+            for _ in range(2):
+                _, page = attendee.refresh_events(attendee_user, page_size, page)
+            queries["idle_poll"], elapsed = count_queries(attendee.refresh_events, attendee_user, page_size, page)
+            idle.append(elapsed)
+            # Bump and restore the counter: logged changes to an event on the page
+            cursor.execute("UPDATE EVENTS SET registration_count = registration_count + 1 WHERE event_id = %s", (event_id,))
+            cursor.execute("UPDATE EVENTS SET registration_count = registration_count - 1 WHERE event_id = %s", (event_id,))
+            conn.commit()
+            queries["changed_poll"], elapsed = count_queries(attendee.refresh_events, attendee_user, page_size, page)
+            changed.append(elapsed)
+            _, page = attendee.refresh_events(attendee_user, page_size, page)
+    finally:
+        cursor.close()
+        conn.close()
+    return {
+        "backend": DB_BACKEND,
+        "page_size": page_size,
+        "full_read": {**latency_summary(full), "queries": queries["full"]},
+        "idle_poll": {**latency_summary(idle), "queries": queries["idle_poll"]},
+        "changed_poll": {**latency_summary(changed), "queries": queries["changed_poll"]},
+    }
+
+
+def filter_benchmark(calls, page_size):
+    # First-page reads of the attendee listing under each filter the search bar offers
+    import attendee
+    from cache import get_department_defaults
+    _, _, attendee_user, _ = pick_handler_targets()
+    departments = sorted(get_department_defaults())
+    if not departments:
+        return {"error": "No departments; run datagen.py first"}
+    today = date.today()
+    filter_sets = {
+        "none": {},
+        "dept": {"dept": departments[0]},
+        "next_30_days": {"date_from": today, "date_to": today + timedelta(days=30)},
+        "fee_range": {"fee_min": 0, "fee_max": 200},
+        "min_seats": {"min_seats": 20},
+        "event_prefix": {"event_prefix": attendee.like_prefix("G0001")},
+        "dept_and_dates": {"dept": departments[0], "date_from": today, "date_to": today + timedelta(days=30)},
+    }
+
+    results = {}
+    for name, filters in filter_sets.items():
+        timings = []
+        for _ in range(calls):
+            queries, elapsed = count_queries(attendee.get_all_events, attendee_user, page_size, None, None, filters)
+            timings.append(elapsed)
+        df, page = attendee.get_all_events(attendee_user, page_size, filters=filters)
+        rows = len(page["rows"]) if page else 0
+        results[name] = {**latency_summary(timings), "queries": queries, "rows": rows}
+    return {"backend": DB_BACKEND, "page_size": page_size, "filters": results}
+
+
+def seed_event_history(count, user_id, stride):
+    # Past events dated before the archive cutoff, the given user registered for every stride-th
+    from archive import archive_cutoff
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT dept FROM DEPARTMENT ORDER BY dept")
+        departments = [row[0] for row in cursor.fetchall()]
+        last = archive_cutoff() - timedelta(days=1)
+        events = [
+            (f"{BENCH_EVENT_PREFIX}{i:08d}", last - timedelta(days=i % 3650), "10:00:00", departments[i % len(departments)])
+            for i in range(count)
+        ]
+        registrations = [(event[0], user_id) for event in events[::stride]]
+        # Counters stay as they are; drop_benchmark_events removes the rows again
+        cursor.execute(queries.SKIP_HOST_TRIGGERS)
+        try:
+            for start in range(0, count, 5000):
+                cursor.executemany("INSERT INTO EVENTS (event_id, date, time, dept) VALUES (%s, %s, %s, %s)",
+                                   events[start:start + 5000])
+            for start in range(0, len(registrations), 5000):
+                cursor.executemany(queries.INSERT_REGISTRATION, registrations[start:start + 5000])
+        finally:
+            cursor.execute(queries.RESTORE_HOST_TRIGGERS)
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def archive_benchmark(history, stride, calls):
+    # The hot handlers with `history` past events still in EVENTS / HOST, then after archive.py
+    # has moved them out, plus the opt-in history view that reads the archive. Like
+    # maintenance.py archive-events, this archives the database's own past events too: they
+    # are moved first, so the timings only reflect the seeded history.
+    import attendee
+    from archive import archive_past_events
+    _, _, attendee_user, _ = pick_handler_targets()
+    handlers = {
+        "get_all_events": lambda: attendee.get_all_events(attendee_user),
+        "get_user_events": lambda: attendee.get_user_events(attendee_user),
+    }
+    result = {"backend": DB_BACKEND, "history": history, "user_history": len(range(0, history, stride))}
+    try:
+        drop_benchmark_events()
+        conn = get_db_connection()
+        try:
+            result["already_past"], _ = archive_past_events(conn)
+        finally:
+            conn.close()
+        start = time.perf_counter()
+        seed_event_history(history, attendee_user, stride)
+        result["seed_seconds"] = round(time.perf_counter() - start, 2)
+        result["before"] = {name: time_handler(fn, calls) for name, fn in handlers.items()}
+
+        conn = get_db_connection()
+        try:
+            start = time.perf_counter()
+            events, registrations = archive_past_events(conn)
+            result["archive"] = {"events": events, "registrations": registrations,
+                                 "seconds": round(time.perf_counter() - start, 2)}
+        finally:
+            conn.close()
+
+        handlers["get_user_events[include_archived]"] = lambda: attendee.get_user_events(attendee_user, True)
+        result["after"] = {name: time_handler(fn, calls) for name, fn in handlers.items()}
+    finally:
+        drop_benchmark_events()
+        # Removing the archived rows bypasses the rollup triggers
+        rebuild_event_rollups()
+    return result
+
+
+ROSTER_EVENT_ID = "BQROSTER"
+
+
+def seed_roster(size):
+    # One event with `size` registrations from freshly seeded users
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("INSERT INTO DEPARTMENT VALUES (%s, 0, %s)", (BENCH_DEPARTMENT, size))
+        users = [(f"{BENCH_USER_PREFIX}{i:07d}", BENCH_DEPARTMENT, 0) for i in range(size)]
+        cursor.execute(
+            "INSERT INTO EVENTS (event_id, date, time, dept) VALUES (%s, %s, '10:00:00', %s)",
+            (ROSTER_EVENT_ID, date.today() + timedelta(days=1), BENCH_DEPARTMENT),
+        )
+        cursor.execute(queries.SKIP_HOST_TRIGGERS)
+        try:
+            for start in range(0, size, 5000):
+                cursor.executemany("INSERT INTO USERS VALUES (%s, %s, %s)", users[start:start + 5000])
+                cursor.executemany(queries.INSERT_REGISTRATION,
+                                   [(ROSTER_EVENT_ID, user[0]) for user in users[start:start + 5000]])
+        finally:
+            cursor.execute(queries.RESTORE_HOST_TRIGGERS)
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def traced(fn):
+    # (peak Python heap bytes, seconds) while fn runs
+    import tracemalloc
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1], time.perf_counter() - start
+    finally:
+        tracemalloc.stop()
+
+
+def export_benchmark(sizes):
+    # Streaming roster export vs reading the roster into a DataFrame and writing it from there
+    import export
+    import tempfile
+    results = []
+    try:
+        for size in sizes:
+            drop_benchmark_events()
+            seed_roster(size)
+
+            def streamed():
+                conn = get_db_connection()
+                try:
+                    export.export_query(conn, queries.EVENT_ROSTER, (ROSTER_EVENT_ID,), "roster")
+                finally:
+                    conn.close()
+
+            def materialized():
+                conn = get_db_connection()
+                try:
+                    df = statements.read_frame(conn, "EVENT_ROSTER", (ROSTER_EVENT_ID,))
+                    with tempfile.TemporaryDirectory() as directory:
+                        df.to_csv(f"{directory}/roster.csv", index=False)
+                finally:
+                    conn.close()
+
+            for name, fn in (("streamed", streamed), ("dataframe", materialized)):
+                peak, elapsed = traced(fn)
+                results.append({"export": name, "rows": size, "peak_mb": round(peak / 2**20, 2),
+                                "seconds": round(elapsed, 3)})
+    finally:
+        drop_benchmark_events()
+    return {"backend": DB_BACKEND, "chunk_size": export.EXPORT_CHUNK_SIZE, "results": results}
+
+
+# What the Analytics tab would cost computed from the views instead of the rollup
+VIEW_ANALYTICS = """
+    SELECT event_dept, date, COUNT(*) AS registrations
+    FROM UserEventDetails
+    WHERE date BETWEEN %s AND %s
+    GROUP BY event_dept, date
+"""
+
+
+def analytics_benchmark(sizes, calls):
+    # Analytics tab latency as one event's registrations grow, vs the same totals from the views
+    import host
+    _, host_user, _, _ = pick_handler_targets()
+    start, end = (date.today() - timedelta(days=30)).isoformat(), (date.today() + timedelta(days=90)).isoformat()
+
+    def from_views():
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(VIEW_ANALYTICS, (start, end))
+            cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+
+    results = []
+    try:
+        for size in sizes:
+            drop_benchmark_events()
+            seed_roster(size)
+            results.append({
+                "extra_registrations": size,
+                "rollup": time_handler(lambda: host.get_analytics(host_user, start, end), calls),
+                "views": time_handler(from_views, calls),
+            })
+    finally:
+        drop_benchmark_events()
+    return {"backend": DB_BACKEND, "results": results}
+
+
+STARTUP_PROBE = """
+import json, time
+import gradio, pandas
+from db import get_pool_stats
+start = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+{module}.create_app()
+built = time.perf_counter()
+stats = get_pool_stats()
+print(json.dumps({{"import_seconds": round(imported - start, 4), "build_seconds": round(built - imported, 4),
+                  "connections": stats["checkouts"], "queries": stats["queries"]}}))
+"""
+
+
+def startup_benchmark(modules):
+    # Each app starts in a fresh interpreter; gradio and pandas are imported before the clock
+    # starts since every app pays for them the same way
+    results = {}
+    for module in modules:
+        output = subprocess.run([sys.executable, "-c", STARTUP_PROBE.format(module=module)],
+                                capture_output=True, text=True, check=True).stdout
+        results[module] = json.loads(output.strip().splitlines()[-1])
+    return results
+
+
+def synthetic_event_frame(rows):
+    rng = np.random.default_rng(0)
+    today = pd.Timestamp(date.today())
+    return pd.DataFrame({
+        "event_id": [f"E{i:06d}" for i in range(rows)],
+        "date": (today + pd.to_timedelta(rng.integers(-365, 365, rows), unit="D")).date,
+        "time": pd.to_timedelta(rng.integers(8 * 60, 20 * 60, rows), unit="min"),
+        "dept": rng.choice(["CSE", "ECE"], rows),
+        "fee": 100,
+        "registration_count": rng.integers(0, 60, rows),
+        "max_capacity": rng.choice([0, 30, 50], rows),
+    })
+
+
+def rowwise_format(df):
+    # The per-row apply() formatting host.get_hosted_events used before formatting.py
+    df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
+    df['time'] = df['time'].astype(str).str.slice(-8, -3)
+    now = date.today()
+    df['status'] = df.apply(
+        lambda row: "Upcoming" if pd.to_datetime(row['date']).date() >= now else "Past",
+        axis=1
+    )
+    df['availability'] = df.apply(
+        lambda row: f"{int((row['max_capacity'] - row['registration_count']) / row['max_capacity'] * 100)}%"
+        if row['max_capacity'] > 0 else "N/A",
+        axis=1
+    )
+    return df
+
+
+def vectorized_format(df):
+    df = formatting.format_event_frame(df, status=True)
+    df['availability'] = formatting.availability(df['max_capacity'], df['registration_count'])
+    return formatting.to_display(df, formatting.HOSTED_EVENT_COLUMNS)
+
+
+def formatting_benchmark(rows, repeat):
+    source = synthetic_event_frame(rows)
+    results = {"rows": rows}
+    for name, fn in (("vectorized", vectorized_format), ("rowwise", rowwise_format)):
+        timings = []
+        for _ in range(repeat):
+            df = source.copy()
+            start = time.perf_counter()
+            fn(df)
+            timings.append(time.perf_counter() - start)
+        results[f"{name}_seconds"] = round(min(timings), 4)
+    results["speedup"] = round(results["rowwise_seconds"] / results["vectorized_seconds"], 1)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Event management handler benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    query_count = commands.add_parser("query-count", help="Queries per get_all_events call as the event count grows")
+    query_count.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000],
+                             help="Numbers of extra upcoming events to seed")
+
+    race = commands.add_parser("registration-race", help="Concurrent sign-ups for one event with limited seats")
+    race.add_argument("--attempts", type=int, default=300)
+    race.add_argument("--capacity", type=int, default=50)
+
+    fmt = commands.add_parser("formatting", help="Vectorized vs row-wise result formatting, no database needed")
+    fmt.add_argument("--rows", type=int, default=100_000)
+    fmt.add_argument("--repeat", type=int, default=3)
+
+    handlers = commands.add_parser("handlers", help="Latency percentiles and query counts for the dashboard handlers")
+    handlers.add_argument("--calls", type=int, default=200)
+
+    startup = commands.add_parser("startup", help="Import and build time and queries for each app")
+    startup.add_argument("--apps", nargs="+", default=["login", "host", "attendee"])
+
+    feed = commands.add_parser("change-feed", help="Full listing reads vs change feed polls")
+    feed.add_argument("--calls", type=int, default=100)
+    feed.add_argument("--page-size", type=int, default=250)
+
+    filters = commands.add_parser("filters", help="Listing reads under each search filter")
+    filters.add_argument("--calls", type=int, default=50)
+    filters.add_argument("--page-size", type=int, default=50)
+
+    archive = commands.add_parser("archive", help="Hot handlers with a large event history, before and after archiving it (archives real past events too)")
+    archive.add_argument("--history", type=int, default=1_000_000, help="Past events to seed")
+    archive.add_argument("--stride", type=int, default=100,
+                         help="The most active attendee is registered for every stride-th past event")
+    archive.add_argument("--calls", type=int, default=50)
+
+    roster = commands.add_parser("export", help="Peak memory of a streamed roster export vs a DataFrame, as the roster grows")
+    roster.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000])
+
+    analytics = commands.add_parser("analytics", help="Analytics tab latency from the rollup vs the views as registrations grow")
+    analytics.add_argument("--sizes", type=int, nargs="+", default=[0, 10_000, 100_000])
+    analytics.add_argument("--calls", type=int, default=50)
+
+    sessions = commands.add_parser("sessions", help="Concurrent page loads for many users; checks each sees only its own data")
+    sessions.add_argument("--users", type=int, default=50)
+    sessions.add_argument("--rounds", type=int, default=20, help="Page loads per user")
+
+    burst = commands.add_parser("coalesce", help="Concurrent identical page loads with and without read coalescing")
+    burst.add_argument("--loads", type=int, default=50, help="Dashboards opened at once")
+    burst.add_argument("--users", type=int, default=1, help="Distinct attendees the loads are spread over")
+    burst.add_argument("--rounds", type=int, default=10)
+
+    outage = commands.add_parser("outage", help="Checkout latency with a hung, refused or missing database, with and without the circuit breaker")
+    outage.add_argument("--calls", type=int, default=20)
+    outage.add_argument("--connect-timeout", type=int, default=1)
+    outage.add_argument("--cooldown", type=float, default=2)
+
+    prepared = commands.add_parser("prepared", help="Hot statements sent as text vs as server-side prepared statements")
+    prepared.add_argument("--calls", type=int, default=1000)
+
+    args = parser.parse_args()
+    if args.command == "query-count":
+        result = query_count_benchmark(args.sizes)
+    elif args.command == "registration-race":
+        result = registration_race(args.attempts, args.capacity)
+    elif args.command == "startup":
+        result = startup_benchmark(args.apps)
+    elif args.command == "handlers":
+        result = handler_benchmark(args.calls)
+    elif args.command == "change-feed":
+        result = change_feed_benchmark(args.calls, args.page_size)
+    elif args.command == "filters":
+        result = filter_benchmark(args.calls, args.page_size)
+    elif args.command == "archive":
+        result = archive_benchmark(args.history, args.stride, args.calls)
+    elif args.command == "export":
+        result = export_benchmark(args.sizes)
+    elif args.command == "analytics":
+        result = analytics_benchmark(args.sizes, args.calls)
+    elif args.command == "sessions":
+        result = session_isolation(args.users, args.rounds)
+    elif args.command == "coalesce":
+        result = coalesce_benchmark(args.loads, args.users, args.rounds)
+    elif args.command == "outage":
+        result = outage_benchmark(args.calls, args.connect_timeout, args.cooldown)
+    elif args.command == "prepared":
+        result = prepared_benchmark(args.calls)
+    else:
+        result = formatting_benchmark(args.rows, args.repeat)
+    print(json.dumps(result, indent=2))
+    # Check commands list what they caught under "failures"; any makes the run fail
+    if isinstance(result, dict) and result.get("failures"):
+        sys.exit(1)
@@ -0,0 +1,157 @@
+import functools
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict
+from db import get_db_connection
+import statements
+import metrics
+
+CACHE_TTL = float(os.environ.get("CACHE_TTL", "300"))
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "1024"))
+
+_MISSING = object()
+
+
+class TTLCache:
+    def __init__(self, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self._stats["misses"] += 1
+                return default
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, *key):
+        with self._lock:
+            if self._entries.pop(key, _MISSING) is not _MISSING:
+                self._stats["invalidations"] += 1
+
+    def invalidate_all(self, name):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == name]:
+                del self._entries[key]
+                self._stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        stats["max_entries"] = self.max_entries
+        stats["ttl"] = self.ttl
+        return stats
+
+
+reference_cache = TTLCache()
+
+
+def cached(name, cache_if=None):
+    # Entries are keyed by (name, *bound arguments), so invalidate(name, user_id) hits the call with that user
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (name, *bound.arguments.values())
+            value = reference_cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            value = fn(*args, **kwargs)
+            if cache_if is None or cache_if(value):
+                reference_cache.set(key, value)
+            return value
+        return wrapper
+    return decorator
+
+
+@cached("department_defaults", cache_if=bool)
+def get_department_defaults():
+    conn = get_db_connection()
+    if not conn:
+        return {}
+
+    try:
+        return {
+            dept: {"fee": fees, "max_capacity": max_capacity}
+            for dept, fees, max_capacity in statements.fetchall(conn, "DEPARTMENT_DEFAULTS")
+        }
+    except Exception as e:
+        print(f"Error fetching department defaults: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
+def load_bootstrap(user_id):
+    # Primes the same entries get_user_info, get_user_department and get_department_defaults
+    # read, so building a dashboard costs one query instead of one per lookup
+    conn = get_db_connection()
+    if not conn:
+        return {"error": "Database connection failed"}, {}
+
+    try:
+        rows = statements.fetchall(conn, "BOOTSTRAP", (user_id,), dictionary=True)
+    except Exception as e:
+        print(f"Error loading dashboard data: {e}")
+        return {"error": str(e)}, {}
+    finally:
+        conn.close()
+
+    departments = {
+        row["department"]: {"fee": row["default_fees"], "max_capacity": row["default_max_capacity"]}
+        for row in rows if row["department"] is not None
+    }
+    if departments:
+        reference_cache.set(("department_defaults",), departments)
+
+    if not rows or rows[0]["user_id"] is None:
+        return {"error": f"User {user_id} not found"}, departments
+    user = {key: rows[0][key] for key in ("user_id", "dept", "no_of_events", "account_type")}
+    reference_cache.set(("user_info", user_id), user)
+    reference_cache.set(("user_department", user_id), user["dept"])
+    return user, departments
+
+
+def add_department_defaults(df):
+    defaults = get_department_defaults()
+    df['fee'] = df['dept'].map({dept: values['fee'] for dept, values in defaults.items()})
+    df['max_capacity'] = df['dept'].map({dept: values['max_capacity'] for dept, values in defaults.items()})
+    return df
+
+
+def get_cache_stats():
+    return reference_cache.stats()
+
+
+metrics.add_collector(lambda: {f"reference_cache_{name}": value for name, value in get_cache_stats().items()})
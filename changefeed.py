@@ -0,0 +1,54 @@
+import os
+import pandas as pd
+import statements
+
+# Seconds between a dashboard's change polls; 0 turns auto refresh off
+CHANGE_FEED_INTERVAL = float(os.environ.get("CHANGE_FEED_INTERVAL", "10"))
+# A poll that finds more changed events than this reloads the page instead of merging
+CHANGE_FEED_MAX_CHANGES = int(os.environ.get("CHANGE_FEED_MAX_CHANGES", "500"))
+# maintenance.py prune-changes keeps this many of the newest versions
+CHANGE_FEED_KEEP = int(os.environ.get("CHANGE_FEED_KEEP", "100000"))
+
+
+def current_version(conn):
+    return statements.fetchone(conn, "CHANGE_FEED_BOUNDS")[1] or 0
+
+
+def changes_since(conn, version):
+    # Returns (latest version, IDs of the events changed after `version`). The IDs are None when
+    # the client cannot catch up by merging: too many changes, or the rows it needs were pruned.
+    floor, latest = statements.fetchone(conn, "CHANGE_FEED_BOUNDS")
+    latest = latest or 0
+    if version == latest:
+        return latest, set()
+    if version > latest or (floor is not None and version < floor - 1):
+        return latest, None
+    rows = statements.fetchall(conn, "CHANGES_SINCE", (version, CHANGE_FEED_MAX_CHANGES + 1))
+    if len(rows) > CHANGE_FEED_MAX_CHANGES:
+        return latest, None
+    return latest, {event_id for _, event_id in rows}
+
+
+def read_changed_rows(conn, sql, params, event_ids):
+    # Current state of the changed events as the listing's query sees them; events that were
+    # deleted or no longer match the listing are simply absent. Statements with named
+    # parameters take the IDs as %(event_0)s, %(event_1)s, ...
+    event_ids = sorted(event_ids)
+    if isinstance(params, dict):
+        names = [f"event_{i}" for i in range(len(event_ids))]
+        sql = sql.format(placeholders=", ".join(f"%({name})s" for name in names))
+        params = {**params, **dict(zip(names, event_ids))}
+    else:
+        sql = sql.format(placeholders=", ".join(["%s"] * len(event_ids)))
+        params = (*params, *event_ids)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        return pd.DataFrame(cursor.fetchall(), columns=list(cursor.column_names))
+    finally:
+        cursor.close()
+
+
+def prune_changes(conn, keep=CHANGE_FEED_KEEP):
+    # Dashboards holding an older version than what is left reload their page on the next poll
+    return statements.execute(conn, "DELETE_CHANGES_BEFORE", (current_version(conn) - keep + 1,))
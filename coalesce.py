@@ -0,0 +1,141 @@
+import copy
+import functools
+import inspect
+import os
+import threading
+import pandas as pd
+import metrics
+from cache import TTLCache
+
+# Concurrent calls to a coalesced handler with the same arguments share one in-flight read
+COALESCE_READS = os.environ.get("COALESCE_READS", "1") == "1"
+# Seconds a finished read keeps answering identical calls; 0 only shares reads still running
+COALESCE_TTL = float(os.environ.get("COALESCE_TTL", "0"))
+COALESCE_MAX_ENTRIES = int(os.environ.get("COALESCE_MAX_ENTRIES", "1024"))
+
+_MISSING = object()
+
+
+def has_error(result):
+    # Handlers report failures in their output; those are shared with waiting callers but never kept
+    if isinstance(result, tuple):
+        return any(has_error(part) for part in result)
+    if isinstance(result, pd.DataFrame):
+        return "Error" in result.columns
+    if isinstance(result, dict):
+        return "Error" in result
+    return False
+
+
+def freeze(value):
+    # Pages and filters arrive as dicts; keys must be hashable
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, ttl=COALESCE_TTL, max_entries=COALESCE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.results = TTLCache(ttl, max_entries) if ttl > 0 else None
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "executed": 0, "coalesced": 0, "cached": 0}
+
+    def do(self, key, fn, cache_if=None):
+        with self._lock:
+            self._stats["calls"] += 1
+            if self.results is not None:
+                value = self.results.get(key, _MISSING)
+                if value is not _MISSING:
+                    self._stats["cached"] += 1
+                    return copy.deepcopy(value)
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["executed"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except Exception as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    # forget() may already have replaced this call with a newer one
+                    if self._calls.get(key) is call:
+                        del self._calls[key]
+                        if self.results is not None and call.error is None and (cache_if is None or cache_if(call.result)):
+                            self.results.set(key, call.result)
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        # Every caller gets its own copy, so no handler can change what another one returns
+        return copy.deepcopy(call.result)
+
+    def forget(self, *names):
+        # Called after writes: later calls read again instead of joining a read that began before
+        # the write, or being answered from before it. No names forgets every handler.
+        with self._lock:
+            for key in [key for key in self._calls if not names or key[0] in names]:
+                del self._calls[key]
+        if self.results is None:
+            return
+        if not names:
+            self.results.clear()
+        for name in names:
+            self.results.invalidate_all(name)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        stats["ttl"] = self.ttl
+        return stats
+
+
+single_flight = SingleFlight()
+
+
+def coalesced(name, cache_if=lambda result: not has_error(result)):
+    # Keys are (name, *bound arguments), like cache.cached, so calls differing only in how the
+    # arguments were passed are still shared. Goes beneath @signed_in so sessions are checked per call.
+    def decorator(fn):
+        if not COALESCE_READS:
+            return fn
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (name, *(freeze(value) for value in bound.arguments.values()))
+            return single_flight.do(key, functools.partial(fn, *args, **kwargs), cache_if)
+        return wrapper
+    return decorator
+
+
+def forget(*names):
+    single_flight.forget(*names)
+
+
+def get_coalesce_stats():
+    return single_flight.stats()
+
+
+metrics.add_collector(lambda: {f"coalesce_{name}": value for name, value in get_coalesce_stats().items()})
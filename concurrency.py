@@ -0,0 +1,44 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from metrics import instrument
+
+# Async mode runs handlers as coroutines that await the blocking DB calls on dedicated,
+# bounded executors, so slow reads never occupy the threads registrations need
+ASYNC_HANDLERS = os.environ.get("ASYNC_HANDLERS", "1") == "1"
+# Keep READ + WRITE below DB_POOL_SIZE so neither group waits on the pool for the other
+DB_READ_CONCURRENCY = int(os.environ.get("DB_READ_CONCURRENCY", "6"))
+DB_WRITE_CONCURRENCY = int(os.environ.get("DB_WRITE_CONCURRENCY", "3"))
+QUEUE_MAX_SIZE = int(os.environ.get("QUEUE_MAX_SIZE", "256"))
+
+READ_EVENT = {"concurrency_id": "db_read", "concurrency_limit": DB_READ_CONCURRENCY}
+WRITE_EVENT = {"concurrency_id": "db_write", "concurrency_limit": DB_WRITE_CONCURRENCY}
+
+_read_executor = ThreadPoolExecutor(max_workers=DB_READ_CONCURRENCY, thread_name_prefix="db-read")
+_write_executor = ThreadPoolExecutor(max_workers=DB_WRITE_CONCURRENCY, thread_name_prefix="db-write")
+
+
+def _async_handler(fn, executor):
+    fn = instrument(fn)
+    if not ASYNC_HANDLERS:
+        return fn
+
+    @functools.wraps(fn)
+    async def handler(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+    return handler
+
+
+def read_handler(fn):
+    return _async_handler(fn, _read_executor)
+
+
+def write_handler(fn):
+    return _async_handler(fn, _write_executor)
+
+
+def configure_queue(app):
+    # Per-event limits come from READ_EVENT / WRITE_EVENT; this caps anything left ungrouped
+    return app.queue(default_concurrency_limit=DB_WRITE_CONCURRENCY, max_size=QUEUE_MAX_SIZE)
@@ -0,0 +1,178 @@
+import argparse
+import json
+import time
+from collections import Counter
+from datetime import date, timedelta
+import numpy as np
+from db import get_db_connection
+import queries
+from maintenance import rebuild_event_rollups, reconcile_registration_counts, reconcile_user_event_counts
+
+# Generated rows carry their own prefixes so they can be dropped without touching real data
+GEN_EVENT_PREFIX = "G"
+GEN_USER_PREFIX = "GU"
+GEN_DEPARTMENT_PREFIX = "GD"
+LOAD_CHUNK_SIZE = 5000
+HOST_ACCOUNT_SHARE = 0.05
+
+
+def zipf_weights(count, skew, rng):
+    # Rank r gets weight 1 / r^skew, shuffled so popularity is not tied to ID order
+    weights = 1.0 / np.arange(1, count + 1) ** skew
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+
+def generate(users, departments, events, registrations, past_share=0.3, skew=1.1, seed=0):
+    rng = np.random.default_rng(seed)
+    dept_ids = [f"{GEN_DEPARTMENT_PREFIX}{i:03d}" for i in range(departments)]
+    dept_rows = [
+        (dept, int(rng.integers(0, 21)) * 50, int(rng.choice([30, 50, 100, 200, 500])))
+        for dept in dept_ids
+    ]
+    capacities = {dept: capacity for dept, _, capacity in dept_rows}
+
+    # numpy scalars are converted back to plain str/int; the connector only binds Python types
+    user_ids = np.array([f"{GEN_USER_PREFIX}{i:06d}" for i in range(users)])
+    user_depts = rng.choice(dept_ids, users, p=zipf_weights(departments, 0.8, rng)).tolist()
+    hosts = rng.random(users) < HOST_ACCOUNT_SHARE
+    hosts[0] = True
+    user_rows = [(user_id, dept, 0) for user_id, dept in zip(user_ids.tolist(), user_depts)]
+    login_rows = [
+        (user_id, "datagen", "host" if is_host else "student")
+        for user_id, is_host in zip(user_ids.tolist(), hosts)
+    ]
+
+    today = date.today()
+    past = rng.random(events) < past_share
+    offsets = np.where(past, -rng.integers(1, 366, events), rng.integers(1, 366, events))
+    minutes = rng.integers(8 * 4, 20 * 4, events) * 15
+    event_ids = [f"{GEN_EVENT_PREFIX}{i:06d}" for i in range(events)]
+    event_depts = rng.choice(dept_ids, events).tolist()
+    event_rows = [
+        (event_id, today + timedelta(days=int(offset)), f"{minute // 60:02d}:{minute % 60:02d}:00", dept)
+        for event_id, offset, minute, dept in zip(event_ids, offsets, minutes, event_depts)
+    ]
+
+    # A few popular events and a few very active users take most of the sign-ups
+    host_ids = user_ids[hosts]
+    event_hosts = rng.choice(host_ids, events, p=zipf_weights(len(host_ids), skew, rng)).tolist()
+    wanted = np.floor(zipf_weights(events, skew, rng) * registrations).astype(int)
+    user_weights = zipf_weights(users, skew, rng)
+    host_rows = []
+    for event_id, dept, host, count in zip(event_ids, event_depts, event_hosts, wanted):
+        host_rows.append((event_id, host))
+        count = min(count, capacities[dept] - 1, users - 1)
+        if count <= 0:
+            continue
+        # One extra draw covers the host turning up among them; the rest are cut back to count
+        attendees = rng.choice(users, count + 1, replace=False, p=user_weights)
+        attendees = [user_id for user_id in user_ids[attendees].tolist() if user_id != host][:count]
+        host_rows.extend((event_id, user_id) for user_id in attendees)
+
+    data = {
+        "DEPARTMENT": dept_rows,
+        "USERS": user_rows,
+        "LOGIN": login_rows,
+        "EVENTS": event_rows,
+        "HOST": host_rows,
+    }
+    over = over_capacity(data)
+    if over:
+        raise ValueError(f"{len(over)} generated events exceed their department capacity, e.g. {over[:5]}")
+    return data
+
+
+def over_capacity(data):
+    # (event_id, rows, capacity) for every event with more HOST rows than its department allows
+    capacities = {dept: capacity for dept, _, capacity in data["DEPARTMENT"]}
+    event_depts = {event_id: dept for event_id, _, _, dept in data["EVENTS"]}
+    rows = Counter(event_id for event_id, _ in data["HOST"])
+    return sorted(
+        (event_id, count, capacities[event_depts[event_id]])
+        for event_id, count in rows.items() if count > capacities[event_depts[event_id]]
+    )
+
+
+LOAD_STATEMENTS = {
+    "DEPARTMENT": "INSERT INTO DEPARTMENT (dept, default_fees, default_max_capacity) VALUES (%s, %s, %s)",
+    "USERS": "INSERT INTO USERS (user_id, dept, no_of_events) VALUES (%s, %s, %s)",
+    "LOGIN": "INSERT INTO LOGIN (user_id, password, account_type) VALUES (%s, %s, %s)",
+    "EVENTS": "INSERT INTO EVENTS (event_id, date, time, dept) VALUES (%s, %s, %s, %s)",
+    "HOST": "INSERT INTO HOST (event_id, user_id) VALUES (%s, %s)",
+}
+
+
+def load(data):
+    conn = get_db_connection()
+    if not conn:
+        raise RuntimeError("Database connection failed")
+
+    cursor = conn.cursor()
+    try:
+        # Counters are rebuilt in two statements afterwards instead of by a trigger per HOST row
+        cursor.execute(queries.SKIP_HOST_TRIGGERS)
+        try:
+            for table, statement in LOAD_STATEMENTS.items():
+                rows = data[table]
+                for start in range(0, len(rows), LOAD_CHUNK_SIZE):
+                    cursor.executemany(statement, rows[start:start + LOAD_CHUNK_SIZE])
+        finally:
+            # On SQLite the switch is a table row, so it has to be cleared before the commit
+            cursor.execute(queries.RESTORE_HOST_TRIGGERS)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+    return [reconcile_registration_counts(), reconcile_user_event_counts()]
+
+
+def drop_generated():
+    conn = get_db_connection()
+    if not conn:
+        raise RuntimeError("Database connection failed")
+
+    cursor = conn.cursor()
+    try:
+        users = GEN_USER_PREFIX + "%"
+        cursor.execute("DELETE FROM HOST WHERE user_id LIKE %s", (users,))
+        cursor.execute("DELETE FROM EVENTS WHERE event_id LIKE %s", (GEN_EVENT_PREFIX + "%",))
+        cursor.execute("DELETE FROM HOST_ARCHIVE WHERE user_id LIKE %s", (users,))
+        cursor.execute("DELETE FROM EVENTS_ARCHIVE WHERE event_id LIKE %s", (GEN_EVENT_PREFIX + "%",))
+        cursor.execute("DELETE FROM LOGIN WHERE user_id LIKE %s", (users,))
+        cursor.execute("DELETE FROM USERS WHERE user_id LIKE %s", (users,))
+        cursor.execute("DELETE FROM DEPARTMENT WHERE dept LIKE %s", (GEN_DEPARTMENT_PREFIX + "%",))
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill the schema with synthetic, skewed data for benchmarking")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--departments", type=int, default=20)
+    parser.add_argument("--events", type=int, default=5_000)
+    parser.add_argument("--registrations", type=int, default=200_000,
+                        help="Target number of attendee rows in HOST, capped by each event's capacity")
+    parser.add_argument("--past-share", type=float, default=0.3, help="Fraction of events dated in the past")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent for event and user popularity")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--drop", action="store_true", help="Only remove previously generated rows")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    drop_generated()
+    result = {"dropped": True}
+    if not args.drop:
+        data = generate(args.users, args.departments, args.events, args.registrations,
+                        args.past_share, args.skew, args.seed)
+        result = {table: len(rows) for table, rows in data.items()}
+        result["reconcile"] = load(data)
+    # Dropping archived rows bypasses the rollup triggers, so the rollup is rebuilt either way
+    result["analytics"] = rebuild_event_rollups()
+    result["seconds"] = round(time.perf_counter() - start, 2)
+    print(json.dumps(result, indent=2))
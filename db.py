@@ -0,0 +1,478 @@
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+import mysql.connector
+import metrics
+
+# "mysql" or "sqlite"; the SQLite backend (sqlite_backend.py) needs no server process
+DB_BACKEND = os.environ.get("DB_BACKEND", "mysql")
+
+# Seconds to wait for the server to accept a connection, and for any one query; 0 waits forever.
+# mysql-connector takes whole seconds for the query timeout.
+CONNECT_TIMEOUT = float(os.environ.get("DB_CONNECT_TIMEOUT", "3"))
+QUERY_TIMEOUT = int(os.environ.get("DB_QUERY_TIMEOUT", "30"))
+
+DB_CONFIG = {
+    "host": os.environ.get("DB_HOST", "localhost"),
+    "user": os.environ.get("DB_USER", "root"),
+    "password": os.environ.get("DB_PASSWORD", "123456"),
+    "database": os.environ.get("DB_NAME", "EventManagementSystem"),
+    "connection_timeout": CONNECT_TIMEOUT or None,
+    "read_timeout": QUERY_TIMEOUT or None,
+    "write_timeout": QUERY_TIMEOUT or None,
+}
+
+# Catch these instead of the mysql.connector classes so handlers work on either backend
+DatabaseError = (mysql.connector.Error, sqlite3.Error)
+IntegrityError = (mysql.connector.errors.IntegrityError, sqlite3.IntegrityError)
+
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))
+POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "5"))
+# Idle connections older than this are closed and replaced instead of reused
+POOL_RECYCLE = float(os.environ.get("DB_POOL_RECYCLE", "300"))
+# Connections idle longer than this are pinged before being handed out
+POOL_PING_AFTER = float(os.environ.get("DB_POOL_PING_AFTER", "10"))
+
+# Failed connection attempts are retried this many times, after a random wait of up to
+# DB_RETRY_BACKOFF doubled per attempt (capped at DB_RETRY_BACKOFF_MAX). Timeouts are not retried:
+# the caller has already waited DB_CONNECT_TIMEOUT for a server that is not answering.
+CONNECT_RETRIES = int(os.environ.get("DB_CONNECT_RETRIES", "2"))
+RETRY_BACKOFF = float(os.environ.get("DB_RETRY_BACKOFF", "0.05"))
+RETRY_BACKOFF_MAX = float(os.environ.get("DB_RETRY_BACKOFF_MAX", "1"))
+# After this many failures in a row, checkouts fail at once for DB_BREAKER_COOLDOWN seconds; then one
+# caller tries the database again and closes the breaker if it succeeds. 0 turns the breaker off.
+BREAKER_THRESHOLD = int(os.environ.get("DB_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.environ.get("DB_BREAKER_COOLDOWN", "10"))
+
+# Server gone, unreachable, overloaded or too slow: the errors that count against the breaker
+UNAVAILABLE_ERRNOS = {1040, 1053, 2002, 2003, 2005, 2006, 2013, 2055, 3024}
+TIMEOUT_ERRORS = tuple(
+    getattr(mysql.connector.errors, name)
+    for name in ("ConnectionTimeoutError", "ReadTimeoutError", "WriteTimeoutError")
+    if hasattr(mysql.connector.errors, name)
+)
+# sqlite_backend interrupts queries that run past DB_QUERY_TIMEOUT with "interrupted"
+SQLITE_UNAVAILABLE = {"interrupted", "unable to open database file", "disk I/O error"}
+
+
+def is_timeout(error):
+    return isinstance(error, TIMEOUT_ERRORS) or getattr(error, "errno", None) == 3024 or str(error) == "interrupted"
+
+
+def is_unavailable(error):
+    if isinstance(error, sqlite3.OperationalError):
+        return str(error) in SQLITE_UNAVAILABLE
+    return isinstance(error, TIMEOUT_ERRORS) or getattr(error, "errno", None) in UNAVAILABLE_ERRNOS
+
+
+def backoff(attempt, base=RETRY_BACKOFF, cap=RETRY_BACKOFF_MAX):
+    # Full jitter, so processes retrying after the same outage spread out instead of arriving together
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitOpenError(mysql.connector.errors.PoolError):
+    pass
+
+
+class CircuitBreaker:
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_at = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"failures": 0, "opened": 0, "rejected": 0}
+
+    def allow(self):
+        if self.threshold <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN and now - self._opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self._trial_at = 0.0
+            if self.state == self.HALF_OPEN and now - self._trial_at >= self.cooldown:
+                # One caller at a time tries the database; another may try if it never reports back
+                self._trial_at = now
+                return True
+            if self.state == self.CLOSED:
+                return True
+            self._stats["rejected"] += 1
+            return False
+
+    def retry_in(self):
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.cooldown - (time.monotonic() - self._opened_at))
+
+    def record_success(self):
+        # Called on every connect, ping and statement; skip the lock while nothing has failed
+        if self.state == self.CLOSED and not self._failures:
+            return
+        with self._lock:
+            self._failures = 0
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        # Returns True when this failure opened the breaker
+        if self.threshold <= 0:
+            return False
+        with self._lock:
+            self._failures += 1
+            self._stats["failures"] += 1
+            if self.state == self.OPEN or (self.state == self.CLOSED and self._failures < self.threshold):
+                return False
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._stats["opened"] += 1
+            return True
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["state"] = self.state
+            stats["consecutive_failures"] = self._failures
+        stats["retry_in"] = round(self.retry_in(), 3)
+        stats["threshold"] = self.threshold
+        stats["cooldown"] = self.cooldown
+        return stats
+
+
+class CountingCursor:
+    def __init__(self, pool, cursor, conn):
+        self._pool = pool
+        self._cursor = cursor
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        self._pool._count("queries")
+        start = time.perf_counter()
+        try:
+            result = self._cursor.execute(operation, params, *args, **kwargs)
+            self._pool.breaker.record_success()
+            return result
+        except DatabaseError as e:
+            self._pool._query_failed(self._conn, e)
+            raise
+        finally:
+            metrics.record_query(operation, params, time.perf_counter() - start)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        self._pool._count("queries")
+        start = time.perf_counter()
+        try:
+            result = self._cursor.executemany(operation, seq_params, *args, **kwargs)
+            self._pool.breaker.record_success()
+            return result
+        except DatabaseError as e:
+            self._pool._query_failed(self._conn, e)
+            raise
+        finally:
+            metrics.record_query(operation, f"<{len(seq_params)} rows>", time.perf_counter() - start)
+
+    def _fetch(self, fetch, *args, **kwargs):
+        try:
+            return fetch(*args, **kwargs)
+        except DatabaseError as e:
+            # Unbuffered cursors read from the server here, so a timeout can land on a fetch too
+            self._pool._query_failed(self._conn, e)
+            raise
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._fetch(self._cursor.fetchone)
+        metrics.record_fetch(0 if row is None else 1, time.perf_counter() - start)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        start = time.perf_counter()
+        rows = self._fetch(self._cursor.fetchmany, *args, **kwargs)
+        metrics.record_fetch(len(rows), time.perf_counter() - start)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self._fetch(self._cursor.fetchall)
+        metrics.record_fetch(len(rows), time.perf_counter() - start)
+        return rows
+
+
+class PooledConnection:
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return CountingCursor(self._pool, self._conn.cursor(*args, **kwargs), self._conn)
+
+    def prepared_cursor(self, key):
+        return CountingCursor(self._pool, self._pool._prepared_cursor(self._conn, key), self._conn)
+
+    def discard_prepared(self, key):
+        self._pool._discard_prepared(self._conn, key)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool._release(conn)
+
+
+class ConnectionPool:
+    def __init__(self, size=POOL_SIZE, timeout=POOL_TIMEOUT, recycle=POOL_RECYCLE,
+                 ping_after=POOL_PING_AFTER, backend=DB_BACKEND, retries=CONNECT_RETRIES,
+                 breaker=None, **config):
+        self.backend = backend
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_after = ping_after
+        self.retries = retries
+        self.breaker = breaker or CircuitBreaker()
+        # SQLite takes optional path= and query_timeout= instead of the MySQL connection settings
+        self.config = config or (dict(DB_CONFIG) if backend == "mysql" else {"query_timeout": QUERY_TIMEOUT})
+        # LIFO keeps the busiest connections warm and lets the rest age out
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        # Prepared cursors live as long as the connection they were prepared on
+        self._prepared = {}
+        # Connections that lost the server or timed out mid-query; closed instead of reused
+        self._broken = set()
+        self._stats = {
+            "checkouts": 0,
+            "queries": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "connections_opened": 0,
+            "connections_recycled": 0,
+            "connect_retries": 0,
+            "connect_failures": 0,
+            "health_check_failures": 0,
+            "statements_prepared": 0,
+            "in_use": 0,
+            "checkout_time_total": 0.0,
+            "checkout_time_max": 0.0,
+        }
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def get_connection(self):
+        start = time.perf_counter()
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Database unavailable, retrying in {self.breaker.retry_in():.0f}s")
+        if not self._slots.acquire(blocking=False):
+            self._count("waits")
+            if not self._slots.acquire(timeout=self.timeout):
+                self._count("timeouts")
+                raise mysql.connector.errors.PoolError(
+                    f"No connection available within {self.timeout}s (pool size {self.size})"
+                )
+        try:
+            conn = self._checkout()
+        except Exception as e:
+            self._slots.release()
+            if is_unavailable(e):
+                self._count("connect_failures")
+                self._failed(e)
+            raise
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._stats["in_use"] += 1
+            self._stats["checkout_time_total"] += elapsed
+            self._stats["checkout_time_max"] = max(self._stats["checkout_time_max"], elapsed)
+        return PooledConnection(self, conn)
+
+    def _checkout(self):
+        while True:
+            try:
+                conn, released_at = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+
+            idle_for = time.monotonic() - released_at
+            if idle_for > self.recycle:
+                self._discard(conn)
+                self._count("connections_recycled")
+                continue
+            if idle_for > self.ping_after:
+                try:
+                    conn.ping(reconnect=False)
+                except DatabaseError:
+                    self._discard(conn)
+                    self._count("health_check_failures")
+                    continue
+                self.breaker.record_success()
+            # An idle connection handed out unpinged has not reached the server; its first
+            # statement reports to the breaker instead
+            return conn
+
+    def _connect(self):
+        attempt = 0
+        while True:
+            try:
+                if self.backend == "sqlite":
+                    import sqlite_backend
+                    conn = sqlite_backend.connect(**self.config)
+                else:
+                    conn = mysql.connector.connect(**self.config)
+                break
+            except DatabaseError as e:
+                if attempt >= self.retries or not is_unavailable(e) or is_timeout(e):
+                    raise
+                self._count("connect_retries")
+                time.sleep(backoff(attempt))
+                attempt += 1
+        self._count("connections_opened")
+        self.breaker.record_success()
+        return conn
+
+    def _failed(self, error):
+        if self.breaker.record_failure():
+            print(f"Database unavailable, failing fast for {self.breaker.cooldown:.0f}s: {error}")
+            # Idle connections to a server that stopped answering would only fail the trial call
+            self.close_all()
+
+    def _query_failed(self, conn, error):
+        if is_unavailable(error):
+            with self._lock:
+                self._broken.add(conn)
+            self._failed(error)
+
+    def _prepared_cursor(self, conn, key):
+        # Only the thread holding the connection touches its cursors; the lock guards the outer dict
+        with self._lock:
+            cursors = self._prepared.setdefault(conn, {})
+        cursor = cursors.get(key)
+        if cursor is None:
+            cursor = cursors[key] = conn.cursor(prepared=True)
+            self._count("statements_prepared")
+        return cursor
+
+    def _discard_prepared(self, conn, key):
+        with self._lock:
+            cursor = self._prepared.get(conn, {}).pop(key, None)
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+    def _discard(self, conn):
+        with self._lock:
+            self._prepared.pop(conn, None)
+            self._broken.discard(conn)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _release(self, conn):
+        self._count("in_use", -1)
+        with self._lock:
+            broken = conn in self._broken
+        if broken:
+            self._discard(conn)
+            self._slots.release()
+            return
+        try:
+            # Never hand the next caller an open transaction or a stale snapshot
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put((conn, time.monotonic()))
+        except Exception:
+            self._discard(conn)
+        finally:
+            self._slots.release()
+
+    def close_all(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["size"] = self.size
+        stats["idle"] = self._idle.qsize()
+        checkouts = stats["checkouts"]
+        stats["checkout_time_avg"] = stats["checkout_time_total"] / checkouts if checkouts else 0.0
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+def get_db_connection():
+    try:
+        return get_pool().get_connection()
+    except CircuitOpenError:
+        # Already reported when the breaker opened
+        return None
+    except Exception as e:
+        print(f"Database connection error: {e}")
+        return None
+
+
+def get_pool_stats():
+    return get_pool().stats()
+
+
+def get_circuit_state():
+    return get_pool().breaker.stats()
+
+
+CIRCUIT_STATES = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+
+
+def _pool_gauges():
+    stats = get_pool_stats()
+    gauges = {f"db_pool_{name}": value for name, value in stats.items()}
+    circuit = get_circuit_state()
+    # Prometheus gauges are numbers: 0 closed, 1 half open, 2 open
+    circuit["state"] = CIRCUIT_STATES[circuit["state"]]
+    gauges.update({f"db_circuit_{name}": value for name, value in circuit.items()})
+    return gauges
+
+
+metrics.add_collector(_pool_gauges)
+
@@ -0,0 +1,149 @@
+import re
+import sys
+from db import DB_BACKEND, get_db_connection
+import queries
+
+# Sample parameters for every statement in queries.py, drawn from the seed data.
+# A statement without an entry here fails the check so new queries cannot skip it.
+EXPLAIN_PARAMS = {
+    "USER_INFO": ("U001",),
+    "BOOTSTRAP": ("U002",),
+    "VALID_LOGIN": ("U001", "pass123"),
+    "INSERT_LOGIN": ("U999", "secret", "student"),
+    "DEPARTMENT_DEFAULTS": (),
+    "USER_DEPARTMENT": ("U001",),
+    "CHANGE_FEED_BOUNDS": (),
+    "CHANGES_SINCE": (0, 501),
+    "UPCOMING_EVENT_CHANGES": {"user_id": "U001", "event_0": "E101", "event_1": "E102"},
+    "HOSTED_EVENT_CHANGES": ("U002", "E101", "E103"),
+    "DELETE_CHANGES_BEFORE": (1,),
+    "UPCOMING_EVENTS_AFTER": {"user_id": "U001", "date": "2025-06-01", "time": "10:00:00", "event_id": "E101", "limit": 51},
+    "UPCOMING_EVENTS_BEFORE": {"user_id": "U001", "date": "2025-06-10", "time": "14:00:00", "event_id": "E103", "limit": 51},
+    "HOSTED_EVENTS_AFTER": {"user_id": "U002", "date": "2025-06-01", "time": "10:00:00", "event_id": "E101", "limit": 51},
+    "HOSTED_EVENTS_BEFORE": {"user_id": "U002", "date": "2025-06-10", "time": "14:00:00", "event_id": "E103", "limit": 51},
+    "USER_EVENTS": ("U001",),
+    "USER_EVENT_HISTORY": ("U001", "U001"),
+    "EVENT_DETAILS": ("E101",),
+    "ARCHIVED_EVENT_DETAILS": ("E101",),
+    "ARCHIVED_IS_REGISTERED": ("E101", "U001"),
+    "EVENT_EXISTS": ("E101", "E101"),
+    "EXISTING_EVENT_IDS": ("E101", "E102", "E103"),
+    "EXISTING_ARCHIVED_EVENT_IDS": ("E101", "E102", "E103"),
+    "EVENT_REGISTRATIONS_AFTER": {"event_id": "E101", "user_id": "", "limit": 51},
+    "EVENT_REGISTRATIONS_BEFORE": {"event_id": "E101", "user_id": "U999", "limit": 51},
+    "EVENT_ROSTER": ("E101",),
+    "ANALYTICS_DEPARTMENTS": ("2025-05-01", "2025-07-31"),
+    "ANALYTICS_DAILY": ("2025-05-01", "2025-07-31"),
+    "ANALYTICS_EVENT_FILL": ("U002", "2025-05-01", "2025-07-31"),
+    "IS_REGISTERED": ("E101", "U001"),
+    "ENROLLMENT_EVENT": ("E101",),
+    "EXISTING_USER_IDS": ("U001", "U002", "U003"),
+    "REGISTERED_USER_IDS": ("E101", "U001", "U002"),
+    "INCREMENT_USER_EVENT_COUNTS": ("U001", "U002"),
+    "ADD_REGISTRATION_COUNT": (2, "E101"),
+    "REGISTRATION_DATE": ("E101", "U001"),
+    "INSERT_EVENT": ("E999", "2099-01-01", "10:00:00", "CSE"),
+    "INSERT_REGISTRATION": ("E101", "U001"),
+    "DELETE_REGISTRATION": ("E101", "U001"),
+    "ARCHIVABLE_EVENT_IDS": ("2025-01-01", 1000),
+    "ARCHIVE_EVENTS": ("E101", "E102"),
+    "ARCHIVE_REGISTRATIONS": ("E101", "E102"),
+    "DELETE_ARCHIVED_REGISTRATIONS": ("E101", "E102"),
+    "DELETE_ARCHIVED_EVENTS": ("E101", "E102"),
+}
+
+# The events listing's composed statements: one per optional filter, plus every filter at once
+EVENT_FILTER_PARAMS = {
+    "dept": "CSE", "date_from": "2025-06-01", "date_to": "2025-06-30", "fee_min": 50, "fee_max": 150,
+    "min_seats": 1, "event_prefix": "E1%",
+}
+FILTERED_LISTINGS = {
+    **{f"UPCOMING_EVENTS_AFTER[{name}]": {name} for name in queries.EVENT_FILTERS},
+    "UPCOMING_EVENTS_AFTER[all filters]": set(queries.EVENT_FILTERS),
+}
+for _name in FILTERED_LISTINGS:
+    EXPLAIN_PARAMS[_name] = {**EXPLAIN_PARAMS["UPCOMING_EVENTS_AFTER"], **EVENT_FILTER_PARAMS}
+
+# Reference tables small enough that scanning them is cheaper than an index lookup
+SCAN_ALLOWED_TABLES = {"DEPARTMENT"}
+
+TABLE_REFERENCE = re.compile(
+    r"\b(?:FROM|JOIN|INTO|UPDATE)\s+(\w+)(?:\s+(?!ON\b|WHERE\b|LEFT\b|JOIN\b|ORDER\b|GROUP\b|SET\b|VALUES\b)(\w+))?",
+    re.IGNORECASE,
+)
+
+
+def collect_queries():
+    # Procedure calls and session variable assignments cannot be EXPLAINed; the statements
+    # inside the procedures use the same indexes
+    collected = {
+        name: sql for name, sql in vars(queries).items()
+        if name.isupper() and not name.startswith("_") and isinstance(sql, str)
+        and not sql.lstrip().upper().startswith(("CALL", "SET"))
+    }
+    for name, filters in FILTERED_LISTINGS.items():
+        collected[name] = queries.upcoming_events_after(filters)
+    return collected
+
+
+def table_aliases(sql):
+    aliases = {}
+    for table, alias in TABLE_REFERENCE.findall(sql):
+        aliases[table] = table
+        if alias:
+            aliases[alias] = table
+    return aliases
+
+
+def find_full_scans(name, sql, plan):
+    aliases = table_aliases(sql)
+    scans = []
+    for row in plan:
+        # EXPLAIN INSERT ... VALUES always reports ALL although nothing is read
+        if row.get("type") != "ALL" or row.get("select_type") == "INSERT":
+            continue
+        table = aliases.get(row["table"], row["table"])
+        if table.upper() in SCAN_ALLOWED_TABLES:
+            continue
+        scans.append(f"{name}: full table scan of {table} (~{row['rows']} rows)")
+    return scans
+
+
+def check_queries():
+    conn = get_db_connection()
+    if not conn:
+        return ["Database connection failed"]
+
+    cursor = conn.cursor(dictionary=True)
+    problems = []
+    try:
+        for name, sql in sorted(collect_queries().items()):
+            if name not in EXPLAIN_PARAMS:
+                problems.append(f"{name}: no EXPLAIN parameters registered")
+                continue
+            params = EXPLAIN_PARAMS[name]
+            if "{placeholders}" in sql and isinstance(params, dict):
+                # Named statements take the list as %(event_0)s, %(event_1)s, ...
+                listed = [key for key in params if re.fullmatch(r"event_\d+", key)]
+                sql = sql.format(placeholders=", ".join(f"%({key})s" for key in listed))
+            elif "{placeholders}" in sql:
+                # Statements with leading fixed parameters (REGISTERED_USER_IDS) bind them before the list
+                fixed = sql.split("{placeholders}")[0].count("%s")
+                sql = sql.format(placeholders=", ".join(["%s"] * (len(params) - fixed)))
+            cursor.execute("EXPLAIN " + sql, params)
+            problems.extend(find_full_scans(name, sql, cursor.fetchall()))
+        return problems
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    if DB_BACKEND != "mysql":
+        sys.exit("The EXPLAIN check reads MySQL plans; run it with DB_BACKEND=mysql")
+    problems = check_queries()
+    for problem in problems:
+        print(problem)
+    if problems:
+        sys.exit(1)
+    print(f"Checked {len(collect_queries())} queries, no full table scans")
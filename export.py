@@ -0,0 +1,94 @@
+import csv
+import os
+import shutil
+import tempfile
+import time
+
+# Rows pulled from the server per fetchmany call; memory use is bounded by this, not the result size
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", "5000"))
+# Export files are written here and handed to Gradio, which serves them from its own cache copy
+EXPORT_DIR = os.environ.get("EXPORT_DIR", os.path.join(tempfile.gettempdir(), "event-exports"))
+# Files older than this are removed the next time anything is exported
+EXPORT_MAX_AGE = float(os.environ.get("EXPORT_MAX_AGE_SECONDS", "3600"))
+
+EXPORT_FORMATS = {"CSV": ".csv", "Parquet": ".parquet"}
+
+
+def stream_rows(conn, sql, params, chunk_size=EXPORT_CHUNK_SIZE):
+    # Yields the column names, then the rows in chunks. The cursor is unbuffered, so the server
+    # sends rows as they are fetched instead of the connector reading the whole result first.
+    cursor = conn.cursor(buffered=False)
+    try:
+        cursor.execute(sql, params)
+        yield list(cursor.column_names)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cursor.close()
+
+
+def write_csv(path, header, chunks):
+    rows = 0
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for chunk in chunks:
+            writer.writerows(chunk)
+            rows += len(chunk)
+    return rows
+
+
+def write_parquet(path, header, chunks):
+    # One row group per chunk; pyarrow is only needed when Parquet is asked for
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    rows = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.table({name: list(values) for name, values in zip(header, zip(*chunk))})
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            rows += len(chunk)
+        if writer is None:
+            writer = pq.ParquetWriter(path, pa.schema([(name, pa.string()) for name in header]))
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+WRITERS = {".csv": write_csv, ".parquet": write_parquet}
+
+
+def prune_exports(max_age=EXPORT_MAX_AGE):
+    cutoff = time.time() - max_age
+    for entry in os.scandir(EXPORT_DIR):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except OSError:
+            pass
+
+
+def export_query(conn, sql, params, name, file_format="CSV", header=None, chunk_size=EXPORT_CHUNK_SIZE):
+    # Streams a query's result into a new file named after `name` and returns (path, rows).
+    # `header` maps column names to the labels written in their place.
+    extension = EXPORT_FORMATS[file_format]
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    prune_exports()
+    # A directory per export, so the download keeps the plain file name
+    path = os.path.join(tempfile.mkdtemp(dir=EXPORT_DIR), name + extension)
+    chunks = stream_rows(conn, sql, params, chunk_size)
+    try:
+        columns = next(chunks)
+        rows = WRITERS[extension](path, [(header or {}).get(column, column) for column in columns], chunks)
+    except Exception:
+        chunks.close()
+        shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+        raise
+    return path, rows
@@ -0,0 +1,116 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+HOSTED_EVENT_COLUMNS = {
+    'event_id': 'Event ID',
+    'date': 'Date',
+    'time': 'Time',
+    'dept': 'Department',
+    'fee': 'Fee',
+    'registration_count': 'Registrations',
+    'max_capacity': 'Max Capacity',
+    'availability': 'Availability',
+    'status': 'Status',
+}
+
+UPCOMING_EVENT_COLUMNS = {
+    'event_id': 'Event ID',
+    'date': 'Date',
+    'time': 'Time',
+    'dept': 'Department',
+    'fee': 'Fee',
+    'host_count': 'Host Count',
+    'max_capacity': 'Max Capacity',
+    'registered': 'Registered',
+}
+
+USER_EVENT_COLUMNS = {
+    'event_id': 'Event ID',
+    'date': 'Date',
+    'time': 'Time',
+    'dept': 'Department',
+    'fee': 'Fee',
+    'status': 'Status',
+}
+
+REGISTRATION_COLUMNS = {
+    'user_id': 'User ID',
+    'user_dept': 'Department',
+}
+
+DEPARTMENT_ANALYTICS_COLUMNS = {
+    'dept': 'Department',
+    'events': 'Events',
+    'registrations': 'Registrations',
+    'seats': 'Seats',
+    'fill_rate': 'Fill Rate',
+}
+
+DAILY_ANALYTICS_COLUMNS = {
+    'date': 'Date',
+    'events': 'Events',
+    'registrations': 'Registrations',
+}
+
+EVENT_FILL_COLUMNS = {
+    'event_id': 'Event ID',
+    'date': 'Date',
+    'time': 'Time',
+    'dept': 'Department',
+    'registration_count': 'Registrations',
+    'max_capacity': 'Max Capacity',
+    'fill_rate': 'Fill Rate',
+}
+
+
+def to_dates(values):
+    return pd.to_datetime(values)
+
+
+def format_times(times):
+    # MySQL TIME columns arrive as timedeltas; anything else is parsed from its text form
+    if not pd.api.types.is_timedelta64_dtype(times):
+        times = pd.to_timedelta(times.astype(str))
+    seconds = times.dt.total_seconds().astype('int64')
+    hours = (seconds // 3600).astype(str).str.zfill(2)
+    minutes = (seconds % 3600 // 60).astype(str).str.zfill(2)
+    return hours + ':' + minutes
+
+
+def format_time_value(value):
+    return format_times(pd.Series([value])).iloc[0]
+
+
+def event_status(dates, today=None):
+    today = pd.Timestamp(today or datetime.now().date())
+    return pd.Series(np.where(to_dates(dates) >= today, "Upcoming", "Past"), index=dates.index)
+
+
+def availability(max_capacity, registrations):
+    capacity = max_capacity.astype('float64')
+    has_capacity = capacity > 0
+    percent = np.trunc((capacity - registrations) / capacity.where(has_capacity) * 100)
+    labels = percent.fillna(0).astype('int64').astype(str) + '%'
+    return labels.where(has_capacity, "N/A")
+
+
+def fill_rate(capacity, registrations):
+    capacity = capacity.astype('float64')
+    has_capacity = capacity > 0
+    percent = np.round(registrations / capacity.where(has_capacity) * 100, 1)
+    labels = percent.fillna(0).astype(str) + '%'
+    return labels.where(has_capacity, "N/A")
+
+
+def format_event_frame(df, status=False):
+    dates = to_dates(df['date'])
+    if status:
+        df['status'] = event_status(dates)
+    df['date'] = dates.dt.strftime('%Y-%m-%d')
+    df['time'] = format_times(df['time'])
+    return df
+
+
+def to_display(df, columns):
+    return df[list(columns)].rename(columns=columns)
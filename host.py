@@ -1,73 +1,51 @@
+import csv
+import json
+import os
+import re
 import gradio as gr
-import mysql.connector
 import pandas as pd
 from datetime import datetime, timedelta
-CURRENT_USER_ID = "U002"
+from db import get_db_connection
+import queries
+import statements
+from cache import cached, reference_cache, get_department_defaults, add_department_defaults, load_bootstrap
+from coalesce import coalesced, forget
+from formatting import HOSTED_EVENT_COLUMNS, REGISTRATION_COLUMNS, DEPARTMENT_ANALYTICS_COLUMNS, DAILY_ANALYTICS_COLUMNS, EVENT_FILL_COLUMNS, availability, fill_rate, format_event_frame, format_time_value, to_dates, to_display
+from metrics import start_metrics_server
+from session import HOST_ACCOUNT_TYPES, session_user, signed_in
+from concurrency import READ_EVENT, WRITE_EVENT, read_handler, write_handler, configure_queue
+from pagination import PAGE_SIZE, PAGE_SIZE_CHOICES, EVENT_KEY, EVENT_KEY_START, USER_KEY, USER_KEY_START, read_page, next_page, previous_page, poll_page, reload_page
+from changefeed import CHANGE_FEED_INTERVAL
+from export import EXPORT_FORMATS, export_query
+BULK_CHUNK_SIZE = 500
+BULK_REPORT_COLUMNS = ['Row', 'Event ID', 'Status', 'Message']
+ENROLLMENT_REPORT_COLUMNS = ['User ID', 'Status', 'Message']
 
-def get_db_connection():
-    try:
-        conn = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="123456",
-            database="EventManagementSystem"
-        )
-        return conn
-    except Exception as e:
-        print(f"Database connection error: {e}")
-        return None
-
-def get_user_info():
+@cached("user_info", cache_if=lambda user: "error" not in user)
+def get_user_info(user_id):
     conn = get_db_connection()
     if not conn:
         return {"error": "Database connection failed"}
     
-    cursor = conn.cursor(dictionary=True)
     try:
-        cursor.execute("""
-        SELECT u.user_id, u.dept, u.no_of_events, l.account_type
-        FROM USERS u
-        JOIN LOGIN l ON u.user_id = l.user_id
-        WHERE u.user_id = %s
-        """, (CURRENT_USER_ID,))
-        
-        user = cursor.fetchone()
+        user = statements.fetchone(conn, "USER_INFO", (user_id,), dictionary=True)
         if not user:
-            return {"error": f"User {CURRENT_USER_ID} not found"}
+            return {"error": f"User {user_id} not found"}
         return user
     except Exception as e:
         print(f"Error fetching user info: {e}")
         return {"error": str(e)}
     finally:
-        cursor.close()
-        conn.close()
-
-def get_departments():
-    conn = get_db_connection()
-    if not conn:
-        return []
-    
-    cursor = conn.cursor()
-    try:
-        cursor.execute("SELECT dept FROM DEPARTMENT ORDER BY dept")
-        departments = [dept[0] for dept in cursor.fetchall()]
-        return departments
-    except Exception as e:
-        print(f"Error fetching departments: {e}")
-        return []
-    finally:
-        cursor.close()
         conn.close()
 
-def get_user_department():
+@cached("user_department", cache_if=lambda dept: dept is not None)
+def get_user_department(user_id):
     conn = get_db_connection()
     if not conn:
         return None
     
-    cursor = conn.cursor()
     try:
-        cursor.execute("SELECT dept FROM USERS WHERE user_id = %s", (CURRENT_USER_ID,))
-        result = cursor.fetchone()
+        result = statements.fetchone(conn, "USER_DEPARTMENT", (user_id,))
         if result:
             return result[0]
         return None
@@ -75,158 +53,387 @@ def get_user_department():
         print(f"Error fetching user department: {e}")
         return None
     finally:
-        cursor.close()
         conn.close()
 
-def get_hosted_events():
+def error_frame(message):
+    return pd.DataFrame({"Error": [message]})
+
+def error_page(message):
+    return error_frame(message), None
+
+def validate_host(user_info):
+    if "error" in user_info:
+        return False, f"Error validating host: {user_info['error']}"
+    
+    if user_info['account_type'] not in HOST_ACCOUNT_TYPES:
+        return False, f"User {user_info['user_id']} doesn't have host privileges"
+        
+    return True, "Valid host account"
+
+def check_host(user_id):
+    return validate_host(get_user_info(user_id))
+
+@signed_in(error_page)
+@coalesced("hosted_events")
+def get_hosted_events(user_id, page_size=PAGE_SIZE, after=None, before=None):
     conn = get_db_connection()
     if not conn:
-        return pd.DataFrame({"Error": ["Database connection failed"]})
+        return pd.DataFrame({"Error": ["Database connection failed"]}), None
     
     try:
-        query = """
-        SELECT 
-            e.event_id, 
-            e.date, 
-            e.time, 
-            e.dept,
-            d.default_fees AS fee,
-            d.default_max_capacity AS max_capacity,
-            (SELECT COUNT(*) FROM HOST WHERE event_id = e.event_id) AS registration_count
-        FROM EVENTS e
-        JOIN DEPARTMENT d ON e.dept = d.dept
-        JOIN HOST h ON e.event_id = h.event_id
-        WHERE h.user_id = %s
-        GROUP BY e.event_id
-        ORDER BY e.date, e.time
-        """
-        
-        df = pd.read_sql(query, conn, params=(CURRENT_USER_ID,))
-        
-        if df.empty:
-            return pd.DataFrame({"Message": ["You haven't created any events yet"]})
-        
-        df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
-        df['time'] = df['time'].astype(str).str.slice(0, 5)
-        
-        now = datetime.now().date()
-        df['status'] = df.apply(
-            lambda row: "Upcoming" if pd.to_datetime(row['date']).date() >= now else "Past", 
-            axis=1
-        )
-        
-        df['availability'] = df.apply(
-            lambda row: f"{int((row['max_capacity'] - row['registration_count']) / row['max_capacity'] * 100)}%" 
-            if row['max_capacity'] > 0 else "N/A", 
-            axis=1
+        df, page = read_page(
+            conn, "HOSTED_EVENTS_AFTER", "HOSTED_EVENTS_BEFORE",
+            {"user_id": user_id}, EVENT_KEY, EVENT_KEY_START,
+            page_size, after, before, track_changes=True
         )
         
-        display_df = df[['event_id', 'date', 'time', 'dept', 'fee', 'registration_count', 'max_capacity', 'availability', 'status']]
-        display_df.columns = ['Event ID', 'Date', 'Time', 'Department', 'Fee', 'Registrations', 'Max Capacity', 'Availability', 'Status']
+        if df.empty:
+            # The empty page stays tracked, so timer ticks poll the change feed instead of re-reading
+            return pd.DataFrame({"Message": ["You haven't created any events yet"]}), page
         
-        return display_df
+        return display_hosted_events(df), page
     except Exception as e:
         print(f"Error fetching hosted events: {e}")
-        return pd.DataFrame({"Error": [str(e)]})
+        return pd.DataFrame({"Error": [str(e)]}), None
+    finally:
+        conn.close()
+
+def display_hosted_events(df):
+    df = add_department_defaults(df)
+    df = format_event_frame(df, status=True)
+    df['availability'] = availability(df['max_capacity'], df['registration_count'])
+    return to_display(df, HOSTED_EVENT_COLUMNS)
+
+@signed_in(lambda message: (gr.skip(), gr.skip()))
+def refresh_hosted_events(user_id, page_size, page):
+    # Timer tick: merges only the events logged as changed since the page was read (see attendee.refresh_events)
+    if not page:
+        return gr.skip(), gr.skip()
+    
+    conn = get_db_connection()
+    if not conn:
+        return gr.skip(), gr.skip()
+    
+    try:
+        refreshed, changed = poll_page(conn, page, queries.HOSTED_EVENT_CHANGES, (user_id,), EVENT_KEY, page_size)
+    except Exception as e:
+        print(f"Error polling event changes: {e}")
+        return gr.skip(), gr.skip()
     finally:
         conn.close()
+    
+    if refreshed is None:
+        return reload_page(get_hosted_events, page_size, page, user_id)
+    if not changed:
+        return gr.skip(), refreshed
+    if refreshed["rows"].empty:
+        return pd.DataFrame({"Message": ["You haven't created any events yet"]}), refreshed
+    return display_hosted_events(refreshed["rows"].copy()), refreshed
 
-def get_event_registrations(event_id):
+def next_hosted_events_page(user_id, page_size, page):
+    return next_page(get_hosted_events, page_size, page, user_id)
+
+def previous_hosted_events_page(user_id, page_size, page):
+    return previous_page(get_hosted_events, page_size, page, user_id)
+
+@signed_in(error_page)
+@coalesced("event_registrations")
+def get_event_registrations(user_id, event_id, page_size=PAGE_SIZE, after=None, before=None):
     if not event_id:
-        return pd.DataFrame({"Message": ["Please provide an Event ID"]})
+        return pd.DataFrame({"Message": ["Please provide an Event ID"]}), None
     
     conn = get_db_connection()
     if not conn:
-        return pd.DataFrame({"Error": ["Database connection failed"]})
+        return pd.DataFrame({"Error": ["Database connection failed"]}), None
     
     try:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT COUNT(*) FROM HOST 
-            WHERE event_id = %s AND user_id = %s
-        """, (event_id, CURRENT_USER_ID))
-        
-        if cursor.fetchone()[0] == 0:
-            return pd.DataFrame({"Error": ["You are not authorized to view registrations for this event"]})
+        is_host = statements.fetchone(conn, "IS_REGISTERED", (event_id, user_id))[0] > 0
         
-        query = """
-        SELECT 
-            h.user_id,
-            u.dept AS user_dept
-        FROM HOST h
-        JOIN USERS u ON h.user_id = u.user_id
-        WHERE h.event_id = %s
-        ORDER BY h.user_id
-        """
+        if not is_host:
+            return pd.DataFrame({"Error": ["You are not authorized to view registrations for this event"]}), None
         
-        df = pd.read_sql(query, conn, params=(event_id,))
+        df, page = read_page(
+            conn, "EVENT_REGISTRATIONS_AFTER", "EVENT_REGISTRATIONS_BEFORE",
+            {"event_id": event_id}, USER_KEY, USER_KEY_START,
+            page_size, after, before
+        )
         
         if df.empty:
-            return pd.DataFrame({"Message": [f"No registrations yet for event {event_id}"]})
-        
-        display_df = df[['user_id', 'user_dept']]
-        display_df.columns = ['User ID', 'Department']
+            return pd.DataFrame({"Message": [f"No registrations yet for event {event_id}"]}), None
         
-        return display_df
+        return to_display(df, REGISTRATION_COLUMNS), page
     except Exception as e:
         print(f"Error fetching event registrations: {e}")
-        return pd.DataFrame({"Error": [str(e)]})
+        return pd.DataFrame({"Error": [str(e)]}), None
     finally:
         conn.close()
 
-def create_event(event_id, date, time, department):
+def next_registrations_page(user_id, event_id, page_size, page):
+    return next_page(get_event_registrations, page_size, page, user_id, event_id)
+
+def previous_registrations_page(user_id, event_id, page_size, page):
+    return previous_page(get_event_registrations, page_size, page, user_id, event_id)
+
+@signed_in(lambda message: (None, message))
+def export_event_registrations(user_id, event_id, file_format="CSV"):
+    # Streams the full roster to a file instead of loading it into a DataFrame first
+    if not event_id:
+        return None, "Please provide an Event ID"
+    
     conn = get_db_connection()
     if not conn:
-        return "Database connection failed"
+        return None, "Database connection failed"
     
+    try:
+        if statements.fetchone(conn, "IS_REGISTERED", (event_id, user_id))[0] == 0:
+            return None, "You are not authorized to view registrations for this event"
+        
+        name = re.sub(r"\W", "_", event_id) + "_registrations"
+        path, rows = export_query(conn, queries.EVENT_ROSTER, (event_id,), name, file_format, REGISTRATION_COLUMNS)
+        return path, f"Exported {rows} registrations for event {event_id}"
+    except ImportError:
+        return None, "Parquet export needs pyarrow installed"
+    except Exception as e:
+        print(f"Error exporting event registrations: {e}")
+        return None, f"Error exporting registrations: {e}"
+    finally:
+        conn.close()
+
+def validate_event_fields(event_id, date, time, department, departments):
     if not event_id or not date or not time or not department:
-        return "All fields are required"
+        return "All fields are required", None
     
     if not event_id.startswith('E') or len(event_id) != 4:
-        return "Event ID must be in format E### (e.g., E101)"
+        return "Event ID must be in format E### (e.g., E101)", None
     
     try:
         event_date = datetime.strptime(date, "%Y-%m-%d").date()
         if event_date < datetime.now().date():
-            return "Event date must be in the future"
+            return "Event date must be in the future", None
     except ValueError:
-        return "Invalid date format. Use YYYY-MM-DD"
+        return "Invalid date format. Use YYYY-MM-DD", None
     
     try:
         event_time = datetime.strptime(time, "%H:%M").time()
     except ValueError:
-        return "Invalid time format. Use HH:MM (24-hour format)"
+        return "Invalid time format. Use HH:MM (24-hour format)", None
+    
+    if department not in departments:
+        return f"Department {department} does not exist", None
+    
+    return None, (event_date, event_time)
+
+@signed_in(str, allowed=check_host)
+def create_event(user_id, event_id, date, time, department):
+    error, values = validate_event_fields(event_id, date, time, department, get_department_defaults())
+    if error:
+        return error
+    event_date, event_time = values
+    
+    conn = get_db_connection()
+    if not conn:
+        return "Database connection failed"
     
-    cursor = conn.cursor()
     try:
-        cursor.execute("SELECT COUNT(*) FROM EVENTS WHERE event_id = %s", (event_id,))
-        if cursor.fetchone()[0] > 0:
+        if statements.fetchone(conn, "EVENT_EXISTS", (event_id, event_id))[0] > 0:
             return f"Event ID {event_id} already exists"
         
-        cursor.execute("SELECT COUNT(*) FROM DEPARTMENT WHERE dept = %s", (department,))
-        if cursor.fetchone()[0] == 0:
-            return f"Department {department} does not exist"
-        
-        cursor.execute("""
-            INSERT INTO EVENTS (event_id, date, time, dept)
-            VALUES (%s, %s, %s, %s)
-        """, (event_id, event_date, event_time, department))
-        
-        cursor.execute("""
-            INSERT INTO HOST (event_id, user_id)
-            VALUES (%s, %s)
-        """, (event_id, CURRENT_USER_ID))
+        statements.execute(conn, "INSERT_EVENT", (event_id, event_date, event_time, department))
+        statements.execute(conn, "INSERT_REGISTRATION", (event_id, user_id))
         
         conn.commit()
+        # increment_event_count just bumped the host's no_of_events
+        reference_cache.invalidate("user_info", user_id)
+        forget()
         return f"Successfully created event {event_id}"
     except Exception as e:
         conn.rollback()
         return f"Error creating event: {e}"
+    finally:
+        conn.close()
+
+def read_event_rows(path):
+    if path.lower().endswith(".json"):
+        with open(path) as f:
+            rows = json.load(f)
+        return rows.get("events", []) if isinstance(rows, dict) else rows
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+def chunked(items, size=BULK_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def import_events(user_id, rows):
+    # Validate everything in memory first; only rows that pass reach the database
+    departments = get_department_defaults()
+    report = []
+    valid = []
+    seen = set()
+    for number, row in enumerate(rows, start=1):
+        row = {str(key).strip().lower(): "" if value is None else str(value).strip() for key, value in row.items()}
+        event_id = row.get("event_id", "")
+        department = row.get("dept") or row.get("department", "")
+        error, values = validate_event_fields(event_id, row.get("date"), row.get("time"), department, departments)
+        if not error and event_id in seen:
+            error = f"Event ID {event_id} appears more than once in the file"
+        seen.add(event_id)
+        report.append([number, event_id, "Rejected" if error else "Pending", error or ""])
+        if not error:
+            valid.append((len(report) - 1, (event_id, *values, department)))
+    
+    if not valid:
+        return pd.DataFrame(report, columns=BULK_REPORT_COLUMNS)
+    
+    conn = get_db_connection()
+    if not conn:
+        for index, _ in valid:
+            report[index][2:] = ["Rejected", "Database connection failed"]
+        return pd.DataFrame(report, columns=BULK_REPORT_COLUMNS)
+    
+    cursor = conn.cursor()
+    to_insert = []
+    try:
+        existing = set()
+        for chunk in chunked([values[0] for _, values in valid]):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            for statement in (queries.EXISTING_EVENT_IDS, queries.EXISTING_ARCHIVED_EVENT_IDS):
+                cursor.execute(statement.format(placeholders=placeholders), chunk)
+                existing.update(event_id for (event_id,) in cursor.fetchall())
+        
+        for index, values in valid:
+            if values[0] in existing:
+                report[index][2:] = ["Rejected", f"Event ID {values[0]} already exists"]
+            else:
+                to_insert.append((index, values))
+        
+        for chunk in chunked(to_insert):
+            cursor.executemany(queries.INSERT_EVENT, [values for _, values in chunk])
+            cursor.executemany(queries.INSERT_REGISTRATION, [(values[0], user_id) for _, values in chunk])
+        
+        conn.commit()
+        for index, values in to_insert:
+            report[index][2:] = ["Created", f"Successfully created event {values[0]}"]
+        if to_insert:
+            reference_cache.invalidate("user_info", user_id)
+            forget()
+    except Exception as e:
+        conn.rollback()
+        for index, _ in to_insert:
+            report[index][2:] = ["Failed", f"Import rolled back: {e}"]
+    finally:
+        cursor.close()
+        conn.close()
+    
+    return pd.DataFrame(report, columns=BULK_REPORT_COLUMNS)
+
+@signed_in(error_frame, allowed=check_host)
+def bulk_create_events(user_id, file):
+    if file is None:
+        return pd.DataFrame({"Message": ["Please upload a CSV or JSON file"]})
+    
+    path = getattr(file, "name", file)
+    try:
+        rows = read_event_rows(path)
+    except (OSError, ValueError, csv.Error) as e:
+        return pd.DataFrame({"Error": [f"Could not read {os.path.basename(path)}: {e}"]})
+    
+    if not rows:
+        return pd.DataFrame({"Message": ["The uploaded file contains no events"]})
+    return import_events(user_id, rows)
+
+def parse_user_ids(text):
+    return [user_id for user_id in re.split(r"[\s,;]+", text or "") if user_id]
+
+def enroll_users(host_id, event_id, user_ids):
+    # Set-based enrollment: a handful of statements per batch instead of a procedure call
+    # and two trigger UPDATEs for every user
+    conn = get_db_connection()
+    if not conn:
+        return pd.DataFrame({"Error": ["Database connection failed"]})
+    
+    cursor = conn.cursor()
+    try:
+        if statements.fetchone(conn, "IS_REGISTERED", (event_id, host_id))[0] == 0:
+            return pd.DataFrame({"Error": ["You are not authorized to enroll users in this event"]})
+        
+        event = statements.fetchone(conn, "ENROLLMENT_EVENT", (event_id,))
+        if event is None:
+            return pd.DataFrame({"Error": [f"Event {event_id} does not exist"]})
+        event_date, registration_count, max_capacity = event
+        if event_date < datetime.now().date():
+            return pd.DataFrame({"Error": [f"Event {event_id} has already taken place"]})
+        
+        unique = list(dict.fromkeys(user_ids))
+        existing = set()
+        registered = set()
+        for chunk in chunked(unique):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(queries.EXISTING_USER_IDS.format(placeholders=placeholders), chunk)
+            existing.update(user_id for (user_id,) in cursor.fetchall())
+            cursor.execute(queries.REGISTERED_USER_IDS.format(placeholders=placeholders), (event_id, *chunk))
+            registered.update(user_id for (user_id,) in cursor.fetchall())
+        
+        candidates = [user_id for user_id in unique if user_id in existing and user_id not in registered]
+        seats = max(max_capacity - registration_count, 0)
+        enrolled = candidates[:seats]
+        
+        if enrolled:
+            # The flag lives on the pooled connection, so it must be cleared before the connection is reused
+            cursor.execute(queries.SKIP_HOST_TRIGGERS)
+            try:
+                for chunk in chunked(enrolled):
+                    # executemany sends the batch as one multi-row INSERT
+                    cursor.executemany(queries.INSERT_REGISTRATION, [(event_id, user_id) for user_id in chunk])
+            finally:
+                cursor.execute(queries.RESTORE_HOST_TRIGGERS)
+            for chunk in chunked(enrolled):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                cursor.execute(queries.INCREMENT_USER_EVENT_COUNTS.format(placeholders=placeholders), chunk)
+            statements.execute(conn, "ADD_REGISTRATION_COUNT", (len(enrolled), event_id))
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"Error enrolling users: {e}")
+        return pd.DataFrame({"Error": [f"Enrollment rolled back: {e}"]})
     finally:
         cursor.close()
         conn.close()
+    
+    for user_id in enrolled:
+        reference_cache.invalidate("user_info", user_id)
+    if enrolled:
+        forget()
+    
+    enrolled = set(enrolled)
+    report = []
+    seen = set()
+    for user_id in user_ids:
+        if user_id in seen:
+            report.append([user_id, "Skipped", "Listed more than once"])
+        elif user_id not in existing:
+            report.append([user_id, "Rejected", "User does not exist"])
+        elif user_id in registered:
+            report.append([user_id, "Skipped", "Already registered"])
+        elif user_id in enrolled:
+            report.append([user_id, "Enrolled", f"Enrolled in event {event_id}"])
+        else:
+            report.append([user_id, "Rejected", "Event is full"])
+        seen.add(user_id)
+    return pd.DataFrame(report, columns=ENROLLMENT_REPORT_COLUMNS)
 
-def get_event_details(event_id):
+@signed_in(error_frame, allowed=check_host)
+def bulk_enroll_users(user_id, event_id, user_ids_text):
+    if not event_id:
+        return pd.DataFrame({"Message": ["Please provide an Event ID"]})
+    user_ids = parse_user_ids(user_ids_text)
+    if not user_ids:
+        return pd.DataFrame({"Message": ["Please list at least one User ID"]})
+    return enroll_users(user_id, event_id, user_ids)
+
+@signed_in(lambda message: {"Error": message})
+@coalesced("event_details")
+def get_event_details(user_id, event_id):
     if not event_id:
         return {"Message": "Please provide an Event ID"}
     
@@ -234,176 +441,345 @@ def get_event_details(event_id):
     if not conn:
         return {"Error": "Database connection failed"}
     
-    cursor = conn.cursor(dictionary=True)
     try:
-        cursor.execute("""
-            SELECT 
-                e.event_id, 
-                e.date, 
-                e.time, 
-                e.dept,
-                d.default_fees,
-                d.default_max_capacity,
-                (SELECT COUNT(*) FROM HOST WHERE event_id = e.event_id) AS registration_count
-            FROM EVENTS e
-            JOIN DEPARTMENT d ON e.dept = d.dept
-            WHERE e.event_id = %s
-        """, (event_id,))
-        
-        event = cursor.fetchone()
+        event = statements.fetchone(conn, "EVENT_DETAILS", (event_id,), dictionary=True)
+        archived = event is None
+        if archived:
+            # Past events are moved out of EVENTS by archive.py but can still be looked up
+            event = statements.fetchone(conn, "ARCHIVED_EVENT_DETAILS", (event_id,), dictionary=True)
         if not event:
             return {"Error": f"Event {event_id} not found"}
         
         event['date'] = event['date'].strftime('%Y-%m-%d')
-        event['time'] = event['time'].strftime('%H:%M')
+        event['time'] = format_time_value(event['time'])
         
-        cursor.execute("""
-            SELECT COUNT(*) FROM HOST 
-            WHERE event_id = %s AND user_id = %s
-        """, (event_id, CURRENT_USER_ID))
+        defaults = get_department_defaults().get(event['dept'], {})
+        event['default_fees'] = defaults.get('fee')
+        event['default_max_capacity'] = defaults.get('max_capacity')
         
-        is_host = cursor.fetchone()[0] > 0
+        registered = "ARCHIVED_IS_REGISTERED" if archived else "IS_REGISTERED"
+        is_host = statements.fetchone(conn, registered, (event_id, user_id), dictionary=True)['registrations'] > 0
         event['is_host'] = is_host
+        event['archived'] = archived
         
         return event
     except Exception as e:
         print(f"Error fetching event details: {e}")
         return {"Error": str(e)}
     finally:
-        cursor.close()
         conn.close()
 
-def validate_host():
+def analytics_error(message):
+    frame = pd.DataFrame({"Error": [message]})
+    return frame, frame, frame
+
+@signed_in(analytics_error, allowed=check_host)
+@coalesced("analytics")
+def get_analytics(user_id, date_from, date_to):
+    # Reads only the rollup table and the hosted events' counters, so the cost stays flat as
+    # registrations grow
+    try:
+        start = datetime.strptime(date_from, "%Y-%m-%d").date()
+        end = datetime.strptime(date_to, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return analytics_error("Invalid date format. Use YYYY-MM-DD")
+    if start > end:
+        return analytics_error("The start date must not be after the end date")
+    
     conn = get_db_connection()
     if not conn:
-        return False, "Database connection failed"
+        return analytics_error("Database connection failed")
     
-    cursor = conn.cursor()
     try:
-        cursor.execute("""
-            SELECT account_type 
-            FROM LOGIN 
-            WHERE user_id = %s
-        """, (CURRENT_USER_ID,))
-        
-        result = cursor.fetchone()
-        if not result:
-            return False, f"User {CURRENT_USER_ID} not found"
-        
-        account_type = result[0]
-        if account_type != 'admin' and account_type != 'host':
-            return False, f"User {CURRENT_USER_ID} doesn't have host privileges"
-            
-        return True, "Valid host account"
+        departments = statements.read_frame(conn, "ANALYTICS_DEPARTMENTS", (start, end))
+        daily = statements.read_frame(conn, "ANALYTICS_DAILY", (start, end))
+        events = statements.read_frame(conn, "ANALYTICS_EVENT_FILL", (user_id, start, end))
     except Exception as e:
-        return False, f"Error validating host: {e}"
+        print(f"Error fetching analytics: {e}")
+        return analytics_error(str(e))
     finally:
-        cursor.close()
         conn.close()
+    
+    if departments.empty:
+        departments = pd.DataFrame({"Message": ["No events in this date range"]})
+    else:
+        # Every event of a department has that department's default capacity
+        departments = add_department_defaults(departments)
+        departments['seats'] = departments['events'] * departments['max_capacity']
+        departments['fill_rate'] = fill_rate(departments['seats'], departments['registrations'])
+        departments = to_display(departments, DEPARTMENT_ANALYTICS_COLUMNS)
+    
+    if daily.empty:
+        daily = pd.DataFrame({"Message": ["No events in this date range"]})
+    else:
+        daily['date'] = to_dates(daily['date']).dt.strftime('%Y-%m-%d')
+        daily = to_display(daily, DAILY_ANALYTICS_COLUMNS)
+    
+    if events.empty:
+        events = pd.DataFrame({"Message": ["You have no events in this date range"]})
+    else:
+        events = add_department_defaults(events)
+        events = format_event_frame(events)
+        events['fill_rate'] = fill_rate(events['max_capacity'], events['registration_count'])
+        events = to_display(events, EVENT_FILL_COLUMNS)
+    
+    return departments, daily, events
 
-def create_app():
-    is_host, message = validate_host()
-    if not is_host:
-        with gr.Blocks(title="Host Dashboard") as app:
-            gr.Markdown("# 🚫 Access Denied")
-            gr.Markdown(f"**{message}**")
-            gr.Markdown("You need host privileges to access this dashboard.")
-        return app
+def welcome_message(user_info):
+    message = f"# 🎪 Host Dashboard"
+    message += f"\n### Welcome, {user_info['user_id']} ({user_info['dept']})"
+    message += f"\n#### You have hosted {user_info['no_of_events']} events"
+    return message
+
+def load_dashboard(request: gr.Request):
+    # Runs once per browser session: resolves the login cookie to the session's user and
+    # only reveals the dashboard to host accounts
+    user_id = session_user(request)
+    if user_id is None:
+        return None, "# 🎪 Host Dashboard\n### Please log in to continue", gr.update(visible=False), gr.update()
     
-    user_info = get_user_info()
-    user_department = get_user_department()
+    user_info, departments = load_bootstrap(user_id)
+    is_host, message = validate_host(user_info)
+    if not is_host:
+        denied = f"# 🚫 Access Denied\n**{message}**\n\nYou need host privileges to access this dashboard."
+        return None, denied, gr.update(visible=False), gr.update()
     
+    # The department choices come from the same BOOTSTRAP query, not from a read while the UI is built
+    choices = sorted(departments)
+    department = user_info['dept'] if user_info['dept'] in departments else (choices[0] if choices else None)
+    return user_id, welcome_message(user_info), gr.update(visible=True), gr.update(choices=choices, value=department)
+
+def create_app():
     with gr.Blocks(title="Host Dashboard") as app:
-        welcome_message = f"# 🎪 Host Dashboard"
-        if "error" not in user_info:
-            welcome_message += f"\n### Welcome, {user_info['user_id']} ({user_info['dept']})"
-            welcome_message += f"\n#### You have hosted {user_info['no_of_events']} events"
-        else:
-            welcome_message += f"\n### User ID: {CURRENT_USER_ID}"
-        
-        gr.Markdown(welcome_message)
+        current_user = gr.State()
+        welcome = gr.Markdown("# 🎪 Host Dashboard")
         
-        with gr.Tab("My Hosted Events"):
-            with gr.Row():
-                refresh_events_button = gr.Button("Refresh Events List", variant="secondary")
+        with gr.Column(visible=False) as dashboard:
+            with gr.Tab("My Hosted Events"):
+                with gr.Row():
+                    refresh_events_button = gr.Button("Refresh Events List", variant="secondary")
+                    page_size = gr.Dropdown(label="Rows per page", choices=PAGE_SIZE_CHOICES, value=PAGE_SIZE)
+                    previous_events_button = gr.Button("Previous Page", size="sm")
+                    next_events_button = gr.Button("Next Page", size="sm")
             
-            hosted_events_table = gr.DataFrame(label="Events You've Hosted")
+                hosted_events_table = gr.DataFrame(label="Events You've Hosted")
+                hosted_events_page = gr.State()
+                hosted_events_timer = gr.Timer(CHANGE_FEED_INTERVAL or 1, active=CHANGE_FEED_INTERVAL > 0)
             
-            with gr.Row():
-                with gr.Column(scale=1):
-                    gr.Markdown("### View Registrations")
-                    event_id_input = gr.Textbox(label="Event ID", placeholder="Enter Event ID to view registrations")
-                    view_registrations_button = gr.Button("View Registrations", variant="primary")
+                with gr.Row():
+                    with gr.Column(scale=1):
+                        gr.Markdown("### View Registrations")
+                        event_id_input = gr.Textbox(label="Event ID", placeholder="Enter Event ID to view registrations")
+                        view_registrations_button = gr.Button("View Registrations", variant="primary")
+                        with gr.Row():
+                            previous_registrations_button = gr.Button("Previous Page", size="sm")
+                            next_registrations_button = gr.Button("Next Page", size="sm")
+                        with gr.Row():
+                            export_format = gr.Radio(label="Export Format", choices=list(EXPORT_FORMATS), value="CSV")
+                            export_registrations_button = gr.Button("Export Registrations", size="sm")
+                        export_file = gr.File(label="Registrations Export", interactive=False)
+                        export_status = gr.Textbox(label="Export Status", interactive=False)
                 
-                with gr.Column(scale=2):
-                    registrations_table = gr.DataFrame(label="Event Registrations")
+                    with gr.Column(scale=2):
+                        registrations_table = gr.DataFrame(label="Event Registrations")
+                        registrations_page = gr.State()
+            
+                refresh_events_button.click(
+                    fn=read_handler(get_hosted_events),
+                    inputs=[current_user, page_size],
+                    outputs=[hosted_events_table, hosted_events_page],
+                    **READ_EVENT
+                )
+            
+                page_size.change(
+                    fn=read_handler(get_hosted_events),
+                    inputs=[current_user, page_size],
+                    outputs=[hosted_events_table, hosted_events_page],
+                    **READ_EVENT
+                )
+            
+                previous_events_button.click(
+                    fn=read_handler(previous_hosted_events_page),
+                    inputs=[current_user, page_size, hosted_events_page],
+                    outputs=[hosted_events_table, hosted_events_page],
+                    **READ_EVENT
+                )
+            
+                next_events_button.click(
+                    fn=read_handler(next_hosted_events_page),
+                    inputs=[current_user, page_size, hosted_events_page],
+                    outputs=[hosted_events_table, hosted_events_page],
+                    **READ_EVENT
+                )
+            
+                hosted_events_timer.tick(
+                    fn=read_handler(refresh_hosted_events),
+                    inputs=[current_user, page_size, hosted_events_page],
+                    outputs=[hosted_events_table, hosted_events_page],
+                    show_progress="hidden",
+                    **READ_EVENT
+                )
+            
+                view_registrations_button.click(
+                    fn=read_handler(get_event_registrations),
+                    inputs=[current_user, event_id_input, page_size],
+                    outputs=[registrations_table, registrations_page],
+                    **READ_EVENT
+                )
+            
+                previous_registrations_button.click(
+                    fn=read_handler(previous_registrations_page),
+                    inputs=[current_user, event_id_input, page_size, registrations_page],
+                    outputs=[registrations_table, registrations_page],
+                    **READ_EVENT
+                )
             
-            refresh_events_button.click(
-                fn=get_hosted_events,
-                inputs=[],
-                outputs=hosted_events_table
-            )
+                next_registrations_button.click(
+                    fn=read_handler(next_registrations_page),
+                    inputs=[current_user, event_id_input, page_size, registrations_page],
+                    outputs=[registrations_table, registrations_page],
+                    **READ_EVENT
+                )
             
-            view_registrations_button.click(
-                fn=get_event_registrations,
-                inputs=event_id_input,
-                outputs=registrations_table
-            )
+                export_registrations_button.click(
+                    fn=read_handler(export_event_registrations),
+                    inputs=[current_user, event_id_input, export_format],
+                    outputs=[export_file, export_status],
+                    **READ_EVENT
+                )
         
-        with gr.Tab("Create New Event"):
-            with gr.Row():
-                with gr.Column():
-                    new_event_id = gr.Textbox(label="Event ID", placeholder="Enter Event ID (e.g., E104)")
+            with gr.Tab("Create New Event"):
+                with gr.Row():
+                    with gr.Column():
+                        new_event_id = gr.Textbox(label="Event ID", placeholder="Enter Event ID (e.g., E104)")
                     
-                    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-                    new_event_date = gr.Textbox(label="Event Date", placeholder="YYYY-MM-DD", value=tomorrow)
+                        tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+                        new_event_date = gr.Textbox(label="Event Date", placeholder="YYYY-MM-DD", value=tomorrow)
                     
-                    new_event_time = gr.Textbox(label="Event Time", placeholder="HH:MM (24-hour)", value="12:00")
+                        new_event_time = gr.Textbox(label="Event Time", placeholder="HH:MM (24-hour)", value="12:00")
                     
-                    departments = get_departments()
-                    new_event_dept = gr.Dropdown(label="Department", choices=departments, value=user_department if user_department else departments[0] if departments else None)
+                        # Filled by load_dashboard
+                        new_event_dept = gr.Dropdown(label="Department", choices=[])
                     
-                    create_event_button = gr.Button("Create Event", variant="primary")
-                    create_event_status = gr.Textbox(label="Status", interactive=False)
+                        create_event_button = gr.Button("Create Event", variant="primary")
+                        create_event_status = gr.Textbox(label="Status", interactive=False)
             
-            with gr.Row():
-                gr.Markdown("""
-                ### Event Creation Guidelines
-                - Event ID must be in format E### (e.g., E101)
-                - Event Date must be in the future
-                - Event Time must be in 24-hour format (HH:MM)
-                - Department must be selected from the dropdown
-                """)
+                with gr.Row():
+                    gr.Markdown("""
+                    ### Event Creation Guidelines
+                    - Event ID must be in format E### (e.g., E101)
+                    - Event Date must be in the future
+                    - Event Time must be in 24-hour format (HH:MM)
+                    - Department must be selected from the dropdown
+                    """)
             
-            create_event_button.click(
-                fn=create_event,
-                inputs=[new_event_id, new_event_date, new_event_time, new_event_dept],
-                outputs=create_event_status
-            )
+                create_event_button.click(
+                    fn=write_handler(create_event),
+                    inputs=[current_user, new_event_id, new_event_date, new_event_time, new_event_dept],
+                    outputs=create_event_status,
+                    **WRITE_EVENT
+                )
         
-        with gr.Tab("Event Details"):
-            with gr.Row():
-                with gr.Column(scale=1):
-                    detail_event_id = gr.Textbox(label="Event ID", placeholder="Enter Event ID to view details")
-                    detail_button = gr.Button("View Details", variant="secondary")
+            with gr.Tab("Bulk Import"):
+                with gr.Row():
+                    with gr.Column(scale=1):
+                        bulk_file = gr.File(label="Events File", file_types=[".csv", ".json"])
+                        bulk_import_button = gr.Button("Import Events", variant="primary")
+                        gr.Markdown("""
+                        ### File Format
+                        - CSV with the header `event_id,date,time,dept`, or a JSON list of objects with the same keys
+                        - Each row follows the Event Creation Guidelines
+                        - Valid rows are created together in one transaction; the report lists every row's outcome
+                        """)
                 
-                with gr.Column(scale=2):
-                    event_details = gr.JSON(label="Event Details")
+                    with gr.Column(scale=2):
+                        bulk_report = gr.DataFrame(label="Import Report")
             
-            detail_button.click(
-                fn=get_event_details,
-                inputs=detail_event_id,
-                outputs=event_details
-            )
+                bulk_import_button.click(
+                    fn=write_handler(bulk_create_events),
+                    inputs=[current_user, bulk_file],
+                    outputs=bulk_report,
+                    api_name="bulk_create_events",
+                    **WRITE_EVENT
+                )
+        
+            with gr.Tab("Bulk Enrollment"):
+                with gr.Row():
+                    with gr.Column(scale=1):
+                        enroll_event_id = gr.Textbox(label="Event ID", placeholder="Event to enroll users in")
+                        enroll_user_ids = gr.Textbox(label="User IDs", lines=8, placeholder="U001, U002, ...")
+                        enroll_button = gr.Button("Enroll Users", variant="primary")
+                        gr.Markdown("""
+                        ### Enrollment Rules
+                        - Separate User IDs with commas, spaces or new lines
+                        - Users are enrolled in the order listed until the event is full
+                        - Users already registered for the event are skipped
+                        """)
+                
+                    with gr.Column(scale=2):
+                        enroll_report = gr.DataFrame(label="Enrollment Report")
+            
+                enroll_button.click(
+                    fn=write_handler(bulk_enroll_users),
+                    inputs=[current_user, enroll_event_id, enroll_user_ids],
+                    outputs=enroll_report,
+                    api_name="bulk_enroll_users",
+                    **WRITE_EVENT
+                )
+        
+            with gr.Tab("Event Details"):
+                with gr.Row():
+                    with gr.Column(scale=1):
+                        detail_event_id = gr.Textbox(label="Event ID", placeholder="Enter Event ID to view details")
+                        detail_button = gr.Button("View Details", variant="secondary")
+                
+                    with gr.Column(scale=2):
+                        event_details = gr.JSON(label="Event Details")
+            
+                detail_button.click(
+                    fn=read_handler(get_event_details),
+                    inputs=[current_user, detail_event_id],
+                    outputs=event_details,
+                    **READ_EVENT
+                )
+        
+            with gr.Tab("Analytics"):
+                with gr.Row():
+                    analytics_from = gr.Textbox(
+                        label="From", placeholder="YYYY-MM-DD",
+                        value=(datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+                    )
+                    analytics_to = gr.Textbox(
+                        label="To", placeholder="YYYY-MM-DD",
+                        value=(datetime.now() + timedelta(days=90)).strftime("%Y-%m-%d")
+                    )
+                    analytics_button = gr.Button("Show Analytics", variant="primary")
+                
+                department_analytics = gr.DataFrame(label="Registrations per Department")
+                daily_analytics = gr.DataFrame(label="Registrations per Event Day")
+                event_fill_rates = gr.DataFrame(label="Fill Rate of Your Events")
+                
+                analytics_button.click(
+                    fn=read_handler(get_analytics),
+                    inputs=[current_user, analytics_from, analytics_to],
+                    outputs=[department_analytics, daily_analytics, event_fill_rates],
+                    **READ_EVENT
+                )
     
         app.load(
-            fn=get_hosted_events,
+            fn=read_handler(load_dashboard),
             inputs=[],
-            outputs=hosted_events_table
+            outputs=[current_user, welcome, dashboard, new_event_dept],
+            **READ_EVENT
+        ).then(
+            fn=read_handler(get_hosted_events),
+            inputs=[current_user, page_size],
+            outputs=[hosted_events_table, hosted_events_page],
+            **READ_EVENT
         )
     
-    return app
+    return configure_queue(app)
 
-demo = create_app()
 if __name__ == "__main__":
-    demo.launch(server_port=6002)
\ No newline at end of file
+    start_metrics_server(6005)
+    create_app().launch(server_port=6002)
\ No newline at end of file
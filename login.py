@@ -1,33 +1,93 @@
 import gradio as gr
-import mysql.connector as sqltor
-from host import get_db_connection
+from db import DatabaseError, get_db_connection
+import statements
+from metrics import instrument, start_metrics_server
+from session import HOST_ACCOUNT_TYPES, SESSION_COOKIE, SESSION_TTL, issue_token
 
-conn = get_db_connection()
-def login_fn(username, passwd, type):
-    cursor = conn.cursor(dictionary= True)
-    cursor.execute(f"SELECT * FROM LOGIN WHERE user_id = \"{username}\" and password = \"{passwd}\" and account_type = \"{type}\"")
-    result = cursor.fetchall()
-    if result == []:
-        return gr.Info("Invalid Credentials", duration = 3)
-    return gr.Info("Logged in successfully", duration = 3)
+# The radio's labels and the account_type values stored in LOGIN
+ACCOUNT_TYPES = {"Host": "host", "Attendee": "student"}
 
+@instrument
+def login_fn(username, passwd):
+    # Returns (session token, account_type); both are empty when the login fails
+    conn = get_db_connection()
+    if not conn:
+        gr.Info("Database connection failed", duration = 3)
+        return "", ""
+    try:
+        result = statements.fetchone(conn, "VALID_LOGIN", (username, passwd), dictionary=True)
+    finally:
+        conn.close()
+    if result is None:
+        gr.Info("Invalid Credentials", duration = 3)
+        return "", ""
+    gr.Info("Logged in successfully", duration = 3)
+    return issue_token(result["user_id"]), result["account_type"]
 
+
+@instrument
 def create_account(username, passwd, type):
-    cursor = conn.cursor(dictionary= True)
-    cursor.execute(f"INSERT INTO LOGIN VALUES(\"{username}\", \"{passwd}\", \"{type}\"")
-    
-    return gr.Info("Created account", duration = 3)
-
-with gr.Blocks() as login:
-    gr.Markdown("# Login")
-    login_mail = gr.Textbox(show_label= False, placeholder = "Email ID")
-    login_passwd = gr.Textbox(show_label = False, placeholder = "Password", type = 'password')
-    gr.Label= "Account Type"
-    login_type = gr.Radio(choices = ["Host", "Attendee"], label = "Account Type", show_label = True)
-    login_btn = gr.Button("Login")
-    signup_menu = gr.Button("Create account", size = "sm")
-
-    login_btn.click(fn = login_fn, inputs = [login_mail, login_passwd, login_type], outputs= gr.Info(), js="() => window.location.href = 'http://localhost:6002'")
-    signup_menu.click(fn = create_account, inputs = [login_mail, login_passwd, login_type], outputs = gr.Info(), js="() => window.location.href = 'http://localhost:6003'")
-
-login.launch(server_port=6001)
\ No newline at end of file
+    conn = get_db_connection()
+    if not conn:
+        gr.Info("Database connection failed", duration = 3)
+        return "", ""
+    account_type = ACCOUNT_TYPES.get(type)
+    if account_type is None:
+        gr.Info("Please choose an account type", duration = 3)
+        return "", ""
+    try:
+        statements.execute(conn, "INSERT_LOGIN", (username, passwd, account_type))
+        conn.commit()
+    except DatabaseError as e:
+        conn.rollback()
+        gr.Info(f"Could not create account: {getattr(e, 'msg', e)}", duration = 3)
+        return "", ""
+    finally:
+        conn.close()
+
+    gr.Info("Created account", duration = 3)
+    return issue_token(username), account_type
+
+# Standalone apps run on their own ports; server.py passes the paths it mounts them under
+HOST_URL = "http://localhost:6002"
+ATTENDEE_URL = "http://localhost:6003"
+
+# Stores the signed token where the dashboards' requests will carry it, then opens the dashboard
+START_SESSION_JS = f"""
+(token, target) => {{
+    if (!token) return;
+    document.cookie = "{SESSION_COOKIE}=" + token + "; path=/; max-age={SESSION_TTL}; SameSite=Strict";
+    window.location.href = target;
+}}
+"""
+
+def create_app(host_url=HOST_URL, attendee_url=ATTENDEE_URL):
+    def destination(token, account_type):
+        if not token:
+            return "", ""
+        return token, host_url if account_type in HOST_ACCOUNT_TYPES else attendee_url
+
+    with gr.Blocks() as login:
+        gr.Markdown("# Login")
+        login_mail = gr.Textbox(show_label= False, placeholder = "Email ID")
+        login_passwd = gr.Textbox(show_label = False, placeholder = "Password", type = 'password')
+        login_type = gr.Radio(choices = list(ACCOUNT_TYPES), label = "Account Type (new accounts)", show_label = True)
+        login_btn = gr.Button("Login")
+        signup_menu = gr.Button("Create account", size = "sm")
+        # Rendered but hidden so START_SESSION_JS can read them in the browser
+        session_token = gr.Textbox(visible = "hidden")
+        redirect_to = gr.Textbox(visible = "hidden")
+
+        login_btn.click(
+            fn = lambda username, passwd: destination(*login_fn(username, passwd)),
+            inputs = [login_mail, login_passwd], outputs = [session_token, redirect_to], api_name = "login"
+        ).then(fn = None, inputs = [session_token, redirect_to], js = START_SESSION_JS)
+        signup_menu.click(
+            fn = lambda username, passwd, type: destination(*create_account(username, passwd, type)),
+            inputs = [login_mail, login_passwd, login_type], outputs = [session_token, redirect_to], api_name = "create_account"
+        ).then(fn = None, inputs = [session_token, redirect_to], js = START_SESSION_JS)
+    return login
+
+if __name__ == "__main__":
+    start_metrics_server(6004)
+    create_app().launch(server_port=6001)
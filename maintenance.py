@@ -0,0 +1,143 @@
+import argparse
+from db import get_db_connection
+from changefeed import prune_changes
+from archive import archive_cutoff, archive_past_events
+
+
+def reconcile_registration_counts():
+    conn = get_db_connection()
+    if not conn:
+        return "Database connection failed"
+
+    cursor = conn.cursor()
+    try:
+        # Correlated form instead of UPDATE ... JOIN so it also runs on SQLite. Only rows whose
+        # stored count is wrong are written, so rowcount is the number corrected on both backends
+        # (SQLite counts every row an UPDATE matches, MySQL only the ones it changed)
+        cursor.execute("""
+            UPDATE EVENTS
+            SET registration_count = (
+                SELECT COUNT(*) FROM HOST WHERE HOST.event_id = EVENTS.event_id
+            )
+            WHERE registration_count <> (
+                SELECT COUNT(*) FROM HOST WHERE HOST.event_id = EVENTS.event_id
+            )
+        """)
+        corrected = cursor.rowcount
+        conn.commit()
+        return f"Reconciled registration counts, {corrected} events corrected"
+    except Exception as e:
+        conn.rollback()
+        return f"Error reconciling registration counts: {e}"
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def reconcile_user_event_counts():
+    conn = get_db_connection()
+    if not conn:
+        return "Database connection failed"
+
+    cursor = conn.cursor()
+    try:
+        # Written only where the count is wrong, as in reconcile_registration_counts
+        cursor.execute("""
+            UPDATE USERS
+            SET no_of_events = (
+                SELECT COUNT(*) FROM HOST WHERE HOST.user_id = USERS.user_id
+            ) + (
+                SELECT COUNT(*) FROM HOST_ARCHIVE WHERE HOST_ARCHIVE.user_id = USERS.user_id
+            )
+            WHERE no_of_events <> (
+                SELECT COUNT(*) FROM HOST WHERE HOST.user_id = USERS.user_id
+            ) + (
+                SELECT COUNT(*) FROM HOST_ARCHIVE WHERE HOST_ARCHIVE.user_id = USERS.user_id
+            )
+        """)
+        corrected = cursor.rowcount
+        conn.commit()
+        return f"Reconciled user event counts, {corrected} users corrected"
+    except Exception as e:
+        conn.rollback()
+        return f"Error reconciling user event counts: {e}"
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def rebuild_event_rollups():
+    conn = get_db_connection()
+    if not conn:
+        return "Database connection failed"
+
+    cursor = conn.cursor()
+    try:
+        # Archived events stay in the totals, as they do when archive.py moves them
+        cursor.execute("DELETE FROM EVENT_DAILY_ROLLUP")
+        cursor.execute("""
+            INSERT INTO EVENT_DAILY_ROLLUP (dept, date, events, registrations)
+            SELECT dept, date, COUNT(*), SUM(registration_count)
+            FROM (
+                SELECT dept, date, registration_count FROM EVENTS
+                UNION ALL
+                SELECT dept, date, registration_count FROM EVENTS_ARCHIVE
+            ) e
+            WHERE dept IS NOT NULL AND date IS NOT NULL
+            GROUP BY dept, date
+        """)
+        rows = cursor.rowcount
+        conn.commit()
+        return f"Rebuilt analytics rollup, {rows} department days"
+    except Exception as e:
+        conn.rollback()
+        return f"Error rebuilding analytics rollup: {e}"
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def prune_event_changes():
+    conn = get_db_connection()
+    if not conn:
+        return "Database connection failed"
+
+    try:
+        removed = prune_changes(conn)
+        conn.commit()
+        return f"Pruned event change feed, {removed} old versions removed"
+    except Exception as e:
+        conn.rollback()
+        return f"Error pruning event change feed: {e}"
+    finally:
+        conn.close()
+
+
+def archive_events():
+    conn = get_db_connection()
+    if not conn:
+        return "Database connection failed"
+
+    cutoff = archive_cutoff()
+    try:
+        events, registrations = archive_past_events(conn, cutoff)
+        return f"Archived {events} events before {cutoff} with {registrations} registrations"
+    except Exception as e:
+        return f"Error archiving events: {e}"
+    finally:
+        conn.close()
+
+
+COMMANDS = {
+    "reconcile-counts": reconcile_registration_counts,
+    "reconcile-user-counts": reconcile_user_event_counts,
+    "prune-changes": prune_event_changes,
+    "archive-events": archive_events,
+    "rebuild-analytics": rebuild_event_rollups,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Event management maintenance tasks")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args()
+    print(COMMANDS[args.command]())
@@ -0,0 +1,162 @@
+import functools
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+# Loopback only by default; the endpoint is for a local Prometheus scraper, not the public
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "200"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250, 1000)
+
+slow_query_log = logging.getLogger("eventmanagement.slow_queries")
+
+# Handlers run on one thread from start to finish (see concurrency.py), so the DB work
+# a handler does can be attributed to it through a thread-local
+_current = threading.local()
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += 1
+        self.sum += value
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {
+            "handler_duration_seconds": defaultdict(lambda: Histogram(LATENCY_BUCKETS)),
+            "handler_db_seconds": defaultdict(lambda: Histogram(LATENCY_BUCKETS)),
+            "handler_queries": defaultdict(lambda: Histogram(COUNT_BUCKETS)),
+            "handler_rows": defaultdict(lambda: Histogram(COUNT_BUCKETS)),
+        }
+        self._errors = defaultdict(int)
+        self._slow_queries = 0
+        self._collectors = []
+
+    def observe_handler(self, handler, elapsed, db_time, queries, rows, error):
+        with self._lock:
+            self._histograms["handler_duration_seconds"][handler].observe(elapsed)
+            self._histograms["handler_db_seconds"][handler].observe(db_time)
+            self._histograms["handler_queries"][handler].observe(queries)
+            self._histograms["handler_rows"][handler].observe(rows)
+            if error:
+                self._errors[handler] += 1
+
+    def count_slow_query(self):
+        with self._lock:
+            self._slow_queries += 1
+
+    def add_collector(self, collect):
+        # collect() returns {metric_name: value} gauges, read at scrape time
+        self._collectors.append(collect)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for name, histograms in self._histograms.items():
+                lines.append(f"# TYPE {name} histogram")
+                for handler, histogram in sorted(histograms.items()):
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'{name}_bucket{{handler="{handler}",le="{bound}"}} {count}')
+                    lines.append(f'{name}_bucket{{handler="{handler}",le="+Inf"}} {histogram.total}')
+                    lines.append(f'{name}_sum{{handler="{handler}"}} {histogram.sum}')
+                    lines.append(f'{name}_count{{handler="{handler}"}} {histogram.total}')
+            lines.append("# TYPE handler_errors_total counter")
+            for handler, count in sorted(self._errors.items()):
+                lines.append(f'handler_errors_total{{handler="{handler}"}} {count}')
+            lines.append("# TYPE slow_queries_total counter")
+            lines.append(f"slow_queries_total {self._slow_queries}")
+        for collect in self._collectors:
+            for name, value in collect().items():
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def add_collector(collect):
+    registry.add_collector(collect)
+
+
+def record_query(sql, params, elapsed):
+    current = getattr(_current, "handler", None)
+    if current is not None:
+        current["queries"] += 1
+        current["db_time"] += elapsed
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        registry.count_slow_query()
+        # Never write credentials to the log
+        shown = "<redacted>" if "password" in str(sql).lower() else params
+        slow_query_log.warning("Slow query (%.1f ms, handler %s): %s params=%r",
+                               elapsed * 1000, current["name"] if current else "-", " ".join(str(sql).split()), shown)
+
+
+def record_fetch(rows, elapsed):
+    current = getattr(_current, "handler", None)
+    if current is not None:
+        current["rows"] += rows
+        current["db_time"] += elapsed
+
+
+def instrument(fn):
+    if not METRICS_ENABLED:
+        return fn
+
+    @functools.wraps(fn)
+    def handler(*args, **kwargs):
+        outer = getattr(_current, "handler", None)
+        current = _current.handler = {"name": fn.__name__, "queries": 0, "rows": 0, "db_time": 0.0}
+        start = time.perf_counter()
+        error = False
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            error = True
+            raise
+        finally:
+            _current.handler = outer
+            registry.observe_handler(fn.__name__, time.perf_counter() - start, current["db_time"],
+                                     current["queries"], current["rows"], error)
+    return handler
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port):
+    if not METRICS_ENABLED:
+        return None
+    server = ThreadingHTTPServer((METRICS_HOST, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
@@ -0,0 +1,122 @@
+import argparse
+import importlib.util
+import os
+import re
+import mysql.connector
+from db import DB_BACKEND, get_db_connection
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+# Errors meaning the change is already in place, so re-running a migration is harmless
+ALREADY_APPLIED_ERRORS = {
+    1060,  # ER_DUP_FIELDNAME: column already exists
+    1061,  # ER_DUP_KEYNAME: index already exists
+}
+
+
+def discover_migrations():
+    migrations = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(MIGRATIONS_DIR, filename)))
+    return migrations
+
+
+def load_statements(name, path):
+    spec = importlib.util.spec_from_file_location(f"migrations.{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.STATEMENTS
+
+
+def ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS SCHEMA_MIGRATIONS (
+            version INT PRIMARY KEY,
+            name VARCHAR(100),
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def get_applied_versions(cursor):
+    cursor.execute("SELECT version FROM SCHEMA_MIGRATIONS")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def apply_statement(cursor, statement):
+    try:
+        cursor.execute(statement)
+    except mysql.connector.Error as e:
+        if e.errno not in ALREADY_APPLIED_ERRORS:
+            raise
+
+
+def migrate(target=None):
+    conn = get_db_connection()
+    if not conn:
+        return ["Database connection failed"]
+
+    cursor = conn.cursor()
+    log = []
+    try:
+        # Serialise concurrent runners, e.g. several app processes starting at once
+        cursor.execute("SELECT GET_LOCK('schema_migrations', 30)")
+        if cursor.fetchone()[0] != 1:
+            return ["Another migration run holds the schema lock"]
+
+        ensure_migrations_table(cursor)
+        applied = get_applied_versions(cursor)
+        for version, name, path in discover_migrations():
+            if version in applied or (target is not None and version > target):
+                continue
+            for statement in load_statements(name, path):
+                apply_statement(cursor, statement)
+            cursor.execute("INSERT INTO SCHEMA_MIGRATIONS (version, name) VALUES (%s, %s)", (version, name))
+            conn.commit()
+            log.append(f"Applied {version:04d}_{name}")
+
+        if not log:
+            log.append("Schema is up to date")
+        return log
+    except Exception as e:
+        conn.rollback()
+        log.append(f"Migration failed: {e}")
+        return log
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK('schema_migrations')")
+        cursor.fetchall()
+        cursor.close()
+        conn.close()
+
+
+def migration_status():
+    conn = get_db_connection()
+    if not conn:
+        return ["Database connection failed"]
+
+    cursor = conn.cursor()
+    try:
+        ensure_migrations_table(cursor)
+        applied = get_applied_versions(cursor)
+        return [
+            f"{version:04d}_{name}: {'applied' if version in applied else 'pending'}"
+            for version, name, _ in discover_migrations()
+        ]
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply numbered schema migrations")
+    parser.add_argument("--status", action="store_true", help="List migrations and whether they are applied")
+    parser.add_argument("--target", type=int, help="Stop after this migration version")
+    args = parser.parse_args()
+    if DB_BACKEND != "mysql":
+        # sqliteScript.sql already creates the current schema for a new SQLite database
+        parser.exit(2, "Migrations only apply to the MySQL backend\n")
+    for line in migration_status() if args.status else migrate(args.target):
+        print(line)
@@ -0,0 +1,6 @@
+STATEMENTS = [
+    # get_user_events and the per-user HOST lookups filter on user_id first
+    "CREATE INDEX idx_host_user_event ON HOST (user_id, event_id)",
+    # Upcoming-event listings range-scan on date and sort by (date, time)
+    "CREATE INDEX idx_events_date_time ON EVENTS (date, time)",
+]
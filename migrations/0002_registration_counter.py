@@ -0,0 +1,30 @@
+STATEMENTS = [
+    "ALTER TABLE EVENTS ADD COLUMN registration_count INT NOT NULL DEFAULT 0",
+    "DROP TRIGGER IF EXISTS increment_registration_count",
+    """
+    CREATE TRIGGER increment_registration_count
+    AFTER INSERT ON HOST
+    FOR EACH ROW
+    BEGIN
+        UPDATE EVENTS
+        SET registration_count = registration_count + 1
+        WHERE event_id = NEW.event_id;
+    END
+    """,
+    "DROP TRIGGER IF EXISTS decrement_registration_count",
+    """
+    CREATE TRIGGER decrement_registration_count
+    AFTER DELETE ON HOST
+    FOR EACH ROW
+    BEGIN
+        UPDATE EVENTS
+        SET registration_count = registration_count - 1
+        WHERE event_id = OLD.event_id;
+    END
+    """,
+    """
+    UPDATE EVENTS e
+    LEFT JOIN (SELECT event_id, COUNT(*) AS registrations FROM HOST GROUP BY event_id) h ON h.event_id = e.event_id
+    SET e.registration_count = COALESCE(h.registrations, 0)
+    """,
+]
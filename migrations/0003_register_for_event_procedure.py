@@ -0,0 +1,52 @@
+STATEMENTS = [
+    "DROP PROCEDURE IF EXISTS registerForEvent",
+    """
+    CREATE PROCEDURE registerForEvent(IN e_id VARCHAR(10), IN u_id VARCHAR(100))
+    BEGIN
+        -- Status codes: 0 registered, 1 no such event, 2 event passed,
+        -- 3 already registered, 4 event full, 5 no such user
+        DECLARE e_date DATE;
+        DECLARE e_dept VARCHAR(30);
+        DECLARE e_count INT;
+        DECLARE e_capacity INT;
+        DECLARE result_status INT DEFAULT 0;
+        DECLARE CONTINUE HANDLER FOR NOT FOUND SET e_date = NULL;
+        DECLARE EXIT HANDLER FOR SQLEXCEPTION
+        BEGIN
+            ROLLBACK;
+            RESIGNAL;
+        END;
+
+        START TRANSACTION;
+
+        -- Locking the event row queues concurrent sign-ups for the same event
+        SELECT date, dept, registration_count INTO e_date, e_dept, e_count
+        FROM EVENTS
+        WHERE event_id = e_id
+        FOR UPDATE;
+
+        IF e_date IS NULL THEN
+            SET result_status = 1;
+        ELSEIF e_date < CURDATE() THEN
+            SET result_status = 2;
+        ELSEIF NOT EXISTS (SELECT 1 FROM USERS WHERE user_id = u_id) THEN
+            SET result_status = 5;
+        ELSEIF EXISTS (SELECT 1 FROM HOST WHERE event_id = e_id AND user_id = u_id) THEN
+            SET result_status = 3;
+        ELSE
+            SELECT default_max_capacity INTO e_capacity
+            FROM DEPARTMENT
+            WHERE dept = e_dept;
+
+            IF e_count >= e_capacity THEN
+                SET result_status = 4;
+            ELSE
+                INSERT INTO HOST (event_id, user_id) VALUES (e_id, u_id);
+            END IF;
+        END IF;
+
+        COMMIT;
+        SELECT result_status AS status;
+    END
+    """,
+]
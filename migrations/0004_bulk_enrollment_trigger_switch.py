@@ -0,0 +1,29 @@
+STATEMENTS = [
+    "DROP TRIGGER IF EXISTS increment_event_count",
+    """
+    CREATE TRIGGER increment_event_count
+    AFTER INSERT ON HOST
+    FOR EACH ROW
+    BEGIN
+        -- Bulk enrollment sets @skip_host_triggers and applies the counts per batch
+        IF @skip_host_triggers IS NULL THEN
+            UPDATE USERS
+            SET no_of_events = no_of_events + 1
+            WHERE user_id = NEW.user_id;
+        END IF;
+    END
+    """,
+    "DROP TRIGGER IF EXISTS increment_registration_count",
+    """
+    CREATE TRIGGER increment_registration_count
+    AFTER INSERT ON HOST
+    FOR EACH ROW
+    BEGIN
+        IF @skip_host_triggers IS NULL THEN
+            UPDATE EVENTS
+            SET registration_count = registration_count + 1
+            WHERE event_id = NEW.event_id;
+        END IF;
+    END
+    """,
+]
@@ -0,0 +1,40 @@
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS EVENT_CHANGES (
+        version BIGINT AUTO_INCREMENT PRIMARY KEY,
+        event_id VARCHAR(10) NOT NULL
+    )
+    """,
+    # Every HOST insert or delete also moves EVENTS.registration_count (by trigger, by the bulk
+    # enrollment UPDATE or by reconcile-counts), so EVENTS triggers alone see every listing change
+    "DROP TRIGGER IF EXISTS log_event_insert",
+    """
+    CREATE TRIGGER log_event_insert
+    AFTER INSERT ON EVENTS
+    FOR EACH ROW
+    BEGIN
+        INSERT INTO EVENT_CHANGES (event_id) VALUES (NEW.event_id);
+    END
+    """,
+    "DROP TRIGGER IF EXISTS log_event_update",
+    """
+    CREATE TRIGGER log_event_update
+    AFTER UPDATE ON EVENTS
+    FOR EACH ROW
+    BEGIN
+        IF NOT (OLD.date <=> NEW.date AND OLD.time <=> NEW.time AND OLD.dept <=> NEW.dept
+                AND OLD.registration_count <=> NEW.registration_count) THEN
+            INSERT INTO EVENT_CHANGES (event_id) VALUES (NEW.event_id);
+        END IF;
+    END
+    """,
+    "DROP TRIGGER IF EXISTS log_event_delete",
+    """
+    CREATE TRIGGER log_event_delete
+    AFTER DELETE ON EVENTS
+    FOR EACH ROW
+    BEGIN
+        INSERT INTO EVENT_CHANGES (event_id) VALUES (OLD.event_id);
+    END
+    """,
+]
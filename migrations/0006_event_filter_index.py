@@ -0,0 +1,5 @@
+STATEMENTS = [
+    # Department-filtered listings seek to one department and read it in (date, time) order,
+    # instead of walking every upcoming event on idx_events_date_time
+    "CREATE INDEX idx_events_dept_date ON EVENTS (dept, date, time)",
+]
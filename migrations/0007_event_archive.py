@@ -0,0 +1,41 @@
+STATEMENTS = [
+    # Past events and their HOST rows move here (archive.py), so EVENTS and HOST only hold
+    # current data. Plain tables rather than partitions: InnoDB cannot partition a table that
+    # has foreign keys or is referenced by one, and HOST references EVENTS.
+    """
+    CREATE TABLE IF NOT EXISTS EVENTS_ARCHIVE (
+        event_id VARCHAR(10) PRIMARY KEY,
+        date DATE,
+        time TIME,
+        dept VARCHAR(30),
+        registration_count INT NOT NULL DEFAULT 0,
+        FOREIGN KEY (dept) REFERENCES DEPARTMENT(dept)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS HOST_ARCHIVE (
+        event_id VARCHAR(10),
+        user_id VARCHAR(100),
+        PRIMARY KEY (event_id, user_id),
+        FOREIGN KEY (event_id) REFERENCES EVENTS_ARCHIVE(event_id),
+        FOREIGN KEY (user_id) REFERENCES USERS(user_id)
+    )
+    """,
+    # A user's archived history is read by user_id, like idx_host_user_event on HOST
+    "CREATE INDEX idx_host_archive_user_event ON HOST_ARCHIVE (user_id, event_id)",
+    # Archiving deletes HOST rows of events that are deleted right after, so the counter
+    # update is skipped while @skip_host_triggers is set, like the insert triggers (0004)
+    "DROP TRIGGER IF EXISTS decrement_registration_count",
+    """
+    CREATE TRIGGER decrement_registration_count
+    AFTER DELETE ON HOST
+    FOR EACH ROW
+    BEGIN
+        IF @skip_host_triggers IS NULL THEN
+            UPDATE EVENTS
+            SET registration_count = registration_count - 1
+            WHERE event_id = OLD.event_id;
+        END IF;
+    END
+    """,
+]
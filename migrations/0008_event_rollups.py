@@ -0,0 +1,81 @@
+STATEMENTS = [
+    # One row per department and event date with the number of events and their registrations.
+    # Triggers on EVENTS keep it current: every HOST change already moves registration_count
+    # (by trigger, bulk enrollment or reconcile-counts), so HOST needs no triggers of its own.
+    """
+    CREATE TABLE IF NOT EXISTS EVENT_DAILY_ROLLUP (
+        dept VARCHAR(30) NOT NULL,
+        date DATE NOT NULL,
+        events INT NOT NULL DEFAULT 0,
+        registrations INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (dept, date)
+    )
+    """,
+    # The Analytics tab reads a date window across all departments
+    "CREATE INDEX idx_rollup_date ON EVENT_DAILY_ROLLUP (date)",
+    "DROP TRIGGER IF EXISTS rollup_event_insert",
+    """
+    CREATE TRIGGER rollup_event_insert
+    AFTER INSERT ON EVENTS
+    FOR EACH ROW
+    BEGIN
+        IF NEW.dept IS NOT NULL AND NEW.date IS NOT NULL THEN
+            INSERT INTO EVENT_DAILY_ROLLUP (dept, date, events, registrations)
+            VALUES (NEW.dept, NEW.date, 1, NEW.registration_count)
+            ON DUPLICATE KEY UPDATE events = events + 1, registrations = registrations + NEW.registration_count;
+        END IF;
+    END
+    """,
+    "DROP TRIGGER IF EXISTS rollup_event_update",
+    """
+    CREATE TRIGGER rollup_event_update
+    AFTER UPDATE ON EVENTS
+    FOR EACH ROW
+    BEGIN
+        IF OLD.dept <=> NEW.dept AND OLD.date <=> NEW.date THEN
+            -- A registration or cancellation: one row update
+            IF NOT OLD.registration_count <=> NEW.registration_count THEN
+                UPDATE EVENT_DAILY_ROLLUP
+                SET registrations = registrations + NEW.registration_count - OLD.registration_count
+                WHERE dept = NEW.dept AND date = NEW.date;
+            END IF;
+        ELSE
+            UPDATE EVENT_DAILY_ROLLUP
+            SET events = events - 1, registrations = registrations - OLD.registration_count
+            WHERE dept = OLD.dept AND date = OLD.date;
+            IF NEW.dept IS NOT NULL AND NEW.date IS NOT NULL THEN
+                INSERT INTO EVENT_DAILY_ROLLUP (dept, date, events, registrations)
+                VALUES (NEW.dept, NEW.date, 1, NEW.registration_count)
+                ON DUPLICATE KEY UPDATE events = events + 1, registrations = registrations + NEW.registration_count;
+            END IF;
+        END IF;
+    END
+    """,
+    "DROP TRIGGER IF EXISTS rollup_event_delete",
+    """
+    CREATE TRIGGER rollup_event_delete
+    AFTER DELETE ON EVENTS
+    FOR EACH ROW
+    BEGIN
+        -- archive.py deletes under @skip_host_triggers, so archived events stay in the totals
+        IF @skip_host_triggers IS NULL THEN
+            UPDATE EVENT_DAILY_ROLLUP
+            SET events = events - 1, registrations = registrations - OLD.registration_count
+            WHERE dept = OLD.dept AND date = OLD.date;
+        END IF;
+    END
+    """,
+    # Backfill from live and archived events; safe to re-run since it starts from empty
+    "DELETE FROM EVENT_DAILY_ROLLUP",
+    """
+    INSERT INTO EVENT_DAILY_ROLLUP (dept, date, events, registrations)
+    SELECT dept, date, COUNT(*), SUM(registration_count)
+    FROM (
+        SELECT dept, date, registration_count FROM EVENTS
+        UNION ALL
+        SELECT dept, date, registration_count FROM EVENTS_ARCHIVE
+    ) e
+    WHERE dept IS NOT NULL AND date IS NOT NULL
+    GROUP BY dept, date
+    """,
+]
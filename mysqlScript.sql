@@ -25,6 +25,7 @@ CREATE TABLE EVENTS (
         date DATE,
         time TIME,
         dept VARCHAR(30),
+        registration_count INT NOT NULL DEFAULT 0,
         FOREIGN KEY (dept) REFERENCES DEPARTMENT(dept)
     );
 
@@ -36,6 +37,48 @@ CREATE TABLE HOST (
         FOREIGN KEY (user_id) REFERENCES USERS(user_id)
     );
 
+-- Change feed: one row per changed event, read by changefeed.py (see migrations/0005_event_change_feed.py)
+CREATE TABLE EVENT_CHANGES (
+        version BIGINT AUTO_INCREMENT PRIMARY KEY,
+        event_id VARCHAR(10) NOT NULL
+    );
+
+-- Past events and their HOST rows, moved out of EVENTS and HOST by archive.py (see migrations/0007_event_archive.py)
+CREATE TABLE EVENTS_ARCHIVE (
+        event_id VARCHAR(10) PRIMARY KEY,
+        date DATE,
+        time TIME,
+        dept VARCHAR(30),
+        registration_count INT NOT NULL DEFAULT 0,
+        FOREIGN KEY (dept) REFERENCES DEPARTMENT(dept)
+    );
+
+CREATE TABLE HOST_ARCHIVE (
+        event_id VARCHAR(10),
+        user_id VARCHAR(100),
+        PRIMARY KEY (event_id, user_id),
+        FOREIGN KEY (event_id) REFERENCES EVENTS_ARCHIVE(event_id),
+        FOREIGN KEY (user_id) REFERENCES USERS(user_id)
+    );
+
+-- Analytics rollup: events and registrations per department and event date, kept current by triggers
+-- on EVENTS (see migrations/0008_event_rollups.py)
+CREATE TABLE EVENT_DAILY_ROLLUP (
+        dept VARCHAR(30) NOT NULL,
+        date DATE NOT NULL,
+        events INT NOT NULL DEFAULT 0,
+        registrations INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (dept, date)
+    );
+
+-- Secondary indexes (kept in step with migrations/0001_secondary_indexes.py, 0006_event_filter_index.py,
+-- 0007_event_archive.py and 0008_event_rollups.py)
+CREATE INDEX idx_host_user_event ON HOST (user_id, event_id);
+CREATE INDEX idx_events_date_time ON EVENTS (date, time);
+CREATE INDEX idx_events_dept_date ON EVENTS (dept, date, time);
+CREATE INDEX idx_host_archive_user_event ON HOST_ARCHIVE (user_id, event_id);
+CREATE INDEX idx_rollup_date ON EVENT_DAILY_ROLLUP (date);
+
 -- USERS
 INSERT INTO USERS VALUES
 ('U001', 'CSE', 2),
@@ -52,7 +95,7 @@ INSERT INTO DEPARTMENT VALUES
 ('ECE', 120, 30);
 
 -- EVENTS
-INSERT INTO EVENTS VALUES
+INSERT INTO EVENTS (event_id, date, time, dept) VALUES
 ('E101', '2025-06-01', '10:00:00', 'CSE'),
 ('E102', '2025-06-05', '11:00:00', 'CSE'),
 ('E103', '2025-06-10', '14:00:00', 'ECE');
@@ -63,6 +106,15 @@ INSERT INTO HOST VALUES
 ('E102', 'U001'),
 ('E103', 'U002');
 
+-- Registration counters for the seeded HOST rows (triggers below keep them current)
+UPDATE EVENTS e
+LEFT JOIN (SELECT event_id, COUNT(*) AS registrations FROM HOST GROUP BY event_id) h ON h.event_id = e.event_id
+SET e.registration_count = COALESCE(h.registrations, 0);
+
+-- Analytics rollup for the seeded events (triggers below keep it current)
+INSERT INTO EVENT_DAILY_ROLLUP (dept, date, events, registrations)
+SELECT dept, date, COUNT(*), SUM(registration_count) FROM EVENTS GROUP BY dept, date;
+
 -- Views
 CREATE VIEW DepartmentEvents AS
     SELECT 
@@ -112,9 +164,122 @@ DELIMITER $$
     AFTER INSERT ON HOST
     FOR EACH ROW
     BEGIN
-        UPDATE USERS
-        SET no_of_events = no_of_events + 1
-        WHERE user_id = NEW.user_id;
+        -- Bulk enrollment sets @skip_host_triggers and applies the counts per batch
+        IF @skip_host_triggers IS NULL THEN
+            UPDATE USERS
+            SET no_of_events = no_of_events + 1
+            WHERE user_id = NEW.user_id;
+        END IF;
+    END$$
+
+    DELIMITER ;
+
+ DELIMITER $$
+
+    CREATE TRIGGER increment_registration_count
+    AFTER INSERT ON HOST
+    FOR EACH ROW
+    BEGIN
+        IF @skip_host_triggers IS NULL THEN
+            UPDATE EVENTS
+            SET registration_count = registration_count + 1
+            WHERE event_id = NEW.event_id;
+        END IF;
+    END$$
+
+    DELIMITER ;
+
+ DELIMITER $$
+
+    CREATE TRIGGER decrement_registration_count
+    AFTER DELETE ON HOST
+    FOR EACH ROW
+    BEGIN
+        -- archive.py sets @skip_host_triggers while it moves past events' rows away
+        IF @skip_host_triggers IS NULL THEN
+            UPDATE EVENTS
+            SET registration_count = registration_count - 1
+            WHERE event_id = OLD.event_id;
+        END IF;
+    END$$
+
+    DELIMITER ;
+
+-- Every HOST change also moves EVENTS.registration_count, so these three see every listing change
+ DELIMITER $$
+
+    CREATE TRIGGER log_event_insert
+    AFTER INSERT ON EVENTS
+    FOR EACH ROW
+    BEGIN
+        INSERT INTO EVENT_CHANGES (event_id) VALUES (NEW.event_id);
+    END$$
+
+    CREATE TRIGGER log_event_update
+    AFTER UPDATE ON EVENTS
+    FOR EACH ROW
+    BEGIN
+        IF NOT (OLD.date <=> NEW.date AND OLD.time <=> NEW.time AND OLD.dept <=> NEW.dept
+                AND OLD.registration_count <=> NEW.registration_count) THEN
+            INSERT INTO EVENT_CHANGES (event_id) VALUES (NEW.event_id);
+        END IF;
+    END$$
+
+    CREATE TRIGGER log_event_delete
+    AFTER DELETE ON EVENTS
+    FOR EACH ROW
+    BEGIN
+        INSERT INTO EVENT_CHANGES (event_id) VALUES (OLD.event_id);
+    END$$
+
+    DELIMITER ;
+
+-- Registrations reach the rollup through EVENTS.registration_count like they reach the change feed
+ DELIMITER $$
+
+    CREATE TRIGGER rollup_event_insert
+    AFTER INSERT ON EVENTS
+    FOR EACH ROW
+    BEGIN
+        IF NEW.dept IS NOT NULL AND NEW.date IS NOT NULL THEN
+            INSERT INTO EVENT_DAILY_ROLLUP (dept, date, events, registrations)
+            VALUES (NEW.dept, NEW.date, 1, NEW.registration_count)
+            ON DUPLICATE KEY UPDATE events = events + 1, registrations = registrations + NEW.registration_count;
+        END IF;
+    END$$
+
+    CREATE TRIGGER rollup_event_update
+    AFTER UPDATE ON EVENTS
+    FOR EACH ROW
+    BEGIN
+        IF OLD.dept <=> NEW.dept AND OLD.date <=> NEW.date THEN
+            IF NOT OLD.registration_count <=> NEW.registration_count THEN
+                UPDATE EVENT_DAILY_ROLLUP
+                SET registrations = registrations + NEW.registration_count - OLD.registration_count
+                WHERE dept = NEW.dept AND date = NEW.date;
+            END IF;
+        ELSE
+            UPDATE EVENT_DAILY_ROLLUP
+            SET events = events - 1, registrations = registrations - OLD.registration_count
+            WHERE dept = OLD.dept AND date = OLD.date;
+            IF NEW.dept IS NOT NULL AND NEW.date IS NOT NULL THEN
+                INSERT INTO EVENT_DAILY_ROLLUP (dept, date, events, registrations)
+                VALUES (NEW.dept, NEW.date, 1, NEW.registration_count)
+                ON DUPLICATE KEY UPDATE events = events + 1, registrations = registrations + NEW.registration_count;
+            END IF;
+        END IF;
+    END$$
+
+    CREATE TRIGGER rollup_event_delete
+    AFTER DELETE ON EVENTS
+    FOR EACH ROW
+    BEGIN
+        -- archive.py deletes under @skip_host_triggers, so archived events stay in the totals
+        IF @skip_host_triggers IS NULL THEN
+            UPDATE EVENT_DAILY_ROLLUP
+            SET events = events - 1, registrations = registrations - OLD.registration_count
+            WHERE dept = OLD.dept AND date = OLD.date;
+        END IF;
     END$$
 
     DELIMITER ;
@@ -154,4 +319,56 @@ DELIMITER $$
         END IF;
     END$$
 
-    DELIMITER ;
\ No newline at end of file
+    DELIMITER ;
+
+DELIMITER $$
+
+    CREATE PROCEDURE registerForEvent(IN e_id VARCHAR(10), IN u_id VARCHAR(100))
+    BEGIN
+        -- Status codes: 0 registered, 1 no such event, 2 event passed,
+        -- 3 already registered, 4 event full, 5 no such user
+        DECLARE e_date DATE;
+        DECLARE e_dept VARCHAR(30);
+        DECLARE e_count INT;
+        DECLARE e_capacity INT;
+        DECLARE result_status INT DEFAULT 0;
+        DECLARE CONTINUE HANDLER FOR NOT FOUND SET e_date = NULL;
+        DECLARE EXIT HANDLER FOR SQLEXCEPTION
+        BEGIN
+            ROLLBACK;
+            RESIGNAL;
+        END;
+
+        START TRANSACTION;
+
+        -- Locking the event row queues concurrent sign-ups for the same event
+        SELECT date, dept, registration_count INTO e_date, e_dept, e_count
+        FROM EVENTS
+        WHERE event_id = e_id
+        FOR UPDATE;
+
+        IF e_date IS NULL THEN
+            SET result_status = 1;
+        ELSEIF e_date < CURDATE() THEN
+            SET result_status = 2;
+        ELSEIF NOT EXISTS (SELECT 1 FROM USERS WHERE user_id = u_id) THEN
+            SET result_status = 5;
+        ELSEIF EXISTS (SELECT 1 FROM HOST WHERE event_id = e_id AND user_id = u_id) THEN
+            SET result_status = 3;
+        ELSE
+            SELECT default_max_capacity INTO e_capacity
+            FROM DEPARTMENT
+            WHERE dept = e_dept;
+
+            IF e_count >= e_capacity THEN
+                SET result_status = 4;
+            ELSE
+                INSERT INTO HOST (event_id, user_id) VALUES (e_id, u_id);
+            END IF;
+        END IF;
+
+        COMMIT;
+        SELECT result_status AS status;
+    END$$
+
+    DELIMITER ;
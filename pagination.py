@@ -0,0 +1,128 @@
+import os
+from datetime import timedelta
+import gradio as gr
+import pandas as pd
+import statements
+from changefeed import changes_since, current_version, read_changed_rows
+
+PAGE_SIZE = int(os.environ.get("PAGE_SIZE", "50"))
+PAGE_SIZE_CHOICES = [25, 50, 100, 250]
+
+EVENT_KEY = ["date", "time", "event_id"]
+USER_KEY = ["user_id"]
+
+# Keys that sort before every real row, used to read the first page
+EVENT_KEY_START = {"date": "1000-01-01", "time": "00:00:00", "event_id": ""}
+USER_KEY_START = {"user_id": ""}
+
+
+def key_value(value):
+    # MySQL TIME columns arrive as timedeltas; keys must compare like the column does
+    if isinstance(value, (timedelta, pd.Timedelta)):
+        seconds = int(value.total_seconds())
+        return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return str(value)
+
+
+def row_key(row, key_columns):
+    return {column: key_value(row[column]) for column in key_columns}
+
+
+def read_page(conn, after_statement, before_statement, params, key_columns, start_key, page_size=PAGE_SIZE, after=None, before=None, track_changes=False):
+    # One extra row tells us whether another page exists without a COUNT(*)
+    page_size = int(page_size)
+    # Read before the rows, so a change landing in between is merged again by the next poll
+    version = current_version(conn) if track_changes else None
+    if before:
+        df = statements.read_frame(conn, before_statement, {**params, **before, "limit": page_size + 1})
+        has_previous = len(df) > page_size
+        df = df.iloc[:page_size].iloc[::-1].reset_index(drop=True)
+        has_next = True
+    else:
+        df = statements.read_frame(conn, after_statement, {**params, **(after or start_key), "limit": page_size + 1})
+        has_next = len(df) > page_size
+        df = df.iloc[:page_size]
+        has_previous = bool(after)
+
+    # A tracked listing keeps its page while empty, so events that start matching are merged in
+    if df.empty and not track_changes:
+        return df, None
+    page = {
+        "first": row_key(df.iloc[0], key_columns) if len(df) else None,
+        "last": row_key(df.iloc[-1], key_columns) if len(df) else None,
+        "has_previous": has_previous,
+        "has_next": has_next,
+    }
+    if track_changes:
+        # Raw rows (handlers format df in place) plus the change feed cursor for poll_page
+        page.update(rows=df.copy(), version=version, seen=None)
+    return df, page
+
+
+def page_key(row, key_columns):
+    return tuple(row_key(row, key_columns).values())
+
+
+def merge_rows(page, rows, event_ids, key_columns, page_size):
+    # Swaps the changed events' new rows into the page. Rows are only added inside the page's
+    # key range, so neighbouring pages neither lose nor repeat rows. Returns (page, changed).
+    current = page["rows"]
+    lower = tuple(page["first"].values()) if page["has_previous"] and page["first"] else None
+    upper = tuple(page["last"].values()) if page["has_next"] and page["last"] else None
+    keys = [page_key(row, key_columns) for _, row in rows.iterrows()]
+    inside = [(lower is None or key >= lower) and (upper is None or key <= upper) for key in keys]
+    parts = [frame for frame in (current[~current["event_id"].isin(event_ids)], rows[inside]) if not frame.empty]
+    merged = pd.concat(parts, ignore_index=True) if parts else current.iloc[0:0]
+    merged = merged.sort_values(key_columns, ignore_index=True)
+
+    has_next = page["has_next"]
+    if len(merged) > int(page_size):
+        merged = merged.iloc[:int(page_size)]
+        has_next = True
+    if merged.equals(current):
+        return page, False
+    if merged.empty:
+        return {**page, "rows": merged}, True
+    return {
+        **page,
+        "first": row_key(merged.iloc[0], key_columns),
+        "last": row_key(merged.iloc[-1], key_columns),
+        "has_next": has_next,
+        "rows": merged,
+    }, True
+
+
+def poll_page(conn, page, changes_sql, params, key_columns, page_size):
+    # Returns (page, changed); page is None when it has to be read again in full.
+    # The cursor trails one poll behind the newest version seen: versions are handed out at
+    # insert time, so a transaction can commit after one with a higher version.
+    latest, event_ids = changes_since(conn, page["version"])
+    cursor = page["seen"] if page["seen"] is not None else page["version"]
+    page = {**page, "version": min(cursor, latest), "seen": latest}
+    if event_ids is None:
+        return None, True
+    if not event_ids:
+        return page, False
+    rows = read_changed_rows(conn, changes_sql, params, event_ids)
+    return merge_rows(page, rows, event_ids, key_columns, page_size)
+
+
+def reload_page(fetch, page_size, page, *args):
+    # Reads the page again from its first row: the key with an empty last column sorts just before it
+    if not page or not page["has_previous"] or not page["first"]:
+        return fetch(*args, page_size=page_size)
+    first = dict(page["first"])
+    first[list(first)[-1]] = ""
+    return fetch(*args, page_size=page_size, after=first)
+
+
+def next_page(fetch, page_size, page, *args):
+    if not page or not page["has_next"]:
+        return gr.update(), page
+    return fetch(*args, page_size=page_size, after=page["last"])
+
+
+def previous_page(fetch, page_size, page, *args):
+    if not page or not page["has_previous"]:
+        return gr.update(), page
+    return fetch(*args, page_size=page_size, before=page["first"])
@@ -0,0 +1,382 @@
+USER_INFO = """
+    SELECT u.user_id, u.dept, u.no_of_events, l.account_type
+    FROM USERS u
+    JOIN LOGIN l ON u.user_id = l.user_id
+    WHERE u.user_id = %s
+"""
+
+# Everything a dashboard needs before it renders, in one round trip: the user's profile and role
+# repeated on one row per department. The user columns are NULL for an unknown user.
+BOOTSTRAP = """
+    SELECT
+        u.user_id, u.dept, u.no_of_events, l.account_type,
+        d.dept AS department, d.default_fees, d.default_max_capacity
+    FROM (SELECT %s AS requested_user) r
+    LEFT JOIN USERS u ON u.user_id = r.requested_user
+    LEFT JOIN LOGIN l ON l.user_id = u.user_id
+    LEFT JOIN DEPARTMENT d ON TRUE
+    ORDER BY d.dept
+"""
+
+VALID_LOGIN = """
+    SELECT user_id, account_type
+    FROM LOGIN
+    WHERE user_id = %s AND password = %s
+"""
+
+INSERT_LOGIN = """
+    INSERT INTO LOGIN (user_id, password, account_type)
+    VALUES (%s, %s, %s)
+"""
+
+# Department fees and capacities are served from cache.get_department_defaults()
+# instead of being joined into every event query
+DEPARTMENT_DEFAULTS = "SELECT dept, default_fees, default_max_capacity FROM DEPARTMENT ORDER BY dept"
+
+USER_DEPARTMENT = "SELECT dept FROM USERS WHERE user_id = %s"
+
+# Keyset pagination: each listing has an _AFTER statement that reads forward from a key and a
+# _BEFORE statement that reads backwards from one. Keys are compared with expanded OR predicates
+# because MySQL does not range-optimise row constructor comparisons such as (a, b) > (x, y).
+_EVENT_KEY_AFTER = "(e.date > %(date)s OR (e.date = %(date)s AND (e.time > %(time)s OR (e.time = %(time)s AND e.event_id > %(event_id)s))))"
+_EVENT_KEY_BEFORE = "(e.date < %(date)s OR (e.date = %(date)s AND (e.time < %(time)s OR (e.time = %(time)s AND e.event_id < %(event_id)s))))"
+
+_UPCOMING_EVENTS = """
+    SELECT
+        e.event_id,
+        e.date,
+        e.time,
+        e.dept,
+        e.registration_count AS host_count,
+        CASE WHEN h.user_id IS NULL THEN 'No' ELSE 'Yes' END AS registered
+    FROM EVENTS e{joins}
+    LEFT JOIN HOST h ON h.event_id = e.event_id AND h.user_id = %(user_id)s
+    WHERE e.date >= CURDATE(){filters}
+"""
+
+# Optional filters for the events listing. Only the filters in use are ANDed on, so every
+# combination is its own statement and gets a plan for the index that fits it:
+# idx_events_dept_date for a department, idx_events_date_time for dates, the primary key
+# for an event ID prefix. Fee and seat filters are checked against the DEPARTMENT row.
+EVENT_FILTERS = {
+    "dept": "e.dept = %(dept)s",
+    "date_from": "e.date >= %(date_from)s",
+    "date_to": "e.date <= %(date_to)s",
+    "fee_min": "d.default_fees >= %(fee_min)s",
+    "fee_max": "d.default_fees <= %(fee_max)s",
+    "min_seats": "d.default_max_capacity - e.registration_count >= %(min_seats)s",
+    "event_prefix": "e.event_id LIKE %(event_prefix)s ESCAPE '!'",
+}
+_DEPARTMENT_FILTERS = {"fee_min", "fee_max", "min_seats"}
+
+
+def upcoming_events(filters=()):
+    joins = "\n    JOIN DEPARTMENT d ON d.dept = e.dept" if _DEPARTMENT_FILTERS.intersection(filters) else ""
+    clauses = "".join(f"\n    AND {sql}" for name, sql in EVENT_FILTERS.items() if name in filters)
+    return _UPCOMING_EVENTS.format(joins=joins, filters=clauses)
+
+
+def upcoming_events_after(filters=()):
+    return upcoming_events(filters) + f"""    AND {_EVENT_KEY_AFTER}
+    ORDER BY e.date, e.time, e.event_id
+    LIMIT %(limit)s
+"""
+
+
+def upcoming_events_before(filters=()):
+    return upcoming_events(filters) + f"""    AND {_EVENT_KEY_BEFORE}
+    ORDER BY e.date DESC, e.time DESC, e.event_id DESC
+    LIMIT %(limit)s
+"""
+
+
+def upcoming_event_changes(filters=()):
+    # {placeholders} is filled with one %(event_N)s per changed event (see changefeed.read_changed_rows)
+    return upcoming_events(filters) + "    AND e.event_id IN ({placeholders})\n"
+
+
+UPCOMING_EVENTS_AFTER = upcoming_events_after()
+UPCOMING_EVENTS_BEFORE = upcoming_events_before()
+UPCOMING_EVENT_CHANGES = upcoming_event_changes()
+
+# Change feed: the dashboards re-read only the events logged in EVENT_CHANGES since the version
+# they hold (the events listing's UPCOMING_EVENT_CHANGES is built with its other statements above).
+# {placeholders} is filled with one %s per changed event. The bounds are two subqueries so each
+# is one index lookup; SQLite scans the whole table for MIN and MAX in the same SELECT.
+CHANGE_FEED_BOUNDS = "SELECT (SELECT MIN(version) FROM EVENT_CHANGES), (SELECT MAX(version) FROM EVENT_CHANGES)"
+
+CHANGES_SINCE = """
+    SELECT version, event_id
+    FROM EVENT_CHANGES
+    WHERE version > %s
+    ORDER BY version
+    LIMIT %s
+"""
+
+_HOSTED_EVENTS = """
+    SELECT
+        e.event_id,
+        e.date,
+        e.time,
+        e.dept,
+        e.registration_count
+    FROM EVENTS e
+    JOIN HOST h ON e.event_id = h.event_id
+    WHERE h.user_id = %(user_id)s
+"""
+
+HOSTED_EVENTS_AFTER = _HOSTED_EVENTS + f"""    AND {_EVENT_KEY_AFTER}
+    ORDER BY e.date, e.time, e.event_id
+    LIMIT %(limit)s
+"""
+
+HOSTED_EVENTS_BEFORE = _HOSTED_EVENTS + f"""    AND {_EVENT_KEY_BEFORE}
+    ORDER BY e.date DESC, e.time DESC, e.event_id DESC
+    LIMIT %(limit)s
+"""
+
+HOSTED_EVENT_CHANGES = """
+    SELECT
+        e.event_id,
+        e.date,
+        e.time,
+        e.dept,
+        e.registration_count
+    FROM EVENTS e
+    JOIN HOST h ON e.event_id = h.event_id
+    WHERE h.user_id = %s AND e.event_id IN ({placeholders})
+"""
+
+DELETE_CHANGES_BEFORE = "DELETE FROM EVENT_CHANGES WHERE version < %s"
+
+USER_EVENTS = """
+    SELECT
+        h.event_id,
+        e.date,
+        e.time,
+        e.dept
+    FROM HOST h
+    JOIN EVENTS e ON h.event_id = e.event_id
+    WHERE h.user_id = %s
+    ORDER BY e.date, e.time
+"""
+
+# A user's registrations including those archived with their events (attendee "Include archived")
+USER_EVENT_HISTORY = """
+    SELECT
+        h.event_id,
+        e.date,
+        e.time,
+        e.dept
+    FROM HOST h
+    JOIN EVENTS e ON h.event_id = e.event_id
+    WHERE h.user_id = %s
+    UNION ALL
+    SELECT
+        h.event_id,
+        e.date,
+        e.time,
+        e.dept
+    FROM HOST_ARCHIVE h
+    JOIN EVENTS_ARCHIVE e ON h.event_id = e.event_id
+    WHERE h.user_id = %s
+    ORDER BY date, time
+"""
+
+EVENT_DETAILS = """
+    SELECT
+        e.event_id,
+        e.date,
+        e.time,
+        e.dept,
+        e.registration_count
+    FROM EVENTS e
+    WHERE e.event_id = %s
+"""
+
+ARCHIVED_EVENT_DETAILS = """
+    SELECT
+        e.event_id,
+        e.date,
+        e.time,
+        e.dept,
+        e.registration_count
+    FROM EVENTS_ARCHIVE e
+    WHERE e.event_id = %s
+"""
+
+ARCHIVED_IS_REGISTERED = """
+    SELECT COUNT(*) AS registrations FROM HOST_ARCHIVE
+    WHERE event_id = %s AND user_id = %s
+"""
+
+# Archived IDs stay taken, so an archived event can never collide with a new one
+EVENT_EXISTS = """
+    SELECT
+        (SELECT COUNT(*) FROM EVENTS WHERE event_id = %s)
+        + (SELECT COUNT(*) FROM EVENTS_ARCHIVE WHERE event_id = %s)
+"""
+
+# {placeholders} is filled with one %s per ID in the batch
+EXISTING_EVENT_IDS = "SELECT event_id FROM EVENTS WHERE event_id IN ({placeholders})"
+EXISTING_ARCHIVED_EVENT_IDS = "SELECT event_id FROM EVENTS_ARCHIVE WHERE event_id IN ({placeholders})"
+
+EVENT_REGISTRATIONS_AFTER = """
+    SELECT
+        h.user_id,
+        u.dept AS user_dept
+    FROM HOST h
+    JOIN USERS u ON h.user_id = u.user_id
+    WHERE h.event_id = %(event_id)s AND h.user_id > %(user_id)s
+    ORDER BY h.user_id
+    LIMIT %(limit)s
+"""
+
+EVENT_REGISTRATIONS_BEFORE = """
+    SELECT
+        h.user_id,
+        u.dept AS user_dept
+    FROM HOST h
+    JOIN USERS u ON h.user_id = u.user_id
+    WHERE h.event_id = %(event_id)s AND h.user_id < %(user_id)s
+    ORDER BY h.user_id DESC
+    LIMIT %(limit)s
+"""
+
+# The whole roster in one ordered pass over HOST's primary key, streamed by export.py
+EVENT_ROSTER = """
+    SELECT
+        h.user_id,
+        u.dept AS user_dept
+    FROM HOST h
+    JOIN USERS u ON h.user_id = u.user_id
+    WHERE h.event_id = %s
+    ORDER BY h.user_id
+"""
+
+# Analytics tab: department and daily totals come from EVENT_DAILY_ROLLUP, so their cost depends
+# on the number of departments and days in the window, not on the number of registrations
+ANALYTICS_DEPARTMENTS = """
+    SELECT
+        r.dept,
+        SUM(r.events) AS events,
+        SUM(r.registrations) AS registrations
+    FROM EVENT_DAILY_ROLLUP r
+    WHERE r.date BETWEEN %s AND %s
+    GROUP BY r.dept
+    ORDER BY registrations DESC
+"""
+
+ANALYTICS_DAILY = """
+    SELECT
+        r.date,
+        SUM(r.events) AS events,
+        SUM(r.registrations) AS registrations
+    FROM EVENT_DAILY_ROLLUP r
+    WHERE r.date BETWEEN %s AND %s
+    GROUP BY r.date
+    ORDER BY r.date
+"""
+
+# Fill rate per hosted event reads the registration_count counters, never the HOST rows of attendees
+ANALYTICS_EVENT_FILL = """
+    SELECT
+        e.event_id,
+        e.date,
+        e.time,
+        e.dept,
+        e.registration_count
+    FROM HOST h
+    JOIN EVENTS e ON e.event_id = h.event_id
+    WHERE h.user_id = %s AND e.date BETWEEN %s AND %s
+    ORDER BY e.date, e.time, e.event_id
+"""
+
+# HOST holds both the event's host and its attendees, keyed by (event_id, user_id)
+IS_REGISTERED = """
+    SELECT COUNT(*) AS registrations FROM HOST
+    WHERE event_id = %s AND user_id = %s
+"""
+
+# Bulk enrollment: lock the event row so concurrent sign-ups queue behind the batch
+ENROLLMENT_EVENT = """
+    SELECT e.date, e.registration_count, d.default_max_capacity
+    FROM EVENTS e
+    JOIN DEPARTMENT d ON e.dept = d.dept
+    WHERE e.event_id = %s
+    FOR UPDATE
+"""
+
+EXISTING_USER_IDS = "SELECT user_id FROM USERS WHERE user_id IN ({placeholders})"
+
+REGISTERED_USER_IDS = """
+    SELECT user_id FROM HOST
+    WHERE event_id = %s AND user_id IN ({placeholders})
+"""
+
+# While @skip_host_triggers is set the HOST insert triggers do nothing and the
+# counters below are applied once per batch instead of once per row
+SKIP_HOST_TRIGGERS = "SET @skip_host_triggers = 1"
+RESTORE_HOST_TRIGGERS = "SET @skip_host_triggers = NULL"
+
+INCREMENT_USER_EVENT_COUNTS = """
+    UPDATE USERS
+    SET no_of_events = no_of_events + 1
+    WHERE user_id IN ({placeholders})
+"""
+
+ADD_REGISTRATION_COUNT = """
+    UPDATE EVENTS
+    SET registration_count = registration_count + %s
+    WHERE event_id = %s
+"""
+
+REGISTRATION_DATE = """
+    SELECT h.event_id, e.date
+    FROM HOST h
+    JOIN EVENTS e ON h.event_id = e.event_id
+    WHERE h.event_id = %s AND h.user_id = %s
+"""
+
+INSERT_EVENT = """
+    INSERT INTO EVENTS (event_id, date, time, dept)
+    VALUES (%s, %s, %s, %s)
+"""
+
+# Returns one row holding the attendee.REGISTERED / EVENT_* status code
+REGISTER_FOR_EVENT = "CALL registerForEvent(%s, %s)"
+
+INSERT_REGISTRATION = """
+    INSERT INTO HOST (event_id, user_id)
+    VALUES (%s, %s)
+"""
+
+DELETE_REGISTRATION = """
+    DELETE FROM HOST
+    WHERE event_id = %s AND user_id = %s
+"""
+
+# Archival (archive.py): each batch of past events is copied with its HOST rows, then
+# deleted from the live tables. {placeholders} is filled with one %s per event in the batch.
+ARCHIVABLE_EVENT_IDS = """
+    SELECT event_id FROM EVENTS
+    WHERE date < %s
+    ORDER BY date, time
+    LIMIT %s
+"""
+
+ARCHIVE_EVENTS = """
+    INSERT INTO EVENTS_ARCHIVE (event_id, date, time, dept, registration_count)
+    SELECT event_id, date, time, dept, registration_count FROM EVENTS
+    WHERE event_id IN ({placeholders})
+"""
+
+ARCHIVE_REGISTRATIONS = """
+    INSERT INTO HOST_ARCHIVE (event_id, user_id)
+    SELECT event_id, user_id FROM HOST
+    WHERE event_id IN ({placeholders})
+"""
+
+DELETE_ARCHIVED_REGISTRATIONS = "DELETE FROM HOST WHERE event_id IN ({placeholders})"
+
+DELETE_ARCHIVED_EVENTS = "DELETE FROM EVENTS WHERE event_id IN ({placeholders})"
@@ -0,0 +1,51 @@
+import os
+import gradio as gr
+import uvicorn
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse, RedirectResponse
+import attendee
+import host
+import login
+from db import CircuitBreaker, get_circuit_state
+from metrics import registry
+
+# One process serves all three dashboards, so they share the connection pool, the
+# reference cache and the DB executors instead of each loading its own copy
+SERVER_HOST = os.environ.get("SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.environ.get("SERVER_PORT", "6000"))
+
+LOGIN_PATH = "/login"
+HOST_PATH = "/host"
+ATTENDEE_PATH = "/attendee"
+
+
+def create_server():
+    server = FastAPI(title="Event Management")
+
+    @server.get("/")
+    def index():
+        return RedirectResponse(LOGIN_PATH)
+
+    @server.get("/metrics")
+    def metrics():
+        return Response(registry.render(), media_type="text/plain; version=0.0.4")
+
+    @server.get("/health")
+    def health():
+        # 503 while the database circuit breaker is failing requests fast
+        circuit = get_circuit_state()
+        status = 503 if circuit["state"] == CircuitBreaker.OPEN else 200
+        return JSONResponse({"database": circuit}, status_code=status)
+
+    apps = {
+        LOGIN_PATH: login.create_app(host_url=HOST_PATH, attendee_url=ATTENDEE_PATH),
+        HOST_PATH: host.create_app(),
+        ATTENDEE_PATH: attendee.create_app(),
+    }
+    for path, app in apps.items():
+        server = gr.mount_gradio_app(server, app, path=path)
+    return server
+
+
+if __name__ == "__main__":
+    uvicorn.run(create_server(), host=SERVER_HOST, port=SERVER_PORT)
@@ -0,0 +1,63 @@
+import base64
+import functools
+import hashlib
+import hmac
+import os
+import secrets
+import time
+
+SESSION_COOKIE = "em_session"
+SESSION_TTL = int(os.environ.get("SESSION_TTL_SECONDS", str(8 * 60 * 60)))
+# Tokens are signed, not stored, so any process holding the secret can check them. server.py
+# serves every app from one process; standalone apps on separate ports need SESSION_SECRET set.
+SESSION_SECRET = os.environ.get("SESSION_SECRET", "").encode() or secrets.token_bytes(32)
+
+HOST_ACCOUNT_TYPES = ("host", "admin")
+NOT_SIGNED_IN = "Please log in first"
+
+
+def _sign(payload):
+    return hmac.new(SESSION_SECRET, payload, hashlib.sha256).hexdigest()
+
+
+def issue_token(user_id):
+    payload = f"{user_id}:{int(time.time()) + SESSION_TTL}".encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=") + "." + _sign(payload)
+
+
+def read_token(token):
+    # Returns the user_id the token was issued for, or None if it is forged, malformed or expired
+    try:
+        encoded, signature = token.split(".")
+        payload = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+        user_id, expires = payload.decode().rsplit(":", 1)
+        expires = int(expires)
+    except (AttributeError, ValueError):
+        return None
+    if not hmac.compare_digest(signature, _sign(payload)) or expires < time.time():
+        return None
+    return user_id
+
+
+def session_user(request):
+    if request is None:
+        return None
+    return read_token(request.cookies.get(SESSION_COOKIE))
+
+
+def signed_in(denied, allowed=None):
+    # Handlers get the session's user as their first argument, from the gr.State each dashboard
+    # fills on load. Without one, or when allowed(user_id) turns the user away, they return
+    # denied(message) in place of their usual output.
+    def decorator(fn):
+        @functools.wraps(fn)
+        def handler(user_id, *args, **kwargs):
+            if not user_id:
+                return denied(NOT_SIGNED_IN)
+            if allowed is not None:
+                ok, message = allowed(user_id)
+                if not ok:
+                    return denied(message)
+            return fn(user_id, *args, **kwargs)
+        return handler
+    return decorator
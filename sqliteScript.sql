@@ -0,0 +1,262 @@
+-- SQLite version of mysqlScript.sql, applied by sqlite_backend.py when the database file is new.
+-- Column types keep the MySQL names so sqlite3 converts DATE and TIME columns the way mysql-connector does.
+
+CREATE TABLE IF NOT EXISTS USERS (
+        user_id VARCHAR(100) PRIMARY KEY,
+        dept VARCHAR(30),
+        no_of_events INT
+    );
+
+CREATE TABLE IF NOT EXISTS LOGIN (
+        user_id VARCHAR(100) PRIMARY KEY,
+        password VARCHAR(50),
+        account_type VARCHAR(10),
+        FOREIGN KEY (user_id) REFERENCES USERS(user_id)
+    );
+
+CREATE TABLE IF NOT EXISTS DEPARTMENT (
+        dept VARCHAR(30) PRIMARY KEY,
+        default_fees INT,
+        default_max_capacity INT
+    );
+
+CREATE TABLE IF NOT EXISTS EVENTS (
+        event_id VARCHAR(10) PRIMARY KEY,
+        date DATE,
+        time TIME,
+        dept VARCHAR(30),
+        registration_count INT NOT NULL DEFAULT 0,
+        FOREIGN KEY (dept) REFERENCES DEPARTMENT(dept)
+    );
+
+CREATE TABLE IF NOT EXISTS HOST (
+        event_id VARCHAR(10),
+        user_id VARCHAR(100),
+        PRIMARY KEY (event_id, user_id),
+        FOREIGN KEY (event_id) REFERENCES EVENTS(event_id),
+        FOREIGN KEY (user_id) REFERENCES USERS(user_id)
+    );
+
+-- Stands in for MySQL's @skip_host_triggers session variable. Bulk loads insert the row and
+-- delete it again inside their own write transaction, so no other connection ever sees it.
+CREATE TABLE IF NOT EXISTS HOST_TRIGGER_SWITCH (
+        skip INT PRIMARY KEY
+    );
+
+-- Change feed read by changefeed.py. AUTOINCREMENT keeps versions from being reused after
+-- maintenance.py prune-changes deletes old rows.
+CREATE TABLE IF NOT EXISTS EVENT_CHANGES (
+        version INTEGER PRIMARY KEY AUTOINCREMENT,
+        event_id VARCHAR(10) NOT NULL
+    );
+
+-- Past events and their HOST rows, moved out of EVENTS and HOST by archive.py
+CREATE TABLE IF NOT EXISTS EVENTS_ARCHIVE (
+        event_id VARCHAR(10) PRIMARY KEY,
+        date DATE,
+        time TIME,
+        dept VARCHAR(30),
+        registration_count INT NOT NULL DEFAULT 0,
+        FOREIGN KEY (dept) REFERENCES DEPARTMENT(dept)
+    );
+
+CREATE TABLE IF NOT EXISTS HOST_ARCHIVE (
+        event_id VARCHAR(10),
+        user_id VARCHAR(100),
+        PRIMARY KEY (event_id, user_id),
+        FOREIGN KEY (event_id) REFERENCES EVENTS_ARCHIVE(event_id),
+        FOREIGN KEY (user_id) REFERENCES USERS(user_id)
+    );
+
+-- Analytics rollup: events and registrations per department and event date, kept current by triggers
+-- on EVENTS. Files created before it existed need `python maintenance.py rebuild-analytics` once.
+CREATE TABLE IF NOT EXISTS EVENT_DAILY_ROLLUP (
+        dept VARCHAR(30) NOT NULL,
+        date DATE NOT NULL,
+        events INT NOT NULL DEFAULT 0,
+        registrations INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (dept, date)
+    );
+
+-- Secondary indexes
+CREATE INDEX IF NOT EXISTS idx_host_user_event ON HOST (user_id, event_id);
+CREATE INDEX IF NOT EXISTS idx_events_date_time ON EVENTS (date, time);
+CREATE INDEX IF NOT EXISTS idx_events_dept_date ON EVENTS (dept, date, time);
+CREATE INDEX IF NOT EXISTS idx_host_archive_user_event ON HOST_ARCHIVE (user_id, event_id);
+CREATE INDEX IF NOT EXISTS idx_rollup_date ON EVENT_DAILY_ROLLUP (date);
+
+-- USERS
+INSERT OR IGNORE INTO USERS VALUES
+('U001', 'CSE', 2),
+('U002', 'ECE', 1);
+
+-- LOGIN
+INSERT OR IGNORE INTO LOGIN VALUES
+('U001', 'pass123', 'student'),
+('U002', 'secure456', 'admin');
+
+-- DEPARTMENT
+INSERT OR IGNORE INTO DEPARTMENT VALUES
+('CSE', 100, 50),
+('ECE', 120, 30);
+
+-- EVENTS
+INSERT OR IGNORE INTO EVENTS (event_id, date, time, dept) VALUES
+('E101', '2025-06-01', '10:00:00', 'CSE'),
+('E102', '2025-06-05', '11:00:00', 'CSE'),
+('E103', '2025-06-10', '14:00:00', 'ECE');
+
+-- HOST
+INSERT OR IGNORE INTO HOST VALUES
+('E101', 'U001'),
+('E102', 'U001'),
+('E103', 'U002');
+
+-- Registration counters for the seeded HOST rows (triggers below keep them current)
+UPDATE EVENTS
+SET registration_count = (SELECT COUNT(*) FROM HOST WHERE HOST.event_id = EVENTS.event_id);
+
+-- Analytics rollup for the seeded events (triggers below keep it current)
+INSERT INTO EVENT_DAILY_ROLLUP (dept, date, events, registrations)
+SELECT dept, date, COUNT(*), SUM(registration_count) FROM EVENTS GROUP BY dept, date;
+
+-- Views
+CREATE VIEW IF NOT EXISTS DepartmentEvents AS
+    SELECT
+        e.event_id,
+        e.dept,
+        e.date,
+        e.time,
+        d.default_fees,
+        d.default_max_capacity
+    FROM EVENTS e
+    JOIN DEPARTMENT d ON e.dept = d.dept;
+
+CREATE VIEW IF NOT EXISTS UserEventDetails AS
+    SELECT
+        u.user_id,
+        u.dept AS user_dept,
+        e.event_id,
+        e.date,
+        e.time,
+        e.dept AS event_dept,
+        d.default_fees AS event_fees,
+        d.default_max_capacity AS max_capacity
+    FROM USERS u
+    JOIN HOST h ON u.user_id = h.user_id
+    JOIN EVENTS e ON h.event_id = e.event_id
+    JOIN DEPARTMENT d ON e.dept = d.dept;
+
+-- Triggers
+CREATE TRIGGER IF NOT EXISTS prevent_invalid_login_insert
+    BEFORE INSERT ON LOGIN
+    FOR EACH ROW
+    WHEN NOT EXISTS (SELECT 1 FROM USERS WHERE user_id = NEW.user_id)
+    BEGIN
+        SELECT RAISE(ABORT, 'Cannot create login: user_id does not exist in USERS table.');
+    END;
+
+CREATE TRIGGER IF NOT EXISTS increment_event_count
+    AFTER INSERT ON HOST
+    FOR EACH ROW
+    WHEN NOT EXISTS (SELECT 1 FROM HOST_TRIGGER_SWITCH)
+    BEGIN
+        UPDATE USERS
+        SET no_of_events = no_of_events + 1
+        WHERE user_id = NEW.user_id;
+    END;
+
+CREATE TRIGGER IF NOT EXISTS increment_registration_count
+    AFTER INSERT ON HOST
+    FOR EACH ROW
+    WHEN NOT EXISTS (SELECT 1 FROM HOST_TRIGGER_SWITCH)
+    BEGIN
+        UPDATE EVENTS
+        SET registration_count = registration_count + 1
+        WHERE event_id = NEW.event_id;
+    END;
+
+CREATE TRIGGER IF NOT EXISTS decrement_registration_count
+    AFTER DELETE ON HOST
+    FOR EACH ROW
+    WHEN NOT EXISTS (SELECT 1 FROM HOST_TRIGGER_SWITCH)
+    BEGIN
+        UPDATE EVENTS
+        SET registration_count = registration_count - 1
+        WHERE event_id = OLD.event_id;
+    END;
+
+-- Every HOST change also moves EVENTS.registration_count, so these three see every listing change
+CREATE TRIGGER IF NOT EXISTS log_event_insert
+    AFTER INSERT ON EVENTS
+    FOR EACH ROW
+    BEGIN
+        INSERT INTO EVENT_CHANGES (event_id) VALUES (NEW.event_id);
+    END;
+
+CREATE TRIGGER IF NOT EXISTS log_event_update
+    AFTER UPDATE ON EVENTS
+    FOR EACH ROW
+    WHEN NOT (OLD.date IS NEW.date AND OLD.time IS NEW.time AND OLD.dept IS NEW.dept
+              AND OLD.registration_count IS NEW.registration_count)
+    BEGIN
+        INSERT INTO EVENT_CHANGES (event_id) VALUES (NEW.event_id);
+    END;
+
+CREATE TRIGGER IF NOT EXISTS log_event_delete
+    AFTER DELETE ON EVENTS
+    FOR EACH ROW
+    BEGIN
+        INSERT INTO EVENT_CHANGES (event_id) VALUES (OLD.event_id);
+    END;
+
+-- Registrations reach the rollup through EVENTS.registration_count like they reach the change feed
+CREATE TRIGGER IF NOT EXISTS rollup_event_insert
+    AFTER INSERT ON EVENTS
+    FOR EACH ROW
+    WHEN NEW.dept IS NOT NULL AND NEW.date IS NOT NULL
+    BEGIN
+        INSERT INTO EVENT_DAILY_ROLLUP (dept, date, events, registrations)
+        VALUES (NEW.dept, NEW.date, 1, NEW.registration_count)
+        ON CONFLICT (dept, date) DO UPDATE
+        SET events = events + 1, registrations = registrations + excluded.registrations;
+    END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_event_count
+    AFTER UPDATE OF registration_count ON EVENTS
+    FOR EACH ROW
+    WHEN OLD.dept IS NEW.dept AND OLD.date IS NEW.date AND OLD.registration_count IS NOT NEW.registration_count
+    BEGIN
+        UPDATE EVENT_DAILY_ROLLUP
+        SET registrations = registrations + NEW.registration_count - OLD.registration_count
+        WHERE dept = NEW.dept AND date = NEW.date;
+    END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_event_move
+    AFTER UPDATE ON EVENTS
+    FOR EACH ROW
+    WHEN NOT (OLD.dept IS NEW.dept AND OLD.date IS NEW.date)
+    BEGIN
+        UPDATE EVENT_DAILY_ROLLUP
+        SET events = events - 1, registrations = registrations - OLD.registration_count
+        WHERE dept = OLD.dept AND date = OLD.date;
+        INSERT INTO EVENT_DAILY_ROLLUP (dept, date, events, registrations)
+        SELECT NEW.dept, NEW.date, 1, NEW.registration_count
+        WHERE NEW.dept IS NOT NULL AND NEW.date IS NOT NULL
+        ON CONFLICT (dept, date) DO UPDATE
+        SET events = events + 1, registrations = registrations + excluded.registrations;
+    END;
+
+-- archive.py deletes under the trigger switch, so archived events stay in the totals
+CREATE TRIGGER IF NOT EXISTS rollup_event_delete
+    AFTER DELETE ON EVENTS
+    FOR EACH ROW
+    WHEN NOT EXISTS (SELECT 1 FROM HOST_TRIGGER_SWITCH)
+    BEGIN
+        UPDATE EVENT_DAILY_ROLLUP
+        SET events = events - 1, registrations = registrations - OLD.registration_count
+        WHERE dept = OLD.dept AND date = OLD.date;
+    END;
+
+-- getEventCount() and the assignHost / registerForEvent procedures have no SQLite equivalent;
+-- sqlite_backend.py implements registerForEvent in Python behind the same CALL statement.
@@ -0,0 +1,263 @@
+import functools
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime, time, timedelta
+from time import monotonic
+
+SQLITE_PATH = os.environ.get("DB_SQLITE_PATH", "eventManagement.db")
+# Seconds a writer waits for another connection's write lock before failing
+SQLITE_BUSY_TIMEOUT = float(os.environ.get("DB_SQLITE_BUSY_TIMEOUT", "5"))
+# Virtual machine steps between query timeout checks
+PROGRESS_STEPS = 10000
+SCHEMA_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sqliteScript.sql")
+
+# Hand DATE and TIME columns back as date / timedelta, the types mysql-connector returns
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+sqlite3.register_converter("TIME", lambda value: timedelta(
+    **dict(zip(("hours", "minutes", "seconds"), map(float, value.decode().split(":"))))
+))
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(time, time.isoformat)
+sqlite3.register_adapter(timedelta, lambda value: (datetime.min + value).strftime("%H:%M:%S"))
+
+NAMED_PARAM = re.compile(r"%\((\w+)\)s")
+FOR_UPDATE = re.compile(r"\s+FOR\s+UPDATE\s*$", re.IGNORECASE)
+CALL = re.compile(r"^\s*CALL\s+(\w+)\s*\(", re.IGNORECASE)
+
+# The @skip_host_triggers session variable becomes a row in HOST_TRIGGER_SWITCH (see sqliteScript.sql)
+SESSION_STATEMENTS = {
+    "SET @skip_host_triggers = 1": "INSERT OR IGNORE INTO HOST_TRIGGER_SWITCH (skip) VALUES (1)",
+    "SET @skip_host_triggers = NULL": "DELETE FROM HOST_TRIGGER_SWITCH",
+}
+
+# Status codes match the MySQL procedure and attendee.REGISTERED / EVENT_*
+REGISTERED, EVENT_NOT_FOUND, EVENT_PASSED, ALREADY_REGISTERED, EVENT_FULL, USER_NOT_FOUND = range(6)
+
+_schema_lock = threading.Lock()
+_schema_ready = set()
+
+
+@functools.lru_cache(maxsize=512)
+def translate(sql):
+    # Returns (sqlite_sql, takes_write_lock, procedure_name) for a MySQL-dialect statement
+    stripped = sql.strip()
+    if stripped in SESSION_STATEMENTS:
+        return SESSION_STATEMENTS[stripped], False, None
+    call = CALL.match(sql)
+    if call:
+        return None, False, call.group(1).lower()
+    locks = bool(FOR_UPDATE.search(sql))
+    sql = FOR_UPDATE.sub("", sql)
+    sql = NAMED_PARAM.sub(r":\1", sql).replace("%s", "?")
+    sql = re.sub(r"\bCURDATE\(\)", "date('now', 'localtime')", sql, flags=re.IGNORECASE)
+    return sql, locks, None
+
+
+def register_for_event(conn, event_id, user_id):
+    # Same checks and status codes as the registerForEvent procedure. BEGIN IMMEDIATE takes
+    # the database write lock up front, which queues concurrent sign-ups like FOR UPDATE does.
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        event = conn.execute(
+            "SELECT date, dept, registration_count FROM EVENTS WHERE event_id = ?", (event_id,)
+        ).fetchone()
+        # Like the procedure, which reads the date INTO a variable, a NULL date counts as not found
+        if event is None or event[0] is None:
+            status = EVENT_NOT_FOUND
+        elif event[0] < date.today():
+            status = EVENT_PASSED
+        elif conn.execute("SELECT 1 FROM USERS WHERE user_id = ?", (user_id,)).fetchone() is None:
+            status = USER_NOT_FOUND
+        elif conn.execute("SELECT 1 FROM HOST WHERE event_id = ? AND user_id = ?", (event_id, user_id)).fetchone():
+            status = ALREADY_REGISTERED
+        else:
+            # No department row or a NULL capacity leaves the event uncapped, as the procedure's
+            # NULL comparison does
+            row = conn.execute(
+                "SELECT default_max_capacity FROM DEPARTMENT WHERE dept = ?", (event[1],)
+            ).fetchone()
+            capacity = row[0] if row else None
+            if capacity is not None and event[2] is not None and event[2] >= capacity:
+                status = EVENT_FULL
+            else:
+                conn.execute("INSERT INTO HOST (event_id, user_id) VALUES (?, ?)", (event_id, user_id))
+                status = REGISTERED
+        conn.commit()
+        return status
+    except Exception:
+        conn.rollback()
+        raise
+
+
+PROCEDURES = {
+    "registerforevent": register_for_event,
+}
+
+
+class SqliteCursor:
+    """The part of the mysql-connector cursor API the handlers use, on top of sqlite3."""
+
+    def __init__(self, conn, dictionary=False, started=None):
+        self._conn = conn
+        self._cursor = conn.cursor()
+        self._dictionary = dictionary
+        self._result = None
+        self._started = started
+
+    @property
+    def description(self):
+        if self._result is not None:
+            return (("status", None, None, None, None, None, None),)
+        return self._cursor.description
+
+    @property
+    def with_rows(self):
+        return self.description is not None
+
+    @property
+    def column_names(self):
+        return tuple(column[0] for column in self.description or ())
+
+    @property
+    def rowcount(self):
+        return len(self._result) if self._result is not None else self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def execute(self, operation, params=None):
+        sql, locks, procedure = translate(operation)
+        self._result = None
+        if self._started:
+            self._started()
+        if procedure:
+            self._result = [(PROCEDURES[procedure](self._conn, *(params or ())),)]
+            return
+        if locks and not self._conn.in_transaction:
+            self._conn.execute("BEGIN IMMEDIATE")
+        self._cursor.execute(sql, params or ())
+
+    def executemany(self, operation, seq_params):
+        self._result = None
+        if self._started:
+            self._started()
+        self._cursor.executemany(translate(operation)[0], seq_params)
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip(self.column_names, row))
+
+    def fetchone(self):
+        if self._result is not None:
+            return self._row(self._result.pop(0)) if self._result else None
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        if self._result is not None:
+            rows, self._result = self._result[:size], self._result[size:]
+            return [self._row(row) for row in rows]
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        if self._result is not None:
+            rows, self._result = self._result, []
+            return [self._row(row) for row in rows]
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def nextset(self):
+        return None
+
+    def close(self):
+        self._cursor.close()
+
+
+class SqliteConnection:
+    def __init__(self, conn, query_timeout=0):
+        self._conn = conn
+        self.query_timeout = query_timeout
+        self._deadline = None
+        if query_timeout:
+            # Plays the part of mysql-connector's read_timeout: a query still running after
+            # query_timeout seconds (fetches included) fails with OperationalError("interrupted")
+            conn.set_progress_handler(self._expired, PROGRESS_STEPS)
+
+    def _started(self):
+        self._deadline = monotonic() + self.query_timeout
+
+    def _expired(self):
+        return self._deadline is not None and monotonic() > self._deadline
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    def cursor(self, dictionary=False, prepared=False, **kwargs):
+        # sqlite3 keeps its own per-connection cache of compiled statements, so prepared
+        # cursors need no special handling here
+        return SqliteCursor(self._conn, dictionary, self._started if self.query_timeout else None)
+
+    def ping(self, reconnect=False):
+        self._deadline = None
+        self._conn.execute("SELECT 1")
+
+    def commit(self):
+        self._deadline = None
+        self._conn.commit()
+
+    def rollback(self):
+        self._deadline = None
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+def schema_objects(script):
+    # The script's CREATE ... IF NOT EXISTS statements, without its seed data
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        if not statement and (not line.strip() or line.lstrip().startswith("--")):
+            continue
+        statement += line
+        if sqlite3.complete_statement(statement):
+            if re.match(r"\s*CREATE\s+\w+\s+IF\s+NOT\s+EXISTS", statement, re.IGNORECASE):
+                yield statement
+            statement = ""
+
+
+def ensure_schema(conn, path):
+    with _schema_lock:
+        if path in _schema_ready:
+            return
+        with open(SCHEMA_SCRIPT) as f:
+            script = f.read()
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'EVENTS'").fetchone()
+        if not exists:
+            conn.executescript(script)
+        else:
+            # Files created by an older script pick up the tables, indexes and triggers added since
+            for statement in schema_objects(script):
+                conn.execute(statement)
+            conn.commit()
+        _schema_ready.add(path)
+
+
+def connect(path=SQLITE_PATH, query_timeout=0):
+    conn = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT, detect_types=sqlite3.PARSE_DECLTYPES,
+                           check_same_thread=False)
+    conn.execute("PRAGMA foreign_keys = ON")
+    # WAL lets the dashboards keep reading while a registration holds the write lock
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    ensure_schema(conn, path)
+    return SqliteConnection(conn, query_timeout)
@@ -0,0 +1,84 @@
+import os
+import re
+import pandas as pd
+import queries
+
+# Prepared mode parses each statement once per pooled connection and then only sends
+# parameters; 0 sends the same statements as plain text, e.g. to compare the two
+PREPARED_STATEMENTS = os.environ.get("DB_PREPARED_STATEMENTS", "1") == "1"
+
+NAMED_PARAM = re.compile(r"%\((\w+)\)s")
+
+
+class Statement:
+    def __init__(self, name, sql):
+        self.name = name
+        # Prepared statements only take positional markers, so named parameters are
+        # rewritten once here and bound in order (repeats included) on every call
+        self.param_names = NAMED_PARAM.findall(sql)
+        self.sql = NAMED_PARAM.sub("%s", sql)
+
+    def bind(self, params):
+        if isinstance(params, dict):
+            return tuple(params[name] for name in self.param_names)
+        return tuple(params or ())
+
+
+def registrable(name, sql):
+    # Procedure calls, session variables and IN lists of varying length stay as text queries
+    return (
+        name.isupper() and not name.startswith("_") and isinstance(sql, str)
+        and not sql.lstrip().upper().startswith(("CALL", "SET"))
+        and "{placeholders}" not in sql
+    )
+
+
+STATEMENTS = {name: Statement(name, sql) for name, sql in vars(queries).items() if registrable(name, sql)}
+
+
+def register(name, sql):
+    # Statements composed at run time (the events listing's filter combinations) are run by
+    # name like the ones in queries.py, so each is prepared once per pooled connection too
+    if name not in STATEMENTS:
+        STATEMENTS.setdefault(name, Statement(name, sql))
+    return name
+
+
+def run(conn, name, params=(), prepared=None):
+    statement = STATEMENTS[name]
+    prepared = PREPARED_STATEMENTS if prepared is None else prepared
+    cursor = conn.prepared_cursor(name) if prepared else conn.cursor()
+    try:
+        cursor.execute(statement.sql, statement.bind(params))
+        if cursor.with_rows:
+            return list(cursor.column_names), cursor.fetchall(), cursor.rowcount
+        return [], [], cursor.rowcount
+    except Exception:
+        if prepared:
+            # A failed statement may leave results unread or need re-preparing; start fresh next time
+            conn.discard_prepared(name)
+        raise
+    finally:
+        if not prepared:
+            cursor.close()
+
+
+def fetchall(conn, name, params=(), dictionary=False, prepared=None):
+    columns, rows, _ = run(conn, name, params, prepared)
+    if dictionary:
+        return [dict(zip(columns, row)) for row in rows]
+    return rows
+
+
+def fetchone(conn, name, params=(), dictionary=False, prepared=None):
+    rows = fetchall(conn, name, params, dictionary, prepared)
+    return rows[0] if rows else None
+
+
+def execute(conn, name, params=(), prepared=None):
+    return run(conn, name, params, prepared)[2]
+
+
+def read_frame(conn, name, params=(), prepared=None):
+    columns, rows, _ = run(conn, name, params, prepared)
+    return pd.DataFrame(rows, columns=columns)